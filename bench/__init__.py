@@ -0,0 +1,5 @@
+"""
+Arc Raiders Recycling Tracker - Benchmarks
+
+Run from the repository root, e.g. `python -m bench.material_text`.
+"""
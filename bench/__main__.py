@@ -0,0 +1,104 @@
+"""
+Benchmark suite for the scrape, parse, load and generate stages.
+
+Usage:
+    python -m bench run                          # All stages at the default sizes
+    python -m bench run --stages parse_item,load_data --sizes 100,1000 --label lxml
+    python -m bench compare                      # Latest run vs the one before it
+    python -m bench compare --baseline lxml --threshold 0.05
+"""
+import argparse
+import sys
+
+from bench.harness import (DEFAULT_HISTORY, append_history, compare_runs, find_run, format_bytes,
+                           load_history, run_benchmarks)
+from bench.stages import STAGES, quiet_logging
+
+
+def parse_arguments():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(prog='python -m bench', description='Benchmark the recycling tracker pipeline')
+    parser.add_argument('--history', default=DEFAULT_HISTORY,
+                        help=f'Result history file (default: {DEFAULT_HISTORY})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run = subparsers.add_parser('run', help='Run benchmarks and append the results to the history')
+    run.add_argument('--stages', default=','.join(STAGES),
+                     help=f"Comma-separated stages (default: all of {', '.join(STAGES)})")
+    run.add_argument('--sizes', default='100,1000,10000',
+                     help='Comma-separated dataset sizes (default: 100,1000,10000)')
+    run.add_argument('--repeat', type=int, default=3, help='Timed runs per stage and size (default: 3)')
+    run.add_argument('--label', help='Label to find this run by later')
+    run.add_argument('--no-save', action='store_true', help='Print results without recording them')
+
+    compare = subparsers.add_parser('compare', help='Compare two recorded runs and flag regressions')
+    compare.add_argument('--baseline', default='-2',
+                         help='Baseline run: label, commit or history index (default: -2, the previous run)')
+    compare.add_argument('--current', default='-1',
+                         help='Run to check: label, commit or history index (default: -1, the latest run)')
+    compare.add_argument('--threshold', type=float, default=0.10,
+                         help='Relative slowdown or memory growth counted as a regression (default: 0.10)')
+
+    return parser.parse_args()
+
+
+def print_result(result):
+    output = format_bytes(result['output_bytes']) if 'output_bytes' in result else ''
+    print(f"{result['stage']:<16} {result['size']:>8}  {result['seconds']:>10.4f}s  "
+          f"{format_bytes(result['peak_bytes']):>10}  {output:>10}")
+
+
+def run_command(args) -> int:
+    stages = {}
+    for name in args.stages.split(','):
+        if name not in STAGES:
+            print(f"Unknown stage {name!r}; available: {', '.join(STAGES)}", file=sys.stderr)
+            return 2
+        stages[name] = STAGES[name]
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    quiet_logging()
+    print(f"{'stage':<16} {'size':>8}  {'best time':>11}  {'peak mem':>10}  {'output':>10}")
+    results = run_benchmarks(stages, sizes, repeat=args.repeat, progress=print_result)
+
+    if not args.no_save:
+        run = append_history(args.history, results, label=args.label)
+        print(f"\nRecorded run {run['timestamp']} (commit {run['commit']}) in {args.history}")
+    return 0
+
+
+def compare_command(args) -> int:
+    runs = load_history(args.history)
+    try:
+        baseline = find_run(runs, args.baseline)
+        current = find_run(runs, args.current)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    rows = compare_runs(baseline, current, threshold=args.threshold)
+    print(f"Baseline: {baseline['timestamp']} (commit {baseline['commit']}, label {baseline['label']})")
+    print(f"Current:  {current['timestamp']} (commit {current['commit']}, label {current['label']})\n")
+    print(f"{'stage':<16} {'size':>8}  {'time':>10}  {'vs base':>8}  {'peak mem':>10}  {'vs base':>8}")
+    for row in rows:
+        flag = '  REGRESSION' if row['regression'] else ''
+        print(f"{row['stage']:<16} {row['size']:>8}  {row['seconds']:>9.4f}s  {row['time_ratio']:>7.2f}x  "
+              f"{format_bytes(row['peak_bytes']):>10}  {row['memory_ratio']:>7.2f}x{flag}")
+
+    regressions = [row for row in rows if row['regression']]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+        return 1
+    print(f"\nNo regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+def main():
+    args = parse_arguments()
+    if args.command == 'run':
+        sys.exit(run_command(args))
+    sys.exit(compare_command(args))
+
+
+if __name__ == "__main__":
+    main()
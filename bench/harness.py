@@ -0,0 +1,190 @@
+"""
+Benchmark harness: timing, peak memory, result history and regression checks.
+"""
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_HISTORY = os.path.join('bench', 'history.json')
+
+
+def measure(run: Callable, repeat: int = 3) -> Dict:
+    """
+    Time `run` and measure its peak Python memory allocation.
+
+    Timing runs happen without tracemalloc (it slows allocation-heavy code
+    several times over); a separate run under tracemalloc gives the peak.
+    If `run` returns a dictionary (e.g. {'output_bytes': ...}), its entries
+    are added to the result as extra metrics.
+
+    Returns:
+        Dictionary with best/median seconds, peak bytes and any extra metrics
+    """
+    timings = []
+    extra = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        extra = run()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    result = {
+        'seconds': round(min(timings), 6),
+        'median_seconds': round(statistics.median(timings), 6),
+        'peak_bytes': peak
+    }
+    if isinstance(extra, dict):
+        result.update(extra)
+    return result
+
+
+def run_benchmarks(stages: Dict[str, Callable], sizes: List[int], repeat: int = 3,
+                   progress: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+    """
+    Run every stage at every size.
+
+    Args:
+        stages: Stage name -> setup function (see bench.stages)
+        sizes: Dataset sizes to run each stage at
+        repeat: Timed runs per stage and size
+        progress: Called with each result as it completes
+
+    Returns:
+        List of result dictionaries
+    """
+    results = []
+    with tempfile.TemporaryDirectory(prefix='recyclone-bench-') as workdir:
+        for name, setup in stages.items():
+            for size in sizes:
+                run = setup(size, workdir)
+                result = dict(stage=name, size=size, **measure(run, repeat))
+                results.append(result)
+                if progress:
+                    progress(result)
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(filepath: str) -> List[Dict]:
+    """Load all recorded runs, oldest first."""
+    if not os.path.exists(filepath):
+        return []
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f).get('runs', [])
+
+
+def append_history(filepath: str, results: List[Dict], label: Optional[str] = None) -> Dict:
+    """
+    Append a run to the history file.
+
+    Returns:
+        The recorded run
+    """
+    run = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'commit': _git_commit(),
+        'label': label,
+        'python': platform.python_version(),
+        'machine': platform.node(),
+        'results': results
+    }
+    runs = load_history(filepath) + [run]
+
+    directory = os.path.dirname(filepath)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_filepath = filepath + '.tmp'
+    with open(temp_filepath, 'w', encoding='utf-8') as f:
+        json.dump({'runs': runs}, f, indent=2)
+    os.replace(temp_filepath, filepath)
+    return run
+
+
+def find_run(runs: List[Dict], ref: str) -> Dict:
+    """
+    Pick a run by label, commit or list index (e.g. '-2'). Labels and commits
+    are matched first, so a numeric label or an all-digit commit prefix is
+    never mistaken for an index.
+
+    Raises:
+        ValueError: If no run matches
+    """
+    for run in reversed(runs):
+        if ref in (run.get('label'), run.get('commit')):
+            return run
+
+    try:
+        return runs[int(ref)]
+    except ValueError:
+        pass
+    except IndexError:
+        raise ValueError(f"No run labelled or at commit {ref!r}, and no run at index {ref}; "
+                         f"history has {len(runs)} runs")
+    raise ValueError(f"No run labelled or at commit {ref!r}")
+
+
+def compare_runs(baseline: Dict, current: Dict, threshold: float = 0.10) -> List[Dict]:
+    """
+    Compare matching (stage, size) results of two runs.
+
+    Args:
+        baseline: Earlier run
+        current: Later run
+        threshold: Relative increase in time or peak memory counted as a
+            regression (0.10 = 10%)
+
+    Returns:
+        One row per result present in both runs, with ratios and a
+        'regression' flag
+    """
+    previous = {(r['stage'], r['size']): r for r in baseline['results']}
+    rows = []
+    for result in current['results']:
+        old = previous.get((result['stage'], result['size']))
+        if old is None:
+            continue
+        time_ratio = result['seconds'] / old['seconds'] if old['seconds'] else 1.0
+        memory_ratio = result['peak_bytes'] / old['peak_bytes'] if old['peak_bytes'] else 1.0
+        rows.append({
+            'stage': result['stage'],
+            'size': result['size'],
+            'seconds': result['seconds'],
+            'baseline_seconds': old['seconds'],
+            'time_ratio': time_ratio,
+            'peak_bytes': result['peak_bytes'],
+            'baseline_peak_bytes': old['peak_bytes'],
+            'memory_ratio': memory_ratio,
+            'regression': time_ratio > 1 + threshold or memory_ratio > 1 + threshold
+        })
+    return rows
+
+
+def format_bytes(count: int) -> str:
+    """Human-readable byte count."""
+    for unit in ('B', 'KB', 'MB'):
+        if count < 1024:
+            return f"{count:.0f} {unit}"
+        count /= 1024
+    return f"{count:.1f} GB"
@@ -0,0 +1,50 @@
+"""
+Micro-benchmark for material_text.parse_material_text against the scraper's
+original implementation (tests/reference.py). Their equivalence is checked by
+tests/test_material_text.py.
+
+Usage:
+    python -m bench.material_text
+    python -m bench.material_text --fragments 100000
+"""
+import argparse
+import random
+import time
+
+from material_text import parse_material_text
+from tests.reference import MATERIAL_NAMES, legacy_parse_material_text
+
+
+def sample_fragments(count: int, seed: int = 0) -> list:
+    """Fragments shaped like the comma-split cells and list items on the wiki."""
+    rng = random.Random(seed)
+    forms = ['{m} x{q}', '{q}x {m}', '{m}: {q}', '{m} ({q})', '{m} - {q}', '{m}', 'Recycles into']
+    return [rng.choice(forms).format(m=rng.choice(MATERIAL_NAMES), q=rng.randint(1, 20))
+            for _ in range(count)]
+
+
+def fragments_per_second(func, fragments: list, repeat: int = 5) -> float:
+    """Best-of-`repeat` throughput of func over fragments."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for fragment in fragments:
+            func(fragment)
+        best = min(best, time.perf_counter() - start)
+    return len(fragments) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the material text parser')
+    parser.add_argument('--fragments', type=int, default=20000, help='Fragments per benchmark run (default: 20000)')
+    args = parser.parse_args()
+
+    fragments = sample_fragments(args.fragments)
+    legacy = fragments_per_second(legacy_parse_material_text, fragments)
+    current = fragments_per_second(parse_material_text, fragments)
+    print(f"legacy:  {legacy:12,.0f} fragments/s")
+    print(f"current: {current:12,.0f} fragments/s  ({current / legacy:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
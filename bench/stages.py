@@ -0,0 +1,166 @@
+"""
+Pipeline stages measured by the benchmark harness.
+
+Each stage is a setup function taking (size, workdir) and returning a
+zero-argument callable that performs the measured work once. Setup is not
+timed. `size` is the number of items (or pages/fragments) the stage works on.
+"""
+import json
+import logging
+import os
+from typing import Callable, Dict
+
+from create_sample_data import generate_dataset, generate_wiki_pages
+from data_schema import upgrade_data
+from generator import HTMLGenerator
+from scraper import WikiScraper
+from bench.material_text import sample_fragments
+
+# Recorded wiki fixtures are used for the parse stage when present
+FIXTURE_ARCHIVE = os.path.join('tests', 'fixtures', 'wiki.json.gz')
+
+_datasets: Dict[int, Dict] = {}
+
+
+def dataset(size: int) -> Dict:
+    """Synthetic dataset with `size` items, generated once per size."""
+    if size not in _datasets:
+        _datasets[size] = generate_dataset(size, categories=10, materials=200, seed=size)
+    return _datasets[size]
+
+
+def _write_dataset(size: int, workdir: str) -> str:
+    filepath = os.path.join(workdir, f'data_{size}.json')
+    if not os.path.exists(filepath):
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(dataset(size), f, indent=2, ensure_ascii=False)
+    return filepath
+
+
+def _item_pages(size: int) -> list:
+    """
+    `size` item page bodies: recorded fixtures if available, else synthetic.
+    Archives without item pages (e.g. recorded with --fetch-mode api) fall
+    back to synthetic pages too.
+    """
+    bodies = []
+    if os.path.exists(FIXTURE_ARCHIVE):
+        from wiki_fixtures import load_archive
+        bodies = [entry['body'] for key, entry in sorted(load_archive(FIXTURE_ARCHIVE)['responses'].items())
+                  if key.startswith('/wiki/') and key != '/wiki/Loot']
+    if not bodies:
+        bodies = [entry['body'] for key, entry in generate_wiki_pages(dataset(size)).items()
+                  if key.startswith('/wiki/') and key != '/wiki/Loot']
+    return [bodies[n % len(bodies)] for n in range(size)]
+
+
+def setup_parse_item(size: int, workdir: str) -> Callable:
+    scraper = WikiScraper(rate_limit=0)
+    pages = _item_pages(size)
+    item_info = {'name': 'Benchmark Item', 'category': 'Loot', 'url': 'https://arcraiders.wiki/wiki/Benchmark_Item'}
+
+    def run():
+        for html in pages:
+            scraper._parse_loot_item(item_info, html)
+    return run
+
+
+def setup_material_text(size: int, workdir: str) -> Callable:
+    scraper = WikiScraper(rate_limit=0)
+    fragments = sample_fragments(size)
+
+    def run():
+        for fragment in fragments:
+            scraper._parse_material_text(fragment)
+    return run
+
+
+def setup_load_data(size: int, workdir: str) -> Callable:
+    generator = HTMLGenerator(_write_dataset(size, workdir))
+    return generator.load_data
+
+
+def setup_validate(size: int, workdir: str) -> Callable:
+    # The checks load_data runs after reading the file, without the I/O
+    generator = HTMLGenerator(_write_dataset(size, workdir))
+    data = dataset(size)
+
+    def run():
+        generator.validate_data(data)
+        upgrade_data(data)
+    return run
+
+
+def _setup_generate(size: int, workdir: str, payload: str, shard_size: int = 0) -> Callable:
+    generator = HTMLGenerator(_write_dataset(size, workdir), payload=payload, shard_size=shard_size)
+    generator.load_data()
+    suffix = '_sharded' if shard_size else ''
+    output = os.path.join(workdir, f'tracker_{payload}{suffix}_{size}.html')
+
+    def run():
+        generator.generate_html(output)
+        return {'output_bytes': os.path.getsize(output)}
+    return run
+
+
+def setup_generate_html(size: int, workdir: str) -> Callable:
+    return _setup_generate(size, workdir, 'rows')
+
+
+def setup_generate_compact(size: int, workdir: str) -> Callable:
+    return _setup_generate(size, workdir, 'compact')
+
+
+def setup_generate_sharded(size: int, workdir: str) -> Callable:
+    # output_bytes is the page shell alone; the data goes to shard files
+    return _setup_generate(size, workdir, 'compact', shard_size=1000)
+
+
+def setup_save_json(size: int, workdir: str) -> Callable:
+    scraper = WikiScraper(rate_limit=0)
+    data = dataset(size)
+    output = os.path.join(workdir, f'saved_{size}.json')
+    return lambda: scraper.save_to_json(data, output)
+
+
+def setup_save_module(size: int, workdir: str) -> Callable:
+    scraper = WikiScraper(rate_limit=0)
+    data = dataset(size)
+    output = os.path.join(workdir, f'saved_{size}.py')
+    return lambda: scraper.save_to_python_module(data, output)
+
+
+def setup_save_sqlite(size: int, workdir: str) -> Callable:
+    scraper = WikiScraper(rate_limit=0)
+    data = dataset(size)
+    output = os.path.join(workdir, f'saved_{size}.db')
+    return lambda: scraper.save_to_sqlite(data, output)
+
+
+def setup_load_sqlite(size: int, workdir: str) -> Callable:
+    filepath = os.path.join(workdir, f'data_{size}.db')
+    if not os.path.exists(filepath):
+        WikiScraper(rate_limit=0).save_to_sqlite(dataset(size), filepath)
+    generator = HTMLGenerator(filepath)
+    return generator.load_data
+
+
+# Stage name -> setup function, in pipeline order
+STAGES = {
+    'parse_item': setup_parse_item,
+    'material_text': setup_material_text,
+    'load_data': setup_load_data,
+    'validate': setup_validate,
+    'generate_html': setup_generate_html,
+    'generate_compact': setup_generate_compact,
+    'generate_sharded': setup_generate_sharded,
+    'save_json': setup_save_json,
+    'save_module': setup_save_module,
+    'save_sqlite': setup_save_sqlite,
+    'load_sqlite': setup_load_sqlite,
+}
+
+
+def quiet_logging() -> None:
+    """The pipeline logs every save and load at INFO; keep benchmark output readable."""
+    logging.disable(logging.INFO)
@@ -1,5 +1,20 @@
-"""Create sample recycling data for testing"""
+"""Create sample recycling data for testing
+
+Usage:
+    python create_sample_data.py                     # The small hand-written sample
+    python create_sample_data.py --items 100000      # Synthetic dataset for scale testing
+    python create_sample_data.py --items 5000 --wiki-archive tests/fixtures/synthetic.json.gz
+"""
+import argparse
+import bisect
+import html
+import itertools
 import json
+import random
+import time
+from urllib.parse import unquote, urlencode
+
+from data_schema import SCHEMA_VERSION, total_quantity, upgrade_item
 
 # Sample data with realistic materials
 sample_data = {
@@ -9,30 +24,39 @@ sample_data = {
                 'name': 'Assault Rifle',
                 'category': 'Weapons',
                 'url': 'https://arcraiders.wiki/wiki/Assault_Rifle',
-                'materials': [
+                'recycling': [
                     {'name': 'Steel', 'quantity': 15},
                     {'name': 'Polymer', 'quantity': 8},
                     {'name': 'Electronics', 'quantity': 3}
-                ]
+                ],
+                'salvaging': [],
+                'recycling_total': 26,
+                'salvaging_total': 0
             },
             {
                 'name': 'Sniper Rifle',
                 'category': 'Weapons',
                 'url': 'https://arcraiders.wiki/wiki/Sniper_Rifle',
-                'materials': [
+                'recycling': [
                     {'name': 'Steel', 'quantity': 20},
                     {'name': 'Optics', 'quantity': 2},
                     {'name': 'Electronics', 'quantity': 5}
-                ]
+                ],
+                'salvaging': [],
+                'recycling_total': 27,
+                'salvaging_total': 0
             },
             {
                 'name': 'Shotgun',
                 'category': 'Weapons',
                 'url': 'https://arcraiders.wiki/wiki/Shotgun',
-                'materials': [
+                'recycling': [
                     {'name': 'Steel', 'quantity': 12},
                     {'name': 'Polymer', 'quantity': 6}
-                ]
+                ],
+                'salvaging': [],
+                'recycling_total': 18,
+                'salvaging_total': 0
             }
         ],
         'Augments': [
@@ -40,19 +64,25 @@ sample_data = {
                 'name': 'Shield Booster',
                 'category': 'Augments',
                 'url': 'https://arcraiders.wiki/wiki/Shield_Booster',
-                'materials': [
+                'recycling': [
                     {'name': 'Electronics', 'quantity': 10},
                     {'name': 'Rare Alloy', 'quantity': 3}
-                ]
+                ],
+                'salvaging': [],
+                'recycling_total': 13,
+                'salvaging_total': 0
             },
             {
                 'name': 'Speed Enhancer',
                 'category': 'Augments',
                 'url': 'https://arcraiders.wiki/wiki/Speed_Enhancer',
-                'materials': [
+                'recycling': [
                     {'name': 'Electronics', 'quantity': 8},
                     {'name': 'Polymer', 'quantity': 5}
-                ]
+                ],
+                'salvaging': [],
+                'recycling_total': 13,
+                'salvaging_total': 0
             }
         ],
         'Shields': [
@@ -60,11 +90,14 @@ sample_data = {
                 'name': 'Energy Shield',
                 'category': 'Shields',
                 'url': 'https://arcraiders.wiki/wiki/Energy_Shield',
-                'materials': [
+                'recycling': [
                     {'name': 'Rare Alloy', 'quantity': 5},
                     {'name': 'Electronics', 'quantity': 12},
                     {'name': 'Power Cell', 'quantity': 2}
-                ]
+                ],
+                'salvaging': [],
+                'recycling_total': 19,
+                'salvaging_total': 0
             }
         ],
         'Healing': [
@@ -72,10 +105,13 @@ sample_data = {
                 'name': 'Med Kit',
                 'category': 'Healing',
                 'url': 'https://arcraiders.wiki/wiki/Med_Kit',
-                'materials': [
+                'recycling': [
                     {'name': 'Polymer', 'quantity': 3},
                     {'name': 'Medical Supplies', 'quantity': 8}
-                ]
+                ],
+                'salvaging': [],
+                'recycling_total': 11,
+                'salvaging_total': 0
             }
         ],
         'Quick Use': [
@@ -83,10 +119,13 @@ sample_data = {
                 'name': 'Repair Tool',
                 'category': 'Quick Use',
                 'url': 'https://arcraiders.wiki/wiki/Repair_Tool',
-                'materials': [
+                'recycling': [
                     {'name': 'Steel', 'quantity': 5},
                     {'name': 'Electronics', 'quantity': 4}
-                ]
+                ],
+                'salvaging': [],
+                'recycling_total': 9,
+                'salvaging_total': 0
             }
         ],
         'Grenades': [
@@ -94,19 +133,25 @@ sample_data = {
                 'name': 'Frag Grenade',
                 'category': 'Grenades',
                 'url': 'https://arcraiders.wiki/wiki/Frag_Grenade',
-                'materials': [
+                'recycling': [
                     {'name': 'Steel', 'quantity': 8},
                     {'name': 'Explosives', 'quantity': 6}
-                ]
+                ],
+                'salvaging': [],
+                'recycling_total': 14,
+                'salvaging_total': 0
             },
             {
                 'name': 'EMP Grenade',
                 'category': 'Grenades',
                 'url': 'https://arcraiders.wiki/wiki/EMP_Grenade',
-                'materials': [
+                'recycling': [
                     {'name': 'Electronics', 'quantity': 15},
                     {'name': 'Rare Alloy', 'quantity': 2}
-                ]
+                ],
+                'salvaging': [],
+                'recycling_total': 17,
+                'salvaging_total': 0
             }
         ],
         'Traps': [
@@ -114,16 +159,19 @@ sample_data = {
                 'name': 'Proximity Mine',
                 'category': 'Traps',
                 'url': 'https://arcraiders.wiki/wiki/Proximity_Mine',
-                'materials': [
+                'recycling': [
                     {'name': 'Steel', 'quantity': 6},
                     {'name': 'Electronics', 'quantity': 8},
                     {'name': 'Explosives', 'quantity': 10}
-                ]
+                ],
+                'salvaging': [],
+                'recycling_total': 24,
+                'salvaging_total': 0
             }
         ]
     },
     'metadata': {
-        'version': '1.0',
+        'version': '2.0',
         'scraped_at': '2025-11-23T14:20:00Z',
         'total_items': 10,
         'categories_count': 7,
@@ -133,11 +181,252 @@ sample_data = {
     }
 }
 
-# Save to output folder
-with open('output/recycling_data.json', 'w', encoding='utf-8') as f:
-    json.dump(sample_data, f, indent=2, ensure_ascii=False)
+# Word lists for synthetic names
+ITEM_PREFIXES = ['Rusted', 'Damaged', 'Advanced', 'Broken', 'Sturdy', 'Light', 'Heavy', 'Old',
+                 'Military', 'Civilian', 'Experimental', 'Salvaged', 'Reinforced', 'Compact']
+ITEM_NOUNS = ['Gear', 'Canister', 'Circuit', 'Toolbox', 'Radio', 'Engine', 'Valve', 'Sensor',
+              'Battery Pack', 'Drone Part', 'Fuel Cell', 'Antenna', 'Motor', 'Lens', 'Cable']
+MATERIAL_PREFIXES = ['', 'Advanced ', 'Refined ', 'Heavy ', 'Basic ', 'Exotic ', 'Light ']
+MATERIAL_NOUNS = ['Metal Parts', 'Rubber', 'Plastic Parts', 'Wires', 'Fabric', 'Chemicals',
+                  'Electrical Components', 'Mechanical Components', 'ARC Alloy', 'Magnet',
+                  'Glass', 'Steel Spring', 'Oil', 'Polymer', 'Optics']
+
+
+def material_vocabulary(size: int) -> list:
+    """Build `size` distinct material names."""
+    names = [prefix + noun for prefix, noun in itertools.product(MATERIAL_PREFIXES, MATERIAL_NOUNS)]
+    for n in itertools.count(2):
+        if len(names) >= size:
+            break
+        names.extend(f"{prefix}{noun} Mk {n}" for prefix, noun in itertools.product(MATERIAL_PREFIXES, MATERIAL_NOUNS))
+    return names[:size]
+
+
+def zipf_cum_weights(size: int, exponent: float) -> list:
+    """Cumulative Zipf weights: rank k is drawn with probability ~ 1 / k**exponent."""
+    return list(itertools.accumulate(1.0 / (rank ** exponent) for rank in range(1, size + 1)))
+
+
+def generate_dataset(items: int, categories: int = 7, materials: int = 50, zipf: float = 1.1,
+                     salvage_ratio: float = 0.5, recycle_ratio: float = 0.9,
+                     max_materials: int = 4, seed: int = 0) -> dict:
+    """
+    Generate a synthetic dataset in the same shape as a scrape.
+
+    Args:
+        items: Total number of items
+        categories: Number of categories the items are spread over
+        materials: Size of the material vocabulary
+        zipf: Zipf exponent of material popularity (0 = uniform)
+        salvage_ratio: Fraction of items with salvaging results
+        recycle_ratio: Fraction of items with recycling results
+        max_materials: Maximum distinct materials per result list
+        seed: Random seed; the same arguments always give the same dataset
+
+    Returns:
+        Dictionary with 'categories' and 'metadata', items in schema v2
+        shape like the scraper writes
+    """
+    rng = random.Random(seed)
+    vocabulary = material_vocabulary(materials)
+    cum_weights = zipf_cum_weights(len(vocabulary), zipf)
+    total_weight = cum_weights[-1]
+    category_names = [f"Category {n}" for n in range(1, categories + 1)]
+
+    def draw_materials():
+        count = rng.randint(1, max_materials)
+        picked = {vocabulary[bisect.bisect(cum_weights, rng.random() * total_weight)] for _ in range(count)}
+        return [{'name': name, 'quantity': rng.randint(1, 12)} for name in sorted(picked)]
+
+    data = {'categories': {name: [] for name in category_names}}
+    for n in range(items):
+        name = f"{rng.choice(ITEM_PREFIXES)} {rng.choice(ITEM_NOUNS)} {n + 1}"
+        category = category_names[n % categories]
+        recycling = draw_materials() if rng.random() < recycle_ratio else []
+        salvaging = draw_materials() if rng.random() < salvage_ratio else []
+        data['categories'][category].append({
+            'name': name,
+            'category': category,
+            'url': 'https://arcraiders.wiki/wiki/' + name.replace(' ', '_'),
+            'recycling': recycling,
+            'salvaging': salvaging,
+            'recycling_total': total_quantity(recycling),
+            'salvaging_total': total_quantity(salvaging)
+        })
+
+    data['metadata'] = {
+        'version': SCHEMA_VERSION,
+        'scraped_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'total_items': items,
+        'categories_count': categories,
+        'elapsed_seconds': 0,
+        'failed_categories': 0,
+        'failed_items': 0,
+        'synthetic': {
+            'materials': materials,
+            'zipf': zipf,
+            'salvage_ratio': salvage_ratio,
+            'recycle_ratio': recycle_ratio,
+            'seed': seed
+        }
+    }
+    return data
+
+
+def _wiki_page(title: str, content: str) -> str:
+    """Wrap content in a minimal skinned MediaWiki page."""
+    return (
+        f'<!DOCTYPE html><html><head><title>{html.escape(title)} - ARC Raiders Wiki</title></head><body>'
+        f'<div id="mw-navigation"><h2>Navigation menu</h2><ul><li><a href="/wiki/Main_Page">Main Page</a></li></ul></div>'
+        f'<div id="content"><h1>{html.escape(title)}</h1>'
+        f'<div class="mw-content-ltr mw-parser-output" lang="en" dir="ltr">{content}</div></div>'
+        f'<div id="footer"><p>Content is available under CC BY-NC-SA.</p></div></body></html>'
+    )
+
+
+# Titles per action=query request, as sent by WikiScraper.API_BATCH_SIZE
+API_BATCH_SIZE = 50
+
+# Parameters WikiScraper adds to every MediaWiki API request
+_API_FORMAT = {'format': 'json', 'formatversion': 2}
+
+
+def _api_key(params: dict) -> str:
+    """Fixture key of an api.php request (path plus sorted query string)."""
+    return '/api.php?' + urlencode(sorted((key, str(value)) for key, value in dict(params, **_API_FORMAT).items()))
+
+
+def _api_parse_entry(title: str, page_id: int, revision_id: int, content: str) -> dict:
+    body = json.dumps({'parse': {
+        'title': title, 'pageid': page_id, 'revid': revision_id,
+        'text': f'<div class="mw-content-ltr mw-parser-output" lang="en" dir="ltr">{content}</div>'
+    }}, ensure_ascii=False)
+    return {'status': 200, 'content_type': 'application/json; charset=utf-8', 'body': body}
+
+
+def generate_wiki_pages(data: dict) -> dict:
+    """
+    Render a dataset as wiki pages the scraper can read back: a Loot page
+    listing every item and one page per item with a Recycling/Salvaging table.
+
+    The matching MediaWiki API responses are included, so `--fetch-mode api`
+    and `--incremental` work against the stub server too: action=query
+    revision lookups in the scraper's batches, and action=parse content for
+    every page by title and by revision. Items keep their `revision_id`
+    when they have one; other pages get a stable made-up revision.
+
+    Returns:
+        Fixture responses keyed by path (and query string for api.php), in
+        the format used by wiki_fixtures
+    """
+    def entry(body):
+        return {'status': 200, 'content_type': 'text/html; charset=UTF-8', 'body': body}
+
+    def add_api_page(title, page_id, revision_id, content):
+        parsed = _api_parse_entry(title, page_id, revision_id, content)
+        parse = {'action': 'parse', 'prop': 'text', 'disablelimitreport': 1,
+                 'disableeditsection': 1, 'disabletoc': 1}
+        responses[_api_key(dict(parse, page=title, redirects=1))] = parsed
+        responses[_api_key(dict(parse, oldid=revision_id))] = parsed
+        pages[title] = {'pageid': page_id, 'title': title, 'revisions': [{'revid': revision_id}]}
+
+    def cell(item_materials):
+        return ', '.join(f"{html.escape(m['name'])} ×{m['quantity']}" for m in item_materials)
+
+    responses = {}
+    pages = {}
+    rows = []
+    page_id = 0
+    for items in data['categories'].values():
+        for item in items:
+            page_id += 1
+            path = '/wiki/' + item['url'].rsplit('/wiki/', 1)[1]
+            name = html.escape(item['name'])
+            rows.append(f'<tr><td><a href="{path}" title="{name}">{name}</a></td><td>{html.escape(item["category"])}</td></tr>')
+
+            item = upgrade_item(item)
+            recycling = item['recycling']
+            salvaging = item['salvaging']
+            content = (
+                f'<p><b>{name}</b> is a loot item.</p>'
+                f'<h2><span class="mw-headline">Recycling and Salvaging</span></h2>'
+                f'<table class="wikitable"><tr><th>Item</th><th>→</th><th>Recycling results</th><th>Salvaging results</th></tr>'
+                f'<tr><td>{name}</td><td>→</td><td>{cell(recycling)}</td><td>{cell(salvaging)}</td></tr></table>'
+                f'<h2><span class="mw-headline">Sources</span></h2><p>Found in containers.</p>'
+            )
+            responses[path] = entry(_wiki_page(item['name'], content))
+            title = unquote(path[len('/wiki/'):]).replace('_', ' ')
+            if title not in pages:
+                add_api_page(title, page_id, item.get('revision_id') or 100000 + page_id, content)
+
+    loot = ('<table class="wikitable sortable"><tr><th>Name</th><th>Category</th></tr>'
+            + ''.join(rows) + '</table>')
+    responses['/wiki/Loot'] = entry(_wiki_page('Loot', loot))
+    add_api_page('Loot', page_id + 1, 100000 + page_id + 1, loot)
+
+    # Revision lookups for the item titles, batched as the scraper batches them
+    titles = [title for title in pages if title != 'Loot']
+    for start in range(0, len(titles), API_BATCH_SIZE):
+        batch = titles[start:start + API_BATCH_SIZE]
+        body = json.dumps({'batchcomplete': True, 'query': {'pages': [pages[title] for title in batch]}},
+                          ensure_ascii=False)
+        params = {'action': 'query', 'prop': 'revisions', 'rvprop': 'ids', 'redirects': 1, 'titles': '|'.join(batch)}
+        responses[_api_key(params)] = {'status': 200, 'content_type': 'application/json; charset=utf-8',
+                                       'body': body}
+    return responses
+
+
+SAMPLE_SUMMARY = """✅ Sample data created with 10 items and 9 unique materials
+   Materials: Steel, Polymer, Electronics, Optics, Rare Alloy, Power Cell, Medical Supplies, Explosives"""
+
+
+def parse_arguments():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description='Create sample or synthetic recycling data')
+    parser.add_argument('--items', type=int,
+                        help='Generate a synthetic dataset with this many items instead of the small sample')
+    parser.add_argument('--categories', type=int, default=7, help='Number of categories (default: 7)')
+    parser.add_argument('--materials', type=int, default=50, help='Material vocabulary size (default: 50)')
+    parser.add_argument('--zipf', type=float, default=1.1,
+                        help='Zipf exponent of material popularity, 0 for uniform (default: 1.1)')
+    parser.add_argument('--salvage-ratio', type=float, default=0.5,
+                        help='Fraction of items with salvaging results (default: 0.5)')
+    parser.add_argument('--recycle-ratio', type=float, default=0.9,
+                        help='Fraction of items with recycling results (default: 0.9)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    parser.add_argument('--output', default='output/recycling_data.json',
+                        help='JSON data file path (default: output/recycling_data.json)')
+    parser.add_argument('--wiki-archive',
+                        help='Also write matching synthetic wiki pages as a fixture archive for wiki_fixtures.py')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+
+    if args.items is None:
+        data = sample_data
+        summary = SAMPLE_SUMMARY
+    else:
+        data = generate_dataset(args.items, categories=args.categories, materials=args.materials,
+                                zipf=args.zipf, salvage_ratio=args.salvage_ratio,
+                                recycle_ratio=args.recycle_ratio, seed=args.seed)
+        summary = (f"✅ Synthetic data created with {args.items} items in {args.categories} categories "
+                   f"and {args.materials} materials (seed {args.seed})")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+    if args.wiki_archive:
+        from wiki_fixtures import save_archive
+        save_archive({'base_url': 'https://arcraiders.wiki', 'recorded_at': data['metadata']['scraped_at'],
+                      'responses': generate_wiki_pages(data)}, args.wiki_archive)
+        summary += f"\n   Synthetic wiki pages written to {args.wiki_archive}"
+
+    print(summary)
+    print("\nRun: python main.py" + ('' if args.output == 'output/recycling_data.json' else f" --data {args.output}"))
+    print("Then open: output/recycling_tracker.html")
+
 
-print("✅ Sample data created with 10 items and 9 unique materials")
-print("   Materials: Steel, Polymer, Electronics, Optics, Rare Alloy, Power Cell, Medical Supplies, Explosives")
-print("\nRun: python main.py")
-print("Then open: output/recycling_tracker.html")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Arc Raiders Recycling Tracker - Data Schema Module
+
+Schema v2 stores each item's results as separate `recycling` and
+`salvaging` lists of {'name', 'quantity'} with precomputed
+`recycling_total` / `salvaging_total`. Schema v1 had a single `materials`
+list in which salvaging entries carried a "(Salvage) " name prefix; v1 data
+is upgraded on load.
+"""
+from typing import Dict, List, Tuple
+
+SCHEMA_VERSION = '2.0'
+
+# Name prefix marking salvaging entries in a v1 `materials` list
+SALVAGE_PREFIX = '(Salvage) '
+
+
+def split_v1_materials(materials: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+    """Split a v1 `materials` list into (recycling, salvaging) lists."""
+    recycling = []
+    salvaging = []
+    for material in materials:
+        name = material['name']
+        if name.startswith(SALVAGE_PREFIX):
+            salvaging.append({'name': name[len(SALVAGE_PREFIX):].strip(), 'quantity': material['quantity']})
+        else:
+            recycling.append({'name': name, 'quantity': material['quantity']})
+    return recycling, salvaging
+
+
+def total_quantity(materials: List[Dict]) -> int:
+    """Sum of quantities in a result list."""
+    return sum(material.get('quantity') or 0 for material in materials)
+
+
+def upgrade_item(item: Dict) -> Dict:
+    """
+    Return an item in v2 shape.
+
+    v1 items have their `materials` split by the salvage prefix; v2 items
+    missing totals get them computed. Other keys are kept.
+    """
+    if 'recycling' in item or 'salvaging' in item:
+        recycling = item.get('recycling', [])
+        salvaging = item.get('salvaging', [])
+    else:
+        recycling, salvaging = split_v1_materials(item.get('materials', []))
+
+    upgraded = {key: value for key, value in item.items() if key != 'materials'}
+    upgraded['recycling'] = recycling
+    upgraded['salvaging'] = salvaging
+    if 'recycling_total' not in item:
+        upgraded['recycling_total'] = total_quantity(recycling)
+    if 'salvaging_total' not in item:
+        upgraded['salvaging_total'] = total_quantity(salvaging)
+    return upgraded
+
+
+def upgrade_data(data: Dict) -> Dict:
+    """Return a dataset with every item in v2 shape; metadata is kept as is."""
+    upgraded = dict(data)
+    upgraded['categories'] = {category: [upgrade_item(item) for item in items]
+                              for category, items in data['categories'].items()}
+    return upgraded
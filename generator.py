@@ -1,35 +1,121 @@
 """
 Arc Raiders Recycling Tracker - HTML Generator Module
 """
+import heapq
+import html
 import json
 import os
 import logging
-from typing import Dict, List
+import re
+from typing import Callable, Dict, List, Optional
+
+from data_schema import upgrade_data
+from instrumentation import PipelineStats
+from store import SQLiteStore, is_store_path
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 
+# Words indexed for search; the page splits queries the same way
+SEARCH_WORD = re.compile(r'\w+')
+
+
+def shard_directory(output_filepath: str) -> str:
+    """Directory for a sharded page's data files, e.g. recycling_tracker_data/."""
+    return os.path.splitext(output_filepath)[0] + '_data'
+
+
 class HTMLGenerator:
     """Generates an interactive HTML page from recycling data."""
     
-    def __init__(self, data_filepath: str):
+    # How table data is embedded in the page: 'rows' as ready-made cell HTML
+    # per row, 'compact' as string tables plus integer arrays decoded in the
+    # page (much smaller for large datasets)
+    PAYLOAD_MODES = ('rows', 'compact')
+    
+    def __init__(self, data_filepath: str, stats: Optional[PipelineStats] = None,
+                 payload: str = 'rows', shard_size: int = 0, prerender_rows: int = 50):
         """
         Initialize the HTMLGenerator.
         
         Args:
-            data_filepath: Path to the JSON data file
+            data_filepath: Path to the JSON data file, or a SQLite store
+                (.db / .sqlite / .sqlite3)
+            stats: PipelineStats receiving load and per-section generation
+                timings (default: a new instance, available as self.stats)
+            payload: Embedded data encoding, one of PAYLOAD_MODES
+            shard_size: If positive, write the data as shard files of this
+                many rows next to the HTML file, loaded by the page as
+                needed, instead of embedding it (default: 0, embed)
+            prerender_rows: Number of rows, in name order, written into the
+                page as static HTML for the script to take over (default: 50)
         """
+        if payload not in self.PAYLOAD_MODES:
+            raise ValueError(f"Unknown payload mode {payload!r}; expected one of {self.PAYLOAD_MODES}")
+        if shard_size < 0:
+            raise ValueError(f"shard_size must not be negative, got {shard_size}")
+        if prerender_rows < 0:
+            raise ValueError(f"prerender_rows must not be negative, got {prerender_rows}")
+        self.payload = payload
+        self.shard_size = shard_size
+        self.prerender_rows = prerender_rows
         self.data_filepath = data_filepath
         self.data = None
+        self.stats = stats if stats is not None else PipelineStats()
         self.logger = logging.getLogger(__name__)
     
+    def validate_data(self, data: Dict) -> None:
+        """
+        Check that loaded data has the shape the page needs.
+        
+        Args:
+            data: Dictionary in the JSON data file shape (schema v1 or v2)
+            
+        Raises:
+            ValueError: If the data doesn't match the expected schema
+        """
+        if 'categories' not in data:
+            raise ValueError("Invalid JSON: missing 'categories' key")
+        
+        if not isinstance(data['categories'], dict):
+            raise ValueError("Invalid JSON: 'categories' must be a dictionary")
+        
+        # Validate each category has items
+        for category_name, items in data['categories'].items():
+            if not isinstance(items, list):
+                raise ValueError(f"Invalid JSON: category '{category_name}' must contain a list of items")
+            
+            # Validate item structure
+            for item in items:
+                if not isinstance(item, dict):
+                    raise ValueError(f"Invalid JSON: items must be dictionaries")
+                
+                required_fields = ['name', 'url']
+                for field in required_fields:
+                    if field not in item:
+                        raise ValueError(f"Invalid JSON: item missing required field '{field}'")
+                
+                # Validate materials: v2 result lists, or the v1 combined list
+                result_fields = [field for field in ('recycling', 'salvaging') if field in item]
+                if not result_fields:
+                    if 'materials' not in item:
+                        raise ValueError("Invalid JSON: item missing required field 'recycling' or 'materials'")
+                    result_fields = ['materials']
+                for field in result_fields:
+                    if not isinstance(item[field], list):
+                        raise ValueError(f"Invalid JSON: item {field} must be a list")
+    
     def load_data(self) -> Dict:
         """
-        Load and validate JSON data.
+        Load and validate JSON data, or the same data from a SQLite store.
+        
+        Both schema v1 (a single `materials` list with "(Salvage) " name
+        prefixes) and v2 (separate `recycling` / `salvaging` lists) are
+        accepted; items are upgraded to v2 in memory.
         
         Returns:
-            Dictionary containing the loaded data
+            Dictionary containing the loaded data, items in schema v2 shape
             
         Raises:
             FileNotFoundError: If JSON file doesn't exist
@@ -44,39 +130,22 @@ class HTMLGenerator:
             )
         
         try:
-            with open(self.data_filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with self.stats.timer('load_data'):
+                if is_store_path(self.data_filepath):
+                    with SQLiteStore(self.data_filepath) as store:
+                        data = store.load()
+                else:
+                    with open(self.data_filepath, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
             
             # Check version for backward compatibility
             version = data.get('metadata', {}).get('version', '1.0')
             self.logger.info(f"Data file version: {version}")
             
             # Validate schema
-            if 'categories' not in data:
-                raise ValueError("Invalid JSON: missing 'categories' key")
-            
-            if not isinstance(data['categories'], dict):
-                raise ValueError("Invalid JSON: 'categories' must be a dictionary")
-            
-            # Validate each category has items
-            for category_name, items in data['categories'].items():
-                if not isinstance(items, list):
-                    raise ValueError(f"Invalid JSON: category '{category_name}' must contain a list of items")
-                
-                # Validate item structure
-                for item in items:
-                    if not isinstance(item, dict):
-                        raise ValueError(f"Invalid JSON: items must be dictionaries")
-                    
-                    required_fields = ['name', 'url', 'materials']
-                    for field in required_fields:
-                        if field not in item:
-                            raise ValueError(f"Invalid JSON: item missing required field '{field}'")
-                    
-                    # Validate materials
-                    if not isinstance(item['materials'], list):
-                        raise ValueError(f"Invalid JSON: item materials must be a list")
+            self.validate_data(data)
             
+            data = upgrade_data(data)
             self.data = data
             self.logger.info(f"Successfully loaded data with {data.get('metadata', {}).get('total_items', 0)} items")
             return data
@@ -91,6 +160,9 @@ class HTMLGenerator:
         """
         Generate the complete HTML file.
         
+        With a shard_size the data shards are written first and the page
+        only embeds their manifest.
+        
         Args:
             output_filepath: Path where the HTML file will be saved
         """
@@ -99,6 +171,11 @@ class HTMLGenerator:
         if self.data is None:
             self.load_data()
         
+        # Rows are built once and shared by the sections that need them
+        with self.stats.timer('generate.rows'):
+            rows = self.build_rows()
+        manifest = self.write_shards(output_filepath, rows) if self.shard_size else None
+        
         # Build HTML document
         html_parts = []
         html_parts.append('<!DOCTYPE html>')
@@ -107,25 +184,27 @@ class HTMLGenerator:
         html_parts.append('    <meta charset="UTF-8">')
         html_parts.append('    <meta name="viewport" content="width=device-width, initial-scale=1.0">')
         html_parts.append('    <title>Arc Raiders Recycling Tracker</title>')
-        html_parts.append(self.embed_css())
+        html_parts.append(self._timed_section('css', self.embed_css))
         html_parts.append('</head>')
         html_parts.append('<body>')
         html_parts.append('    <div class="container">')
         html_parts.append('        <h1>Arc Raiders Recycling Tracker</h1>')
         html_parts.append('        <div id="controls">')
         html_parts.append('            <div id="checkboxes">')
-        html_parts.append(self.generate_checkboxes_html())
+        html_parts.append(self._timed_section('checkboxes', lambda: self.generate_checkboxes_html(rows)))
         html_parts.append('            </div>')
+        html_parts.append('            <input type="search" id="search" '
+                          'placeholder="Search items, categories and materials" aria-label="Search">')
         html_parts.append('            <div id="sorting">')
         html_parts.append('                <button id="sort-asc">Sort Ascending ↑</button>')
         html_parts.append('                <button id="sort-desc">Sort Descending ↓</button>')
         html_parts.append('            </div>')
         html_parts.append('        </div>')
         html_parts.append('        <div id="results">')
-        html_parts.append(self.generate_table_html())
+        html_parts.append(self._timed_section('table', lambda: self.generate_table_html(rows)))
         html_parts.append('        </div>')
         html_parts.append('    </div>')
-        html_parts.append(self.embed_javascript())
+        html_parts.append(self._timed_section('javascript', lambda: self.embed_javascript(manifest, rows)))
         html_parts.append('</body>')
         html_parts.append('</html>')
         
@@ -133,34 +212,85 @@ class HTMLGenerator:
         
         # Write to file
         try:
-            with open(output_filepath, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            with self.stats.timer('generate.write'):
+                with open(output_filepath, 'w', encoding='utf-8') as f:
+                    f.write(html_content)
             self.logger.info(f"Successfully generated HTML at {output_filepath}")
         except Exception as e:
             self.logger.error(f"Error writing HTML file: {e}")
             raise
     
-    def generate_checkboxes_html(self) -> str:
+    def _timed_section(self, section: str, build: Callable[[], str]) -> str:
+        """Build one section of the page, timing it as generate.<section>."""
+        with self.stats.timer(f'generate.{section}'):
+            return build()
+    
+    def generate_checkboxes_html(self, rows: Optional[List[Dict]] = None) -> str:
         """
         Generate HTML for material checkboxes.
         
+        Each checkbox's value is the material's index in material_names(),
+        which is how the page looks up its row sets.
+        
+        Args:
+            rows: Rows from build_rows (default: built from the loaded data)
+        
         Returns:
             HTML string containing checkbox elements
         """
-        # For the new Loot-based view we don't need per-material checkboxes by
-        # default. Keep a small explanatory paragraph instead.
-        return '<p>Select sorting buttons below to sort the table by item name, recycling results, or salvaging results.</p>'
+        if rows is None:
+            rows = self.build_rows()
+        checkboxes_html = ['''                <div class="filter-options">
+                    <label>Show items with
+                        <select id="material-match">
+                            <option value="any">any</option>
+                            <option value="all">all</option>
+                        </select>
+                        of the checked materials from
+                        <select id="material-kind">
+                            <option value="both">recycling or salvaging</option>
+                            <option value="recycling">recycling</option>
+                            <option value="salvaging">salvaging</option>
+                        </select>
+                    </label>
+                </div>''']
+        for index, name in enumerate(self.material_names(rows)):
+            checkboxes_html.append(f'                <label class="checkbox-label"><input type="checkbox" value="{index}">'
+                                   f'<span>{html.escape(name)}</span></label>')
+        return '\n'.join(checkboxes_html)
     
-    def generate_table_html(self) -> str:
+    def generate_table_html(self, rows: Optional[List[Dict]] = None) -> str:
         """
         Generate HTML for the items table.
         
+        The first prerender_rows rows in name-ascending order, the page's
+        initial view, are rendered here so they show before any script
+        runs; the script adopts these <tr> elements rather than rebuilding
+        them.
+        
+        Args:
+            rows: Rows from build_rows (default: built from the loaded data)
+        
         Returns:
             HTML string containing the table structure
         """
-        table_html = '''
+        if rows is None:
+            rows = self.build_rows()
+        first_rows = heapq.nsmallest(self.prerender_rows, rows, key=lambda row: row['name'].lower())
+        if first_rows:
+            body_html = '\n'.join(
+                '                    <tr>' + ''.join(f'<td>{cell}</td>' for cell in self.render_row_cells(row)) + '</tr>'
+                for row in first_rows)
+        else:
+            # Not a table row: the script never adopts it
+            message = 'Loading…' if rows else 'No data available'
+            body_html = f'''                    <tr class="placeholder">
+                        <td colspan="4" class="no-data">{message}</td>
+                    </tr>'''
+        
+        table_html = f'''
             <table id="items-table">
-                <thead>
+                <thead id="table-head">
                     <tr>
                         <th>Item Name</th>
                         <th>Category</th>
@@ -169,9 +299,7 @@ class HTMLGenerator:
                     </tr>
                 </thead>
                 <tbody id="table-body">
-                    <tr>
-                        <td colspan="4" class="no-data">No data available</td>
-                    </tr>
+{body_html}
                 </tbody>
             </table>'''
 
@@ -226,6 +354,17 @@ class HTMLGenerator:
             background-color: #f9f9f9;
             border-radius: 6px;
             margin-bottom: 20px;
+            max-height: 260px;
+            overflow-y: auto;
+        }
+        
+        .filter-options {
+            flex-basis: 100%;
+        }
+        
+        .filter-options select {
+            padding: 4px;
+            font-size: inherit;
         }
         
         .checkbox-label {
@@ -258,6 +397,21 @@ class HTMLGenerator:
             color: #4CAF50;
         }
         
+        #search {
+            display: block;
+            width: 100%;
+            padding: 10px 12px;
+            font-size: 16px;
+            border: 2px solid #ddd;
+            border-radius: 4px;
+            margin-bottom: 20px;
+        }
+        
+        #search:focus {
+            outline: none;
+            border-color: #4CAF50;
+        }
+        
         #sorting {
             display: flex;
             gap: 10px;
@@ -286,7 +440,8 @@ class HTMLGenerator:
         }
         
         #results {
-            overflow-x: auto;
+            overflow: auto;
+            max-height: 75vh;
         }
         
         table {
@@ -301,6 +456,16 @@ class HTMLGenerator:
             border-bottom: 1px solid #ddd;
         }
         
+        /* Rows are virtualized and must all have the same height */
+        #table-body td {
+            white-space: nowrap;
+        }
+        
+        #table-body tr.spacer td {
+            padding: 0;
+            border: none;
+        }
+        
         th {
             background-color: #4CAF50;
             color: white;
@@ -347,119 +512,774 @@ class HTMLGenerator:
         
         return css
     
-    def embed_javascript(self) -> str:
+    def build_rows(self) -> List[Dict]:
+        """
+        Flatten all categories into table rows, in category order.
+        
+        Returns:
+            List of row dictionaries with the keys the page script reads
+        """
+        rows = []
+        for category, items in self.data['categories'].items():
+            for item in items:
+                rows.append({
+                    'name': item['name'],
+                    'category': category,
+                    'url': item['url'],
+                    'recycling': item['recycling'],
+                    'salvaging': item['salvaging'],
+                    'recyclingTotal': item['recycling_total'],
+                    'salvagingTotal': item['salvaging_total']
+                })
+        return rows
+    
+    def build_sort_orders(self, rows: List[Dict]) -> Dict[str, List[int]]:
+        """
+        Compute ascending sort permutations of the rows.
+        
+        The page sorts descending by walking a permutation backwards, so no
+        sorting happens in the browser.
+        
+        Args:
+            rows: Rows from build_rows
+            
+        Returns:
+            Dictionary mapping 'name', 'recycling' and 'salvaging' to lists of
+            row indexes in ascending order (stable for equal keys)
+        """
+        indexes = range(len(rows))
+        return {
+            'name': sorted(indexes, key=lambda i: rows[i]['name'].lower()),
+            'recycling': sorted(indexes, key=lambda i: rows[i]['recyclingTotal']),
+            'salvaging': sorted(indexes, key=lambda i: rows[i]['salvagingTotal'])
+        }
+    
+    def material_names(self, rows: List[Dict]) -> List[str]:
+        """Names of every recycling or salvaging material, case-insensitively sorted."""
+        names = {material['name'] for row in rows for kind in ('recycling', 'salvaging') for material in row[kind]}
+        return sorted(names, key=lambda name: (name.lower(), name))
+    
+    def build_material_sets(self, rows: List[Dict]) -> Dict:
+        """
+        Build the row sets behind the material filter.
+        
+        For each material, in material_names() order, the ascending indexes
+        of the rows yielding it, separately for recycling and salvaging and
+        stored as gaps. The page turns a set into a bitset the first time
+        its checkbox is used; shipping bitsets would cost rows/8 bytes per
+        material and kind however rare the material.
+        
+        Args:
+            rows: Rows from build_rows, in the order the page indexes them
+            
+        Returns:
+            {'recycling': [[gaps] per material], 'salvaging': [[gaps] per material]}
+        """
+        material_index = {name: index for index, name in enumerate(self.material_names(rows))}
+        sets = {}
+        for kind in ('recycling', 'salvaging'):
+            gaps: List[List[int]] = [[] for _ in material_index]
+            previous = [0] * len(material_index)
+            for index, row in enumerate(rows):
+                # A material listed twice for one item is still one row
+                for material in {material_index[m['name']] for m in row[kind]}:
+                    gaps[material].append(index - previous[material])
+                    previous[material] = index
+            sets[kind] = gaps
+        return sets
+    
+    def build_search_index(self, rows: List[Dict]) -> Dict:
+        """
+        Build the inverted index behind the page's search box.
+        
+        Each row is indexed under the lowercased words of its name, category
+        and recycling and salvaging material names. Tokens are sorted, so
+        the page finds every token starting with a query word by binary
+        search; each token's row indexes are stored ascending, as gaps.
+        
+        Args:
+            rows: Rows from build_rows, in the order the page indexes them
+            
+        Returns:
+            {'tokens': [...], 'counts': [rows per token], 'ids': [gaps]}
+        """
+        postings: Dict[str, List[int]] = {}
+        for index, row in enumerate(rows):
+            text = ' '.join([row['name'], row['category']]
+                            + [m['name'] for m in row['recycling']]
+                            + [m['name'] for m in row['salvaging']])
+            for token in set(SEARCH_WORD.findall(text.lower())):
+                postings.setdefault(token, []).append(index)
+        
+        # Ordered as JavaScript compares strings (by UTF-16 code unit)
+        tokens = sorted(postings, key=lambda token: token.encode('utf-16-be'))
+        ids = []
+        for token in tokens:
+            previous = 0
+            for index in postings[token]:
+                ids.append(index - previous)
+                previous = index
+        return {'tokens': tokens, 'counts': [len(postings[token]) for token in tokens], 'ids': ids}
+    
+    def render_row_cells(self, row: Dict) -> List[str]:
+        """
+        Render a row's four table cells as HTML, escaping every value once
+        here so the page can assign them with innerHTML directly.
+        
+        Args:
+            row: Row from build_rows
+            
+        Returns:
+            Inner HTML of the name, category, recycling and salvaging cells
+        """
+        def results(materials):
+            return ', '.join(f"{html.escape(m['name'])} x{m['quantity']}" for m in materials) or '—'
+        
+        name_link = (f'<a href="{html.escape(row["url"] or "#")}" target="_blank" rel="noopener">'
+                     f'{html.escape(row["name"])}</a>')
+        return [name_link, html.escape(row['category']), results(row['recycling']), results(row['salvaging'])]
+    
+    def build_compact_payload(self, rows: List[Dict]) -> Dict:
+        """
+        Dictionary-encode the rows for the 'compact' payload mode.
+        
+        Category and material names are interned into string tables, URLs
+        are stored as suffixes of their longest common prefix (0 when the
+        suffix is just the item name with underscores, as for wiki page
+        titles), and results are flat [material index, quantity, ...] arrays
+        with a material count per row. All strings are HTML-escaped here,
+        once per distinct value.
+        
+        Args:
+            rows: Rows from build_rows
+            
+        Returns:
+            JSON-serializable payload decoded by the page's rowCells()
+        """
+        categories: Dict[str, int] = {}
+        materials: Dict[str, int] = {}
+        
+        urls = [row['url'] for row in rows if row['url']]
+        base = os.path.commonprefix(urls) if urls else ''
+        base = base[:base.rfind('/') + 1]
+        
+        payload = {
+            'base': html.escape(base),
+            'categories': [],
+            'materials': [],
+            'names': [],
+            'paths': [],
+            'category': [],
+            'recycling': [],
+            'recyclingCount': [],
+            'salvaging': [],
+            'salvagingCount': []
+        }
+        for row in rows:
+            payload['names'].append(html.escape(row['name']))
+            if not row['url']:
+                path = None
+            elif row['url'][len(base):] == row['name'].replace(' ', '_'):
+                path = 0
+            else:
+                path = html.escape(row['url'][len(base):])
+            payload['paths'].append(path)
+            payload['category'].append(categories.setdefault(row['category'], len(categories)))
+            for kind in ('recycling', 'salvaging'):
+                flat = payload[kind]
+                for material in row[kind]:
+                    flat.append(materials.setdefault(material['name'], len(materials)))
+                    flat.append(material['quantity'])
+                payload[kind + 'Count'].append(len(row[kind]))
+        
+        payload['categories'] = [html.escape(name) for name in categories]
+        payload['materials'] = [html.escape(name) for name in materials]
+        return payload
+    
+    def encode_payload(self, rows: List[Dict]):
+        """
+        Encode rows in the configured payload mode.
+        
+        Args:
+            rows: Rows from build_rows
+            
+        Returns:
+            JSON-serializable data read by the page's makeDecoder()
+        """
+        if self.payload == 'compact':
+            return self.build_compact_payload(rows)
+        return [self.render_row_cells(row) for row in rows]
+    
+    def _decoder_js(self) -> str:
+        """
+        JavaScript defining makeDecoder(data), which turns encoded rows into
+        a function from row index to the inner HTML of its four cells.
+        """
+        if self.payload == 'compact':
+            return '''
+        // Dictionary-encoded table data; strings are escaped at build time
+        function makeDecoder(payload) {
+            // Start offsets into the flat result arrays, from per-row counts
+            function startOffsets(counts) {
+                const starts = new Uint32Array(counts.length + 1);
+                for (let i = 0; i < counts.length; i++) {
+                    starts[i + 1] = starts[i] + 2 * counts[i];
+                }
+                return starts;
+            }
+            const recyclingStart = startOffsets(payload.recyclingCount);
+            const salvagingStart = startOffsets(payload.salvagingCount);
+
+            function resultsHtml(flat, start, end) {
+                if (start === end) return '—';
+                const parts = [];
+                for (let k = start; k < end; k += 2) {
+                    parts.push(payload.materials[flat[k]] + ' x' + flat[k + 1]);
+                }
+                return parts.join(', ');
+            }
+
+            return function (index) {
+                const path = payload.paths[index];
+                const href = path === null ? '#'
+                    : payload.base + (path === 0 ? payload.names[index].replace(/ /g, '_') : path);
+                return [
+                    '<a href="' + href + '" target="_blank" rel="noopener">' + payload.names[index] + '</a>',
+                    payload.categories[payload.category[index]],
+                    resultsHtml(payload.recycling, recyclingStart[index], recyclingStart[index + 1]),
+                    resultsHtml(payload.salvaging, salvagingStart[index], salvagingStart[index + 1])
+                ];
+            };
+        }'''
+        
+        return '''
+        // Table cells as HTML, escaped at build time
+        function makeDecoder(rows) {
+            return index => rows[index];
+        }'''
+    
+    def write_shards(self, output_filepath: str, rows: Optional[List[Dict]] = None) -> Dict:
+        """
+        Write the table data as shard scripts next to the HTML file.
+        
+        Rows are sorted by name and split into shards of shard_size rows,
+        each a script calling trackerShard(n, data) so the page can load it
+        with a <script> tag, which also works for pages opened from disk.
+        The non-name sort permutations go in orders.js, the search index in
+        search.js, the material filter sets in materials.js, and a
+        manifest.json describes the files. Shards left over from an earlier,
+        larger run are removed.
+        
+        Args:
+            output_filepath: Path of the HTML file the shards belong to
+            rows: Rows from build_rows (default: built from the loaded data)
+            
+        Returns:
+            The manifest, with file paths relative to the HTML file
+        """
+        directory = shard_directory(output_filepath)
+        prefix = os.path.basename(directory) + '/'
+        os.makedirs(directory, exist_ok=True)
+        
+        with self.stats.timer('generate.shards'):
+            # Storing rows in name order makes the default view the identity
+            # permutation, so the first rows shown are all in the first shard.
+            # The other orders are remapped rather than re-sorted, keeping
+            # ties in the same order as an embedded page.
+            if rows is None:
+                rows = self.build_rows()
+            orders = self.build_sort_orders(rows)
+            by_name = orders.pop('name')
+            position = [0] * len(rows)
+            for new_index, old_index in enumerate(by_name):
+                position[old_index] = new_index
+            rows = [rows[i] for i in by_name]
+            orders = {key: [position[i] for i in order] for key, order in orders.items()}
+            
+            shard_files = []
+            for start in range(0, len(rows), self.shard_size):
+                filename = f"shard-{len(shard_files):05d}.js"
+                with open(os.path.join(directory, filename), 'w', encoding='utf-8') as f:
+                    f.write(f"trackerShard({len(shard_files)},"
+                            f"{self._js_literal(self.encode_payload(rows[start:start + self.shard_size]))});\n")
+                shard_files.append(filename)
+            with open(os.path.join(directory, 'orders.js'), 'w', encoding='utf-8') as f:
+                f.write(f"trackerOrders({self._js_literal(orders)});\n")
+            with open(os.path.join(directory, 'search.js'), 'w', encoding='utf-8') as f:
+                f.write(f"trackerSearch({self._js_literal(self.build_search_index(rows))});\n")
+            with open(os.path.join(directory, 'materials.js'), 'w', encoding='utf-8') as f:
+                f.write(f"trackerMaterials({self._js_literal(self.build_material_sets(rows))});\n")
+            
+            for filename in os.listdir(directory):
+                if filename.startswith('shard-') and filename.endswith('.js') and filename not in shard_files:
+                    os.remove(os.path.join(directory, filename))
+            
+            manifest = {
+                'payload': self.payload,
+                'total': len(rows),
+                'shardSize': self.shard_size,
+                'shards': [prefix + filename for filename in shard_files],
+                'orders': prefix + 'orders.js',
+                'search': prefix + 'search.js',
+                'materials': prefix + 'materials.js'
+            }
+            with open(os.path.join(directory, 'manifest.json'), 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2, ensure_ascii=False)
+        
+        self.logger.info(f"Wrote {len(shard_files)} data shards to {directory}")
+        return manifest
+    
+    def _data_js(self, manifest: Optional[Dict], rows: List[Dict]) -> str:
+        """
+        JavaScript declaring rowCount, rowCells(index), orderFor(key),
+        loadSearchIndex() and loadMaterialSets(), from embedded data or, for
+        a sharded page, from shard scripts.
+        """
+        if manifest is None:
+            # Rows, their escaped cells and sort orders are computed here
+            # rather than in the browser
+            payload_json = self._js_literal(self.encode_payload(rows))
+            orders_json = self._js_literal(self.build_sort_orders(rows))
+            search_json = self._js_literal(self.build_search_index(rows))
+            materials_json = self._js_literal(self.build_material_sets(rows))
+            return f'''
+        const rowCells = makeDecoder({payload_json});
+
+        // Precomputed ascending sort permutations
+        const sortOrders = {orders_json};
+        const rowCount = sortOrders.name.length;
+
+        function orderFor(key) {{
+            return sortOrders[key];
+        }}
+
+        // Search index, decoded on first use
+        const searchData = {search_json};
+        let searchIndex = null;
+
+        function loadSearchIndex() {{
+            if (searchIndex === null) searchIndex = decodeSearchIndex(searchData);
+            return searchIndex;
+        }}
+
+        // Rows yielding each material, by kind
+        const materialSets = {materials_json};
+
+        function loadMaterialSets() {{
+            return materialSets;
+        }}'''
+        
+        return f'''
+        // Rows are in shard scripts of manifest.shardSize rows each, in name
+        // order; a shard loads when the table first needs one of its rows
+        const manifest = {self._js_literal(manifest)};
+        const rowCount = manifest.total;
+        const shards = [];
+        const requested = [];
+
+        function loadScript(src) {{
+            const script = document.createElement('script');
+            script.src = src;
+            document.head.appendChild(script);
+        }}
+
+        // Called by each shard script
+        window.trackerShard = function (n, data) {{
+            shards[n] = makeDecoder(data);
+            scheduleRender();
+            requestOrders();
+        }};
+
+        // Cells of a row, or null while its shard is loading
+        function rowCells(index) {{
+            const n = Math.floor(index / manifest.shardSize);
+            if (shards[n] === undefined) {{
+                if (!requested[n]) {{
+                    requested[n] = true;
+                    loadScript(manifest.shards[n]);
+                }}
+                return null;
+            }}
+            return shards[n](index - n * manifest.shardSize);
+        }}
+
+        // The other sort permutations load with the first shard, or on the
+        // first sort that needs them
+        let sortOrders = null;
+        let ordersRequested = false;
+
+        function requestOrders() {{
+            if (ordersRequested) return;
+            ordersRequested = true;
+            loadScript(manifest.orders);
+        }}
+
+        window.trackerOrders = function (orders) {{
+            sortOrders = orders;
+            if (pendingSort) renderTable(...pendingSort);
+        }};
+
+        // Name order is the identity (null); undefined until orders arrive
+        function orderFor(key) {{
+            if (key === 'name') return null;
+            if (sortOrders === null) {{
+                requestOrders();
+                return undefined;
+            }}
+            return sortOrders[key];
+        }}
+
+        // Search index, loaded on first use; null until it arrives
+        let searchIndex = null;
+        let searchRequested = false;
+
+        function loadSearchIndex() {{
+            if (searchIndex === null && !searchRequested) {{
+                searchRequested = true;
+                loadScript(manifest.search);
+            }}
+            return searchIndex;
+        }}
+
+        window.trackerSearch = function (data) {{
+            searchIndex = decodeSearchIndex(data);
+            applyFilters();
+        }};
+
+        // Material filter sets, loaded on first use; null until they arrive
+        let materialSets = null;
+        let materialsRequested = false;
+
+        function loadMaterialSets() {{
+            if (materialSets === null && !materialsRequested) {{
+                materialsRequested = true;
+                loadScript(manifest.materials);
+            }}
+            return materialSets;
+        }}
+
+        window.trackerMaterials = function (data) {{
+            materialSets = data;
+            applyFilters();
+        }};'''
+    
+    def _js_literal(self, value) -> str:
+        """JSON for embedding in a script tag; '</' cannot close the tag."""
+        return json.dumps(value, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+    
+    def embed_javascript(self, manifest: Optional[Dict] = None, rows: Optional[List[Dict]] = None) -> str:
         """
         Generate embedded JavaScript for interactivity.
         
+        The table is virtualized: only the rows in and near the viewport
+        exist in the DOM, and their <tr> nodes are reused as the table
+        scrolls, so the page stays responsive with 100k+ rows.
+        
+        Args:
+            manifest: Shard manifest from write_shards, to load rows from
+                shard files instead of embedding them
+            rows: Rows from build_rows (default: built from the loaded data)
+        
         Returns:
             HTML script tag with JavaScript
         """
-        # Embed the data as JSON for JavaScript to use
-        data_json = json.dumps(self.data)
-
+        if rows is None:
+            rows = self.build_rows()
         js = f'''
-    <script>
-        // Embedded data
-        const recyclingData = {data_json};
+    <script>{self._decoder_js()}
+{self._data_js(manifest, rows)}
 
+        const scroller = document.getElementById('results');
+        const tableHead = document.getElementById('table-head');
         const tableBody = document.getElementById('table-body');
 
-        // Build a flat list of items with separate recycling/salvaging lists
-        function buildItems() {{
-            const items = [];
-            Object.keys(recyclingData.categories).forEach(category => {{
-                recyclingData.categories[category].forEach(item => {{
-                    const recycling = [];
-                    const salvaging = [];
-                    (item.materials || []).forEach(m => {{
-                        if (m.name && m.name.startsWith('(Salvage)')) {{
-                            const name = m.name.replace('(Salvage) ', '').trim();
-                            salvaging.push({{name: name, quantity: m.quantity}});
-                        }} else {{
-                            recycling.push({{name: m.name, quantity: m.quantity}});
-                        }}
-                    }});
-
-                    const recyclingTotal = recycling.reduce((s, x) => s + (x.quantity || 0), 0);
-                    const salvagingTotal = salvaging.reduce((s, x) => s + (x.quantity || 0), 0);
-
-                    items.push({{
-                        name: item.name,
-                        category: category,
-                        url: item.url,
-                        recycling: recycling,
-                        salvaging: salvaging,
-                        recyclingTotal: recyclingTotal,
-                        salvagingTotal: salvagingTotal
-                    }});
-                }});
-            }});
-            return items;
+        // Rows rendered above and below the viewport
+        const OVERSCAN = 10;
+
+        // Current order: a sort permutation (null for row index order),
+        // walked backwards for descending
+        let sortOrder = null;
+        let viewAsc = true;
+        let pendingSort = null;
+
+        // Bitset of the rows passing the search and material filter, or
+        // null for all rows
+        let filterBits = null;
+        // Rows passing the filter in display order, or null when unfiltered
+        let view = null;
+        let viewLength = rowCount;
+
+        let rowHeight = 0;
+        const pool = [];
+        let attached = -1;
+        const topSpacer = makeSpacer();
+        const bottomSpacer = makeSpacer();
+
+        function makeSpacer() {{
+            const row = document.createElement('tr');
+            row.className = 'spacer';
+            const cell = document.createElement('td');
+            cell.colSpan = 4;
+            row.appendChild(cell);
+            return row;
         }}
 
-        function renderTable(items) {{
-            tableBody.innerHTML = '';
-            if (!items || items.length === 0) {{
-                const row = document.createElement('tr');
-                row.innerHTML = '<td colspan="4" class="no-data">No items found</td>';
-                tableBody.appendChild(row);
+        function makeRow() {{
+            const row = document.createElement('tr');
+            for (let c = 0; c < 4; c++) {{
+                row.appendChild(document.createElement('td'));
+            }}
+            row.shownRow = -1;
+            return row;
+        }}
+
+        function rowAt(position) {{
+            if (view !== null) return view[position];
+            if (!viewAsc) position = rowCount - 1 - position;
+            return sortOrder === null ? position : sortOrder[position];
+        }}
+
+        // Apply the filter to the current order: one pass over the rows
+        function buildView() {{
+            if (filterBits === null) {{
+                view = null;
+                viewLength = rowCount;
                 return;
             }}
+            const rows = new Uint32Array(rowCount);
+            let n = 0;
+            for (let i = 0; i < rowCount; i++) {{
+                const position = viewAsc ? i : rowCount - 1 - i;
+                const row = sortOrder === null ? position : sortOrder[position];
+                if (filterBits[row >>> 5] & (1 << (row & 31))) rows[n++] = row;
+            }}
+            view = rows.subarray(0, n);
+            viewLength = n;
+        }}
 
-            items.forEach(item => {{
-                const row = document.createElement('tr');
-                const recyclingText = item.recycling.map(r => `${{escapeHtml(r.name)}} x${{r.quantity}}`).join(', ');
-                const salvagingText = item.salvaging.map(r => `${{escapeHtml(r.name)}} x${{r.quantity}}`).join(', ');
-
-                // Render item name as a link to the source page
-                const nameLink = `<a href="${{escapeHtml(item.url || '#')}}" target="_blank" rel="noopener">${{escapeHtml(item.name)}}</a>`;
-
-                row.innerHTML = `
-                    <td>${{nameLink}}</td>
-                    <td>${{escapeHtml(item.category)}}</td>
-                    <td>${{recyclingText || '—'}}</td>
-                    <td>${{salvagingText || '—'}}</td>
-                `;
-                tableBody.appendChild(row);
-            }});
+        function renderWindow() {{
+            const total = viewLength;
+            if (total === 0) {{
+                attached = -1;
+                tableBody.innerHTML = '<tr><td colspan="4" class="no-data">No items found</td></tr>';
+                return;
+            }}
+
+            if (!rowHeight) {{
+                // Measure one real row; every row has the same height
+                const probe = makeRow();
+                fillRow(probe, rowAt(0));
+                tableBody.replaceChildren(probe);
+                rowHeight = probe.getBoundingClientRect().height || 45;
+                attached = -1;
+            }}
+
+            const offset = Math.max(0, scroller.scrollTop - tableHead.offsetHeight);
+            const first = Math.max(0, Math.floor(offset / rowHeight) - OVERSCAN);
+            const last = Math.min(total, first + Math.ceil(scroller.clientHeight / rowHeight) + 2 * OVERSCAN);
+            const count = last - first;
+
+            while (pool.length < count) {{
+                pool.push(makeRow());
+            }}
+            for (let i = first; i < last; i++) {{
+                fillRow(pool[i - first], rowAt(i));
+            }}
+            topSpacer.style.height = (first * rowHeight) + 'px';
+            bottomSpacer.style.height = ((total - last) * rowHeight) + 'px';
+
+            if (attached !== count) {{
+                tableBody.replaceChildren(topSpacer, ...pool.slice(0, count), bottomSpacer);
+                attached = count;
+            }}
         }}
 
-        function escapeHtml(text) {{
-            const div = document.createElement('div');
-            div.textContent = text;
-            return div.innerHTML;
+        // Reuse a <tr>, touching the DOM only if it showed a different row
+        function fillRow(row, index) {{
+            if (row.shownRow === index) return;
+            const cells = rowCells(index);
+            if (cells === null) {{
+                // Shard still loading; the render after it arrives fills the row
+                row.children[0].textContent = 'Loading…';
+                for (let c = 1; c < 4; c++) {{
+                    row.children[c].textContent = '';
+                }}
+                row.shownRow = -1;
+                return;
+            }}
+            for (let c = 0; c < 4; c++) {{
+                row.children[c].innerHTML = cells[c];
+            }}
+            row.shownRow = index;
         }}
 
-        // Sorting helpers
-        function sortByName(items, asc=true) {{
-            return items.sort((a,b) => {{
-                const A = a.name.toLowerCase();
-                const B = b.name.toLowerCase();
-                if (A < B) return asc ? -1 : 1;
-                if (A > B) return asc ? 1 : -1;
-                return 0;
-            }});
+        function renderTable(key, asc=true) {{
+            const order = orderFor(key);
+            if (order === undefined) {{
+                // Sort order still loading; applied when it arrives
+                pendingSort = [key, asc];
+                return;
+            }}
+            pendingSort = null;
+            sortOrder = order;
+            viewAsc = asc;
+            buildView();
+            scroller.scrollTop = 0;
+            renderWindow();
+        }}
+
+        // Search: each query word must prefix a word of the item's name,
+        // category or materials
+        const QUERY_WORD = /[\\p{{L}}\\p{{N}}_]+/gu;
+        const searchBox = document.getElementById('search');
+        // Rows per query word, kept for the short prefixes that match the most
+        const prefixCache = new Map();
+
+        function decodeSearchIndex(data) {{
+            const starts = new Uint32Array(data.counts.length + 1);
+            for (let t = 0; t < data.counts.length; t++) {{
+                starts[t + 1] = starts[t] + data.counts[t];
+            }}
+            // Row indexes are stored as gaps
+            const ids = new Uint32Array(starts[data.counts.length]);
+            for (let t = 0; t < data.counts.length; t++) {{
+                let id = 0;
+                for (let k = starts[t]; k < starts[t + 1]; k++) {{
+                    id += data.ids[k];
+                    ids[k] = id;
+                }}
+            }}
+            return {{tokens: data.tokens, starts: starts, ids: ids}};
+        }}
+
+        // Bitset of the rows with an indexed word starting with prefix
+        function prefixRows(index, prefix) {{
+            let bits = prefixCache.get(prefix);
+            if (bits !== undefined) return bits;
+            bits = new Uint32Array((rowCount + 31) >>> 5);
+            let lo = 0;
+            let hi = index.tokens.length;
+            while (lo < hi) {{
+                const mid = (lo + hi) >>> 1;
+                if (index.tokens[mid] < prefix) lo = mid + 1;
+                else hi = mid;
+            }}
+            for (let t = lo; t < index.tokens.length && index.tokens[t].startsWith(prefix); t++) {{
+                for (let k = index.starts[t]; k < index.starts[t + 1]; k++) {{
+                    const id = index.ids[k];
+                    bits[id >>> 5] |= 1 << (id & 31);
+                }}
+            }}
+            if (prefix.length <= 2) prefixCache.set(prefix, bits);
+            return bits;
+        }}
+
+        // Bitset of the rows matching a query, null for an empty query, or
+        // undefined while the index is loading
+        function searchRows(query) {{
+            const words = query.toLowerCase().match(QUERY_WORD);
+            if (words === null) return null;
+            const index = loadSearchIndex();
+            if (index === null) return undefined;
+            let bits = null;
+            for (const word of words) {{
+                const rows = prefixRows(index, word);
+                if (bits === null) {{
+                    bits = rows.slice();
+                }} else {{
+                    for (let w = 0; w < bits.length; w++) bits[w] &= rows[w];
+                }}
+            }}
+            return bits;
+        }}
+
+        // Material filter: checked materials' row sets, as bitsets, combined
+        // with OR (any) or AND (all)
+        const materialBoxes = Array.from(document.querySelectorAll('#checkboxes input[type="checkbox"]'));
+        const materialMatch = document.getElementById('material-match');
+        const materialKind = document.getElementById('material-kind');
+        const materialCache = new Map();
+
+        function materialRows(sets, kind, material) {{
+            const key = kind + ':' + material;
+            let bits = materialCache.get(key);
+            if (bits !== undefined) return bits;
+            if (kind === 'both') {{
+                const salvaging = materialRows(sets, 'salvaging', material);
+                bits = materialRows(sets, 'recycling', material).slice();
+                for (let w = 0; w < bits.length; w++) bits[w] |= salvaging[w];
+            }} else {{
+                bits = new Uint32Array((rowCount + 31) >>> 5);
+                let id = 0;
+                for (const gap of sets[kind][material]) {{
+                    id += gap;
+                    bits[id >>> 5] |= 1 << (id & 31);
+                }}
+            }}
+            materialCache.set(key, bits);
+            return bits;
+        }}
+
+        // Bitset of the rows passing the material filter, null with nothing
+        // checked, or undefined while the sets are loading
+        function materialFilterRows() {{
+            const checked = materialBoxes.filter(box => box.checked);
+            if (checked.length === 0) return null;
+            const sets = loadMaterialSets();
+            if (sets === null) return undefined;
+            const all = materialMatch.value === 'all';
+            let bits = null;
+            for (const box of checked) {{
+                const rows = materialRows(sets, materialKind.value, Number(box.value));
+                if (bits === null) {{
+                    bits = rows.slice();
+                }} else if (all) {{
+                    for (let w = 0; w < bits.length; w++) bits[w] &= rows[w];
+                }} else {{
+                    for (let w = 0; w < bits.length; w++) bits[w] |= rows[w];
+                }}
+            }}
+            return bits;
         }}
 
-        function sortByRecycling(items, asc=true) {{
-            return items.sort((a,b) => asc ? a.recyclingTotal - b.recyclingTotal : b.recyclingTotal - a.recyclingTotal);
+        function applyFilters() {{
+            const searchBits = searchRows(searchBox.value);
+            const materialBits = materialFilterRows();
+            // Rerun when the index or sets arrive
+            if (searchBits === undefined || materialBits === undefined) return;
+            if (searchBits !== null && materialBits !== null) {{
+                for (let w = 0; w < searchBits.length; w++) searchBits[w] &= materialBits[w];
+            }}
+            filterBits = searchBits !== null ? searchBits : materialBits;
+            buildView();
+            scroller.scrollTop = 0;
+            renderWindow();
+        }}
+        searchBox.addEventListener('input', applyFilters);
+        searchBox.addEventListener('focus', loadSearchIndex);
+        for (const control of [...materialBoxes, materialMatch, materialKind]) {{
+            control.addEventListener('change', applyFilters);
         }}
 
-        function sortBySalvaging(items, asc=true) {{
-            return items.sort((a,b) => asc ? a.salvagingTotal - b.salvagingTotal : b.salvagingTotal - a.salvagingTotal);
+        let framePending = false;
+        function scheduleRender() {{
+            if (framePending) return;
+            framePending = true;
+            requestAnimationFrame(() => {{
+                framePending = false;
+                renderWindow();
+            }});
         }}
+        scroller.addEventListener('scroll', scheduleRender);
+        window.addEventListener('resize', scheduleRender);
 
         // Wire up buttons
         document.getElementById('sort-asc').addEventListener('click', () => {{
-            const items = buildItems();
-            const sorted = sortByName(items, true);
-            renderTable(sorted);
+            renderTable('name', true);
         }});
 
         document.getElementById('sort-desc').addEventListener('click', () => {{
-            const items = buildItems();
-            const sorted = sortByName(items, false);
-            renderTable(sorted);
+            renderTable('name', false);
         }});
 
         // Additional buttons for recycling and salvaging sort
@@ -474,14 +1294,27 @@ class HTMLGenerator:
             container.appendChild(rAsc); container.appendChild(rDesc);
             container.appendChild(sAsc); container.appendChild(sDesc);
 
-            rAsc.addEventListener('click', () => {{ renderTable(sortByRecycling(buildItems(), true)); }});
-            rDesc.addEventListener('click', () => {{ renderTable(sortByRecycling(buildItems(), false)); }});
-            sAsc.addEventListener('click', () => {{ renderTable(sortBySalvaging(buildItems(), true)); }});
-            sDesc.addEventListener('click', () => {{ renderTable(sortBySalvaging(buildItems(), false)); }});
+            rAsc.addEventListener('click', () => {{ renderTable('recycling', true); }});
+            rDesc.addEventListener('click', () => {{ renderTable('recycling', false); }});
+            sAsc.addEventListener('click', () => {{ renderTable('salvaging', true); }});
+            sDesc.addEventListener('click', () => {{ renderTable('salvaging', false); }});
+        }}
+
+        // Initial view: name ascending, whose first rows are already in the
+        // page; adopt them as the start of the row pool
+        sortOrder = orderFor('name');
+        if (rowCount > 0) {{
+            for (const row of Array.from(tableBody.children)) {{
+                if (row.children.length !== 4) continue;
+                row.shownRow = rowAt(pool.length);
+                pool.push(row);
+            }}
+            if (pool.length) rowHeight = pool[0].getBoundingClientRect().height;
         }}
+        renderWindow();
 
-        // Initial render: sort by name ascending
-        renderTable(sortByName(buildItems(), true));
+        // Keep a query or checkboxes the browser restored
+        if (searchBox.value || materialBoxes.some(box => box.checked)) applyFilters();
     </script>'''
 
         return js
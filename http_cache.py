@@ -0,0 +1,268 @@
+"""
+Arc Raiders Recycling Tracker - HTTP Response Cache Module
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class ResponseCache:
+    """
+    Persistent, size-bounded cache of HTTP response bodies.
+
+    Only responses carrying an ETag or Last-Modified validator are kept, since
+    those are the ones the server can confirm with a cheap 304 Not Modified.
+    Entries are evicted least-recently-used first once the total body size
+    exceeds max_bytes.
+    """
+
+    INDEX_FILENAME = 'index.json'
+
+    def __init__(self, directory: str, max_bytes: int = 200 * 1024 * 1024):
+        """
+        Initialize the ResponseCache.
+
+        Args:
+            directory: Directory holding the cached bodies and the index
+            max_bytes: Upper bound on the total size of cached bodies
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.logger = logging.getLogger(__name__)
+
+        # url -> entry metadata, least recently used first
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._total_bytes = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self) -> None:
+        """Load the index, dropping entries whose body file has gone missing."""
+        index_path = os.path.join(self.directory, self.INDEX_FILENAME)
+        if not os.path.exists(index_path):
+            return
+
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f).get('entries', [])
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable cache index {index_path}: {e}")
+            return
+
+        for entry in entries:
+            if os.path.exists(self._body_path(entry['url'])):
+                self._entries[entry['url']] = entry
+                self._total_bytes += entry['size']
+
+        # max_bytes may have been lowered since the index was written
+        evicted = self._evict()
+        for url in evicted:
+            self._remove_body(url)
+        self._dirty = bool(evicted)
+
+    def _body_path(self, url: str) -> str:
+        """Path of the file holding the cached body for a URL."""
+        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest + '.body')
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        Build revalidation headers for a cached URL.
+
+        Returns:
+            If-None-Match / If-Modified-Since headers, empty if not cached
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry is None:
+            return {}
+
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Fetch a cached entry and mark it as recently used.
+
+        Returns:
+            Entry metadata with the body under 'content', or None
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None
+            self._entries.move_to_end(url)
+            self._dirty = True
+
+        try:
+            with open(self._body_path(url), 'rb') as f:
+                content = f.read()
+        except OSError:
+            self._discard(url)
+            return None
+
+        return dict(entry, content=content)
+
+    def store(self, url: str, response: requests.Response) -> None:
+        """Cache a successful response if it carries a validator."""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        if 'no-store' in response.headers.get('Cache-Control', ''):
+            return
+
+        content = response.content
+        if len(content) > self.max_bytes:
+            return
+
+        self._write_atomically(self._body_path(url), content)
+
+        with self._lock:
+            previous = self._entries.pop(url, None)
+            if previous is not None:
+                self._total_bytes -= previous['size']
+            self._entries[url] = {
+                'url': url,
+                'etag': etag,
+                'last_modified': last_modified,
+                'content_type': response.headers.get('Content-Type'),
+                'encoding': response.encoding,
+                'size': len(content)
+            }
+            self._total_bytes += len(content)
+            self._dirty = True
+            evicted = self._evict()
+
+        for evicted_url in evicted:
+            self._remove_body(evicted_url)
+
+    def _evict(self) -> list:
+        """Drop least recently used entries until under max_bytes (lock held)."""
+        evicted = []
+        while self._total_bytes > self.max_bytes and self._entries:
+            url, entry = self._entries.popitem(last=False)
+            self._total_bytes -= entry['size']
+            evicted.append(url)
+        return evicted
+
+    def _discard(self, url: str) -> None:
+        """Forget a single entry and delete its body."""
+        with self._lock:
+            entry = self._entries.pop(url, None)
+            if entry is None:
+                return
+            self._total_bytes -= entry['size']
+            self._dirty = True
+        self._remove_body(url)
+
+    def _remove_body(self, url: str) -> None:
+        """Delete the body file for a URL, ignoring files already gone."""
+        try:
+            os.remove(self._body_path(url))
+        except OSError:
+            pass
+
+    @property
+    def total_bytes(self) -> int:
+        """Total size of all cached bodies."""
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def flush(self) -> None:
+        """Write the index to disk (atomically) if it has changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = list(self._entries.values())
+            self._dirty = False
+
+        index_path = os.path.join(self.directory, self.INDEX_FILENAME)
+        self._write_atomically(index_path, json.dumps({'entries': entries}).encode('utf-8'))
+
+    def _write_atomically(self, path: str, data: bytes) -> None:
+        """
+        Write data to path through a uniquely named temporary file, so
+        threads writing the same path never share (and truncate) one
+        temporary file; the last os.replace wins.
+        """
+        temp = tempfile.NamedTemporaryFile(dir=self.directory, prefix=os.path.basename(path) + '.',
+                                           suffix='.tmp', delete=False)
+        try:
+            with temp:
+                temp.write(data)
+            os.replace(temp.name, path)
+        except BaseException:
+            try:
+                os.remove(temp.name)
+            except OSError:
+                pass
+            raise
+
+
+class CachingHTTPAdapter(HTTPAdapter):
+    """
+    Transport adapter that revalidates GET requests against a ResponseCache.
+
+    Mounted on a requests.Session it is transparent to callers: a 304 Not
+    Modified from the server is turned back into a 200 carrying the cached
+    body.
+    """
+
+    def __init__(self, cache: ResponseCache, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    def send(self, request, **kwargs):
+        if request.method != 'GET':
+            return super().send(request, **kwargs)
+
+        url = request.url
+        conditional = self.cache.conditional_headers(url)
+        for name, value in conditional.items():
+            request.headers.setdefault(name, value)
+
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and conditional:
+            entry = self.cache.get(url)
+            if entry is None:
+                # Evicted while the request was in flight: fetch it in full
+                for name in conditional:
+                    request.headers.pop(name, None)
+                response = super().send(request, **kwargs)
+                if response.status_code == 200:
+                    self.cache.store(url, response)
+            else:
+                response.status_code = 200
+                response.reason = 'OK'
+                response._content = entry['content']
+                response.encoding = entry['encoding']
+                if entry.get('content_type'):
+                    response.headers['Content-Type'] = entry['content_type']
+                response.from_cache = True
+        elif response.status_code == 200:
+            self.cache.store(url, response)
+
+        return response
+
+    def close(self):
+        self.cache.flush()
+        super().close()
@@ -0,0 +1,157 @@
+"""
+Arc Raiders Recycling Tracker - Instrumentation Module
+"""
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+
+def stats_path(output_path: str) -> str:
+    """Statistics sidecar path for a generated page path."""
+    return os.path.splitext(output_path)[0] + '.stats.json'
+
+
+class PipelineStats:
+    """
+    Thread-safe counters and timers for a scrape / generate run.
+
+    Records per-request latency (with a histogram), bytes downloaded, time
+    spent waiting on the rate limiter, named timers such as per-page parse
+    time, and free-form counters such as retries. Summing network, sleep and
+    parse time shows whether a slow run is network-, throttle- or CPU-bound.
+    """
+
+    # Upper bounds (seconds) of the request latency histogram buckets
+    LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies: List[float] = []
+        self._histogram = [0] * (len(self.LATENCY_BUCKETS) + 1)
+        self.bytes_downloaded = 0
+        self.sleep_seconds = 0.0
+        self.counters: Dict[str, int] = {}
+        self.timers: Dict[str, Dict[str, float]] = {}
+
+    def record_request(self, seconds: float, nbytes: int, status: Optional[int] = None,
+                       from_cache: bool = False) -> None:
+        """Record one HTTP request."""
+        with self._lock:
+            self._latencies.append(seconds)
+            self._histogram[bisect.bisect_left(self.LATENCY_BUCKETS, seconds)] += 1
+            self.bytes_downloaded += nbytes
+            if status is not None:
+                key = f"status_{status}"
+                self.counters[key] = self.counters.get(key, 0) + 1
+            if from_cache:
+                self.counters['cache_hits'] = self.counters.get('cache_hits', 0) + 1
+
+    def record_sleep(self, seconds: float) -> None:
+        """Record time spent waiting on the rate limiter."""
+        if seconds > 0:
+            with self._lock:
+                self.sleep_seconds += seconds
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        """Increment a named counter."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def add_time(self, name: str, seconds: float) -> None:
+        """Add one observation to a named timer."""
+        with self._lock:
+            timer = self.timers.setdefault(name, {'count': 0, 'total_seconds': 0.0, 'max_seconds': 0.0})
+            timer['count'] += 1
+            timer['total_seconds'] += seconds
+            timer['max_seconds'] = max(timer['max_seconds'], seconds)
+
+    @contextmanager
+    def timer(self, name: str):
+        """Time the enclosed block into a named timer."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def _percentile(self, sorted_values: List[float], fraction: float) -> float:
+        index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+        return sorted_values[index]
+
+    def to_dict(self) -> Dict:
+        """Summary suitable for JSON output metadata."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            histogram = list(self._histogram)
+            counters = dict(self.counters)
+            timers = {name: dict(timer) for name, timer in self.timers.items()}
+            bytes_downloaded = self.bytes_downloaded
+            sleep_seconds = self.sleep_seconds
+
+        requests = {'count': len(latencies), 'bytes': bytes_downloaded}
+        if latencies:
+            labels = [f"<={bound}s" for bound in self.LATENCY_BUCKETS] + [f">{self.LATENCY_BUCKETS[-1]}s"]
+            requests['latency_seconds'] = {
+                'total': round(sum(latencies), 4),
+                'mean': round(sum(latencies) / len(latencies), 4),
+                'p50': round(self._percentile(latencies, 0.50), 4),
+                'p95': round(self._percentile(latencies, 0.95), 4),
+                'max': round(latencies[-1], 4),
+                'histogram': dict(zip(labels, histogram))
+            }
+
+        for timer in timers.values():
+            timer['mean_seconds'] = round(timer['total_seconds'] / timer['count'], 6)
+            timer['total_seconds'] = round(timer['total_seconds'], 4)
+            timer['max_seconds'] = round(timer['max_seconds'], 6)
+
+        return {
+            'requests': requests,
+            'rate_limit_sleep_seconds': round(sleep_seconds, 4),
+            'counters': counters,
+            'timers': timers
+        }
+
+    def save(self, filepath: str) -> None:
+        """
+        Write the summary (including generator section timings, which are not
+        part of the data file's metadata) to a JSON file.
+        
+        Args:
+            filepath: Path of the JSON file to write
+        """
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def format_summary(self) -> str:
+        """Human-readable multi-line summary."""
+        data = self.to_dict()
+        requests = data['requests']
+        lines = [f"Requests: {requests['count']}, {requests['bytes'] / 1024:.1f} KB downloaded"]
+
+        latency = requests.get('latency_seconds')
+        if latency:
+            lines.append(f"  latency: mean {latency['mean'] * 1000:.0f} ms, p50 {latency['p50'] * 1000:.0f} ms, "
+                         f"p95 {latency['p95'] * 1000:.0f} ms, max {latency['max'] * 1000:.0f} ms")
+            lines.append("  histogram: " + ', '.join(f"{label} {count}"
+                                                    for label, count in latency['histogram'].items() if count))
+
+        if data['counters']:
+            lines.append("Counters: " + ', '.join(f"{name} {value}" for name, value in sorted(data['counters'].items())))
+
+        if data['timers']:
+            lines.append("Timers:")
+            for name, timer in data['timers'].items():
+                lines.append(f"  {name}: {timer['count']} x, total {timer['total_seconds']:.3f}s, "
+                             f"mean {timer['mean_seconds'] * 1000:.2f} ms, max {timer['max_seconds'] * 1000:.2f} ms")
+
+        # Summed across workers, so these can exceed wall-clock time
+        network = latency['total'] if latency else 0.0
+        parse = data['timers'].get('parse', {}).get('total_seconds', 0.0)
+        lines.append(f"Time split (summed over workers): network {network:.2f}s, "
+                     f"rate-limit sleep {data['rate_limit_sleep_seconds']:.2f}s, parsing {parse:.2f}s")
+        return '\n'.join(lines)
@@ -0,0 +1,91 @@
+"""
+Arc Raiders Recycling Tracker - Scrape Journal Module
+
+Append-only JSONL log of the items a scrape has completed, so an
+interrupted scrape can be resumed without fetching those items again.
+"""
+import json
+import logging
+import os
+import threading
+from typing import Dict
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def journal_path(data_filepath: str) -> str:
+    """Journal path kept next to a data file, e.g. recycling_data.journal.jsonl."""
+    return os.path.splitext(data_filepath)[0] + '.journal.jsonl'
+
+
+class ScrapeJournal:
+    """
+    Journal of completed items, one JSON object per line.
+
+    Each record is flushed and fsynced as it is written, so at most the line
+    being written when the process died is lost; such a truncated line is
+    skipped on resume. Safe to use from worker threads.
+    """
+
+    def __init__(self, filepath: str, resume: bool = False):
+        """
+        Open the journal.
+
+        Args:
+            filepath: Journal file path
+            resume: Keep the items already in the journal (available as
+                `completed`) and append to it. Otherwise any existing
+                journal is discarded.
+        """
+        self.filepath = filepath
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self.completed: Dict[str, Dict] = self._load() if resume else {}
+
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Rewrite the valid records so appends never follow a truncated line
+        temp_filepath = filepath + '.tmp'
+        with open(temp_filepath, 'w', encoding='utf-8') as f:
+            for item in self.completed.values():
+                f.write(json.dumps(item, ensure_ascii=False) + '\n')
+        os.replace(temp_filepath, filepath)
+        self._file = open(filepath, 'a', encoding='utf-8')
+
+    def _load(self) -> Dict[str, Dict]:
+        """Read journalled items by URL; later records win."""
+        completed = {}
+        if not os.path.exists(self.filepath):
+            return completed
+        with open(self.filepath, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    item = json.loads(line)
+                    completed[item['url']] = item
+                except (ValueError, KeyError, TypeError):
+                    self.logger.warning(f"Skipping unreadable journal line {line_number} in {self.filepath}")
+        return completed
+
+    def record(self, item: Dict) -> None:
+        """Durably append a completed item's dictionary."""
+        line = json.dumps(item, ensure_ascii=False) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.completed[item['url']] = item
+
+    def close(self) -> None:
+        """Close the journal file, keeping it for a later resume."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def discard(self) -> None:
+        """Close and delete the journal once its items have been saved."""
+        self.close()
+        if os.path.exists(self.filepath):
+            os.remove(self.filepath)
@@ -5,13 +5,27 @@ Usage:
     python main.py                    # Generate HTML from existing JSON
     python main.py --scrape           # Scrape data and generate HTML
     python main.py --scrape --output custom.html --data custom.json
+    python main.py --scrape --workers 4  # Fetch item pages concurrently
+    python main.py --scrape --incremental  # Only re-fetch edited items
+    python main.py --resume           # Finish a scrape that was interrupted
+    python main.py --scrape --data output/recycling_data.db  # Keep data in SQLite
+    python main.py --scrape --stats   # Print request, throttle, parse and generate timings
+    python main.py --scrape --profile output/run.prof --profile-stage parse
 """
 import argparse
+import json
+import sqlite3
 import sys
 import os
 import logging
 from scraper import WikiScraper
 from generator import HTMLGenerator
+from http_cache import ResponseCache
+from instrumentation import PipelineStats, stats_path
+from journal import ScrapeJournal, journal_path
+from store import SQLiteStore, is_store_path
+from profiling import PipelineProfiler, collapsed_path
+from ratelimit import TokenBucket
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -37,6 +51,20 @@ Examples:
         help='Scrape data from wiki before generating HTML'
     )
     
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Only re-fetch items whose wiki page changed since the existing data file was written '
+             '(implies --scrape)'
+    )
+    
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Continue an interrupted scrape: items recorded in the journal next to --data are not fetched again '
+             '(implies --scrape)'
+    )
+    
     parser.add_argument(
         '--output',
         default='output/recycling_tracker.html',
@@ -46,31 +74,199 @@ Examples:
     parser.add_argument(
         '--data',
         default='output/recycling_data.json',
-        help='JSON data file path (default: output/recycling_data.json)'
+        help='Data file path; a .db, .sqlite or .sqlite3 extension selects the SQLite store instead of JSON '
+             '(default: output/recycling_data.json)'
+    )
+    
+    parser.add_argument(
+        '--base-url',
+        default='https://arcraiders.wiki',
+        help='Wiki to scrape, e.g. a local stub server from wiki_fixtures.py (default: https://arcraiders.wiki)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Number of item pages to fetch concurrently when scraping (default: 1)'
+    )
+    
+    parser.add_argument(
+        '--parse-workers',
+        type=int,
+        default=0,
+        help='Number of processes parsing fetched pages while scraping; 0 parses in the fetching thread (default: 0)'
+    )
+    
+    parser.add_argument(
+        '--burst',
+        type=int,
+        default=1,
+        help='Number of requests allowed back to back before the 1 req/s limit applies (default: 1)'
+    )
+    
+    parser.add_argument(
+        '--fetch-mode',
+        choices=WikiScraper.FETCH_MODES,
+        default='html',
+        help="How item pages are fetched: 'html' downloads full wiki pages, 'api' uses the MediaWiki API "
+             "to resolve pages in batches and fetch only their content (default: html)"
+    )
+    
+    parser.add_argument(
+        '--parser',
+        choices=WikiScraper.HTML_PARSERS,
+        default='auto',
+        help="HTML parser backend; 'auto' uses lxml when installed, otherwise html.parser (default: auto)"
+    )
+    
+    parser.add_argument(
+        '--cache-dir',
+        help='Directory for an on-disk HTTP cache; unchanged pages are revalidated instead of re-downloaded'
+    )
+    
+    parser.add_argument(
+        '--cache-size',
+        type=int,
+        default=200,
+        help='Maximum size of the HTTP cache in MB (default: 200)'
+    )
+    
+    parser.add_argument(
+        '--payload',
+        choices=HTMLGenerator.PAYLOAD_MODES,
+        default='rows',
+        help="How item data is embedded in the HTML page: 'rows' as ready-made table cells, 'compact' as "
+             "dictionary-encoded string tables and integer arrays decoded in the page, several times smaller "
+             "for large datasets (default: rows)"
+    )
+    
+    parser.add_argument(
+        '--shard-size',
+        type=int,
+        default=0,
+        help='Write item data as shard files of this many rows next to the HTML page, loaded as the table '
+             'needs them, instead of embedding it; 0 embeds everything (default: 0)'
+    )
+    
+    parser.add_argument(
+        '--prerender-rows',
+        type=int,
+        default=50,
+        help='Rows of the initial name-sorted view written into the HTML page as static markup, shown before '
+             'any script runs (default: 50)'
+    )
+    
+    parser.add_argument(
+        '--stats',
+        action='store_true',
+        help='Print request latency, bytes downloaded, rate-limit sleep, parse and per-section generate timings, '
+             'and save them next to the HTML page (OUTPUT with a .stats.json extension)'
+    )
+    
+    parser.add_argument(
+        '--profile',
+        metavar='PATH',
+        help='Profile the run: write cProfile stats to PATH and collapsed stacks for flamegraph tools '
+             'next to it (PATH with a .collapsed extension)'
+    )
+    
+    parser.add_argument(
+        '--profile-stage',
+        choices=PipelineProfiler.STAGES,
+        default='all',
+        help='With --profile: only profile this stage of the pipeline (default: all)'
     )
     
     return parser.parse_args()
 
 
+def load_previous_data(filepath):
+    """
+    Load an earlier scrape to base an incremental scrape on.
+    
+    Returns:
+        The previous data, or None if there is no usable data file
+    """
+    if not os.path.exists(filepath):
+        logger.warning(f"No existing data file at {filepath}; running a full scrape")
+        return None
+    try:
+        if is_store_path(filepath):
+            with SQLiteStore(filepath) as store:
+                return store.load()
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        logger.warning(f"Could not read {filepath} ({e}); running a full scrape")
+        return None
+
+
 def main():
     """Main execution function."""
     args = parse_arguments()
+    if args.resume or args.incremental:
+        args.scrape = True
     
     logger.info("Arc Raiders Recycling Tracker")
     logger.info("=" * 50)
     
+    stats = PipelineStats()
+    profiler = None
+    if args.profile:
+        profiler = PipelineProfiler(args.profile, stage=args.profile_stage)
+        if args.profile_stage == 'parse' and args.parse_workers > 0:
+            logger.warning("Parsing runs in --parse-workers processes, which are not profiled; "
+                           "use --parse-workers 0 to profile the parse stage")
+        logger.info(f"Profiling stage '{args.profile_stage}' to {args.profile} and {collapsed_path(args.profile)}")
+        profiler.start()
+    
     try:
         # Step 1: Scrape data if requested
         if args.scrape:
             logger.info("Scraping data from Arc Raiders wiki...")
-            scraper = WikiScraper()
-            # Use the Loot-specific scraper which extracts Recycling and Salvaging
-            data = scraper.scrape_loot()
-            scraper.save_to_json(data, args.data)
-            # Also write a Python module for convenience
-            py_path = args.data if args.data.endswith('.py') else args.data.replace('.json', '.py')
-            scraper.save_to_python_module(data, py_path)
-            logger.info(f"Data saved to {args.data} and python module {py_path}")
+            cache = None
+            if args.cache_dir:
+                cache = ResponseCache(args.cache_dir, max_bytes=args.cache_size * 1024 * 1024)
+            scraper = WikiScraper(
+                base_url=args.base_url,
+                max_workers=args.workers,
+                rate_limiter=TokenBucket(rate=1.0, burst=args.burst),
+                cache=cache,
+                fetch_mode=args.fetch_mode,
+                parser=args.parser,
+                parse_workers=args.parse_workers,
+                stats=stats
+            )
+            if profiler:
+                profiler.instrument('scrape', scraper, 'scrape_loot')
+                profiler.instrument('parse', scraper, '_parse_loot_item')
+                profiler.instrument('save', scraper, 'save_to_json', 'save_to_python_module', 'save_to_sqlite')
+            previous = None
+            if args.incremental:
+                previous = load_previous_data(args.data)
+            # Completed items are journalled so an interrupted scrape can resume
+            journal = ScrapeJournal(journal_path(args.data), resume=args.resume)
+            if args.resume:
+                logger.info(f"Resuming from {journal.filepath} with {len(journal.completed)} completed items")
+            try:
+                # Use the Loot-specific scraper which extracts Recycling and Salvaging
+                data = scraper.scrape_loot(previous=previous, journal=journal)
+            finally:
+                journal.close()
+            if is_store_path(args.data):
+                with stats.timer('save_sqlite'):
+                    scraper.save_to_sqlite(data, args.data, incremental=args.incremental)
+                logger.info(f"Data saved to SQLite store {args.data}")
+            else:
+                with stats.timer('save_json'):
+                    scraper.save_to_json(data, args.data)
+                # Also write a Python module for convenience
+                py_path = args.data if args.data.endswith('.py') else args.data.replace('.json', '.py')
+                with stats.timer('save_module'):
+                    scraper.save_to_python_module(data, py_path)
+                logger.info(f"Data saved to {args.data} and python module {py_path}")
+            journal.discard()
         else:
             # Check if JSON file exists
             if not os.path.exists(args.data):
@@ -82,20 +278,33 @@ def main():
         
         # Step 2: Generate HTML
         logger.info("Generating HTML page...")
-        generator = HTMLGenerator(args.data)
+        generator = HTMLGenerator(args.data, stats=stats, payload=args.payload,
+                                  shard_size=args.shard_size, prerender_rows=args.prerender_rows)
+        if profiler:
+            profiler.instrument('generate', generator, 'load_data', 'generate_html')
         generator.load_data()
         generator.generate_html(args.output)
         logger.info(f"HTML page generated: {args.output}")
         
+        if args.stats:
+            print(stats.format_summary())
+            stats.save(stats_path(args.output))
+            logger.info(f"Run statistics saved to {stats_path(args.output)}")
+        
         logger.info("=" * 50)
         logger.info("Success! Open the HTML file in your browser to view the tracker.")
         
     except KeyboardInterrupt:
         logger.info("\\nOperation cancelled by user")
+        if args.scrape:
+            logger.info("Run with --resume to continue the scrape where it stopped")
         sys.exit(1)
     except Exception as e:
         logger.error(f"Error: {e}")
         sys.exit(1)
+    finally:
+        if profiler:
+            profiler.stop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,90 @@
+"""
+Arc Raiders Recycling Tracker - Material Text Parser Module
+"""
+import re
+from typing import List, Optional, Tuple
+
+# All supported forms as one precompiled pattern, in priority order:
+#   "Material: 5", "Material (5)", "Material x5", "5x Material", "Material - 5"
+#
+# The scraper used to re.search() each form in turn and take the first one
+# that matched anywhere in the text. Prefixing every alternative with a lazy
+# [\s\S]*? and anchoring the whole pattern with match() reproduces that
+# exactly: an alternative is tried at every start position before the engine
+# moves on to the next alternative, and the lazy prefix picks the leftmost
+# start just like search() does. The lookahead in front of each alternative
+# checks for its separator character first, so alternatives that cannot
+# match are rejected in one linear scan instead of a quadratic one.
+_MATERIAL_PATTERN = re.compile(
+    r'(?=[\s\S]*:)[\s\S]*?(?P<colon_name>.+?):\s*(?P<colon_qty>\d+)'
+    r'|(?=[\s\S]*\()[\s\S]*?(?P<paren_name>.+?)\s*\((?P<paren_qty>\d+)\)'
+    r'|(?=[\s\S]*x)[\s\S]*?(?P<suffix_name>.+?)\s*x\s*(?P<suffix_qty>\d+)'
+    r'|(?=[\s\S]*x)[\s\S]*?(?P<prefix_qty>\d+)\s*x\s*(?P<prefix_name>.+)'
+    r'|(?=[\s\S]*-)[\s\S]*?(?P<dash_name>.+?)\s*-\s*(?P<dash_qty>\d+)',
+    re.IGNORECASE
+)
+
+# Group names holding (material name, quantity) for each alternative
+_FORMS = [
+    ('colon_name', 'colon_qty'),
+    ('paren_name', 'paren_qty'),
+    ('suffix_name', 'suffix_qty'),
+    ('prefix_name', 'prefix_qty'),
+    ('dash_name', 'dash_qty'),
+]
+
+# Every form needs a digit, so text without one can be rejected up front
+_DIGIT = re.compile(r'\d')
+_DIGIT_RUN = re.compile(r'\d+')
+
+# Delimiters between materials inside a single table cell
+_CELL_SEPARATORS = re.compile(r'[,;/\n]+')
+
+
+def parse_material_text(text: str) -> Tuple[Optional[str], Optional[int]]:
+    """
+    Parse material name and quantity from text.
+
+    Returns:
+        Tuple of (material_name, quantity) or (None, None)
+    """
+    if not _DIGIT.search(text):
+        return None, None
+
+    match = _MATERIAL_PATTERN.match(text)
+    if match is None:
+        return None, None
+
+    for name_group, quantity_group in _FORMS:
+        quantity = match.group(quantity_group)
+        if quantity is not None:
+            return match.group(name_group).strip(), int(quantity)
+    return None, None
+
+
+def parse_material_cell(cell_text: str) -> List[Tuple[str, int]]:
+    """
+    Parse every material in a table cell such as "Metal Parts ×2, Rubber x1".
+
+    The cell is split on commas, semicolons, slashes and newlines, and the
+    multiplication sign is normalized to "x" before each part is parsed.
+
+    Returns:
+        List of (material_name, quantity) tuples; unparseable parts are skipped
+    """
+    materials = []
+    for part in _CELL_SEPARATORS.split(cell_text):
+        part = part.strip()
+        if not part:
+            continue
+        name, quantity = parse_material_text(part.replace('×', 'x'))
+        if name and quantity is not None:
+            materials.append((name, quantity))
+    return materials
+
+
+def parse_quantity(text: str) -> Optional[int]:
+    """Extract the first number in text as a quantity."""
+    match = _DIGIT_RUN.search(text)
+    return int(match.group(0)) if match else None
+
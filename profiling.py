@@ -0,0 +1,202 @@
+"""
+Arc Raiders Recycling Tracker - Profiling Module
+
+Runs the pipeline, or one stage of it, under cProfile and a sampling
+profiler. Two files are written:
+
+    <path>            pstats data (python -m pstats, snakeviz, ...)
+    <base>.collapsed  collapsed stacks, one "frame;frame;frame count" line per
+                      unique stack (flamegraph.pl, speedscope, inferno, ...)
+
+Only one cProfile profiler can be active at a time (Python 3.12+ enforces
+this), so when several threads run a profiled stage at once cProfile records
+the first one in and the others are covered by the sampler, which reads
+every thread's stack. If cProfile cannot be enabled at all, e.g. under
+another profiler, only the stack samples are written; profiling never makes
+a profiled call fail.
+"""
+import cProfile
+import logging
+import os
+import pstats
+import sys
+import threading
+from collections import Counter
+from functools import wraps
+from typing import Callable, Dict, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def collapse_stack(frame) -> str:
+    """
+    Format a frame's stack root-first as 'file:function;file:function'.
+    The profiler's own wrapper frames are left out.
+    """
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        if code.co_filename != __file__:
+            names.append(f"{os.path.basename(code.co_filename)}:{getattr(code, 'co_qualname', code.co_name)}")
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+def collapsed_path(path: str) -> str:
+    """Collapsed-stack output path for a pstats output path."""
+    return os.path.splitext(path)[0] + '.collapsed'
+
+
+class PipelineProfiler:
+    """
+    cProfile plus a stack sampler, for the whole run or a single stage.
+
+    In 'all' mode start() profiles the calling thread until stop() and the
+    sampler records every thread. For a single stage, instrument() wraps
+    that stage's methods; only calls to them are sampled, on whichever
+    thread makes them, and cProfile records them one thread at a time.
+    """
+
+    STAGES = ('all', 'scrape', 'parse', 'save', 'generate')
+
+    def __init__(self, path: str, stage: str = 'all', interval: float = 0.005):
+        """
+        Initialize the PipelineProfiler.
+
+        Args:
+            path: pstats output path; collapsed stacks go next to it
+            stage: One of STAGES
+            interval: Seconds between stack samples (default: 0.005)
+        """
+        if stage not in self.STAGES:
+            raise ValueError(f"Unknown profile stage {stage!r}; expected one of {self.STAGES}")
+        self.path = path
+        self.stage = stage
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._profile = cProfile.Profile()
+        # Thread cProfile is currently recording, if any
+        self._owner: Optional[int] = None
+        self._profiled = False
+        self._profile_failed = False
+        self._active: Dict[int, int] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self.logger = logging.getLogger(__name__)
+
+    def instrument(self, stage: str, obj, *method_names: str) -> None:
+        """
+        Profile calls to obj's methods if `stage` is the selected stage.
+
+        The wrapper is set as an instance attribute, so calls through self
+        inside the object are profiled too.
+        """
+        if stage != self.stage:
+            return
+        for name in method_names:
+            setattr(obj, name, self.wrap(getattr(obj, name)))
+
+    def wrap(self, func: Callable) -> Callable:
+        """Return func profiled on every call; nested calls count once."""
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            self._enter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._exit()
+        return wrapper
+
+    def _enter(self) -> None:
+        local = self._local
+        depth = getattr(local, 'depth', 0)
+        local.depth = depth + 1
+        if depth:
+            return
+        ident = threading.get_ident()
+        with self._lock:
+            self._active[ident] = 1
+            if self._owner is not None or self._profile_failed:
+                return
+            self._owner = ident
+        try:
+            self._profile.enable()
+            self._profiled = True
+        except (ValueError, RuntimeError) as e:
+            with self._lock:
+                self._owner = None
+                self._profile_failed = True
+            self.logger.warning(f"cProfile unavailable ({e}); only stack samples will be written")
+
+    def _exit(self) -> None:
+        local = self._local
+        local.depth -= 1
+        if local.depth:
+            return
+        ident = threading.get_ident()
+        with self._lock:
+            self._active.pop(ident, None)
+            owner = self._owner == ident
+        if owner:
+            try:
+                self._profile.disable()
+            finally:
+                with self._lock:
+                    self._owner = None
+
+    def _sample(self) -> None:
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                active = None if self.stage == 'all' else set(self._active)
+            for ident, frame in frames.items():
+                if ident == own_ident or (active is not None and ident not in active):
+                    continue
+                self.samples[collapse_stack(frame)] += 1
+
+    def start(self) -> 'PipelineProfiler':
+        """Start sampling, and in 'all' mode profiling of the calling thread."""
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._sample, name='profile-sampler', daemon=True)
+        self._sampler.start()
+        if self.stage == 'all':
+            self._enter()
+        return self
+
+    def stop(self) -> None:
+        """Stop profiling and write the pstats and collapsed-stack files."""
+        if self.stage == 'all':
+            self._exit()
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        self.write()
+
+    def write(self) -> None:
+        """Write the pstats and collapsed-stack files."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if self._profiled:
+            pstats.Stats(self._profile).dump_stats(self.path)
+            self.logger.info(f"Wrote {self.stage} profile to {self.path}")
+        elif self._profile_failed:
+            self.logger.warning("cProfile could not be enabled; no pstats profile written")
+        else:
+            self.logger.warning(f"Stage '{self.stage}' did not run; no pstats profile written")
+
+        with open(collapsed_path(self.path), 'w', encoding='utf-8') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+        self.logger.info(f"Wrote {sum(self.samples.values())} stack samples to {collapsed_path(self.path)}")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
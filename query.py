@@ -0,0 +1,200 @@
+"""
+Arc Raiders Recycling Tracker - Query Module
+
+Loads a dataset once and indexes it by material, item name and category, so
+lookups such as "which items recycle into Electronics?" are a dictionary
+access instead of a scan of every item's materials.
+"""
+import argparse
+import json
+import logging
+import os
+from operator import itemgetter
+from typing import Dict, List, Optional
+
+from data_schema import upgrade_data
+from store import SQLiteStore, is_store_path
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+KINDS = ('recycling', 'salvaging')
+
+
+def load_dataset(filepath: str) -> Dict:
+    """
+    Load a JSON data file (schema v1 or v2) or SQLite store.
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+    """
+    if not os.path.exists(filepath):
+        raise FileNotFoundError(f"Data file not found: {filepath}")
+    if is_store_path(filepath):
+        with SQLiteStore(filepath) as store:
+            return store.load()
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class RecyclingQuery:
+    """
+    In-memory indexes over a recycling dataset.
+
+    Built once per dataset: material -> sources (items yielding it, with
+    quantity and kind, highest quantity first), item name -> item and
+    category -> items. Material and item names are matched
+    case-insensitively. Returned lists are copies; the item dictionaries
+    are shared with the dataset.
+    """
+
+    def __init__(self, data: Dict):
+        """
+        Index a dataset.
+
+        Args:
+            data: Dictionary in the JSON data file shape; schema v1 items
+                are upgraded
+        """
+        self.logger = logging.getLogger(__name__)
+        self.data = upgrade_data(data)
+        self._items: Dict[str, Dict] = {}
+        self._categories: Dict[str, List[Dict]] = {}
+        # Per material key: 'all' plus one list per kind
+        self._sources: Dict[str, Dict[str, List[Dict]]] = {}
+        self._material_names: Dict[str, str] = {}
+
+        for category, items in self.data['categories'].items():
+            self._categories[category] = list(items)
+            for item in items:
+                self._items.setdefault(item['name'].casefold(), item)
+                for kind in KINDS:
+                    for material in item[kind]:
+                        key = material['name'].casefold()
+                        self._material_names.setdefault(key, material['name'])
+                        sources = self._sources.setdefault(key, {'all': [], 'recycling': [], 'salvaging': []})
+                        source = {'name': item['name'], 'url': item['url'], 'category': category,
+                                  'kind': kind, 'quantity': material['quantity'] or 0}
+                        sources['all'].append(source)
+                        sources[kind].append(source)
+
+        # Sorted once here so queries never sort: by name, then stably by
+        # quantity descending
+        for sources in self._sources.values():
+            for entries in sources.values():
+                entries.sort(key=itemgetter('name'))
+                entries.sort(key=itemgetter('quantity'), reverse=True)
+
+        self.logger.info(f"Indexed {len(self._items)} items, {len(self._sources)} materials "
+                         f"and {len(self._categories)} categories")
+
+    @classmethod
+    def from_file(cls, filepath: str) -> 'RecyclingQuery':
+        """Load and index a JSON data file or SQLite store (.db / .sqlite / .sqlite3)."""
+        return cls(load_dataset(filepath))
+
+    def _entries(self, material: str, kind: Optional[str]) -> List[Dict]:
+        if kind is not None and kind not in KINDS:
+            raise ValueError(f"Unknown kind {kind!r}; expected one of {KINDS}")
+        sources = self._sources.get(material.casefold())
+        if sources is None:
+            return []
+        return sources[kind or 'all']
+
+    def items_yielding(self, material: str, kind: Optional[str] = None) -> List[Dict]:
+        """
+        Items yielding a material.
+
+        Args:
+            material: Material name
+            kind: 'recycling' or 'salvaging' to restrict to one source
+
+        Returns:
+            List of {'name', 'url', 'category', 'kind', 'quantity'}
+            dictionaries, highest quantity first, then by name; an item
+            yielding the material both ways appears once per kind, and an
+            unknown quantity is given as 0
+        """
+        return list(self._entries(material, kind))
+
+    def top_sources(self, material: str, n: int = 5, kind: Optional[str] = None) -> List[Dict]:
+        """
+        The n entries of items_yielding(material, kind) with the highest quantity.
+
+        Raises:
+            ValueError: If n is negative
+        """
+        if n < 0:
+            raise ValueError(f"n must not be negative, got {n}")
+        return self._entries(material, kind)[:n]
+
+    def total_yield(self, material: str, kind: Optional[str] = None) -> int:
+        """Quantity of a material summed over every item yielding it."""
+        return sum(source['quantity'] for source in self._entries(material, kind))
+
+    def item(self, name: str) -> Optional[Dict]:
+        """Item dictionary by name, or None; the first item wins if names repeat."""
+        return self._items.get(name.casefold())
+
+    def items_in_category(self, category: str) -> List[Dict]:
+        """Items of a category, in data file order."""
+        return list(self._categories.get(category, []))
+
+    def categories(self) -> List[str]:
+        """Category names, in data file order."""
+        return list(self._categories)
+
+    def materials(self) -> List[str]:
+        """Every material name, sorted case-insensitively."""
+        return sorted(self._material_names.values(), key=str.casefold)
+
+
+def non_negative_int(value: str) -> int:
+    """argparse type accepting integers >= 0."""
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must not be negative: {value}")
+    return number
+
+
+def parse_arguments():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description='Look up which items yield a material')
+    parser.add_argument('material', nargs='?', help='Material name; omit to list every material')
+    parser.add_argument('--data', default='output/recycling_data.json',
+                        help='JSON data file or SQLite store path (default: output/recycling_data.json)')
+    parser.add_argument('--kind', choices=KINDS, help='Only recycling or only salvaging results (default: both)')
+    parser.add_argument('--top', type=non_negative_int, help='Show only the N highest-quantity sources (default: all)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    logging.getLogger().setLevel(logging.WARNING)
+    query = RecyclingQuery.from_file(args.data)
+
+    if args.material is None:
+        results = query.materials()
+        if args.json:
+            print(json.dumps(results, indent=2, ensure_ascii=False))
+        else:
+            print('\n'.join(results))
+        return
+
+    if args.top is not None:
+        results = query.top_sources(args.material, args.top, kind=args.kind)
+    else:
+        results = query.items_yielding(args.material, kind=args.kind)
+
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+    elif not results:
+        print(f"No items yield {args.material}")
+    else:
+        for source in results:
+            print(f"{source['quantity']:>4} x  {source['name']} ({source['category']}, {source['kind']})")
+
+
+if __name__ == "__main__":
+    main()
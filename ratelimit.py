@@ -0,0 +1,156 @@
+"""
+Arc Raiders Recycling Tracker - Rate Limiting Module
+"""
+import asyncio
+import email.utils
+import threading
+import time
+from typing import Optional, Tuple
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second up to `burst`. Each request
+    takes one token; when the bucket is empty the caller waits for its turn.
+    Waiting happens outside the lock, so one bucket can be shared by many
+    threads, asyncio tasks and WikiScraper instances talking to the same host.
+    """
+
+    def __init__(self, rate: Optional[float] = 1.0, burst: int = 1):
+        """
+        Initialize the TokenBucket.
+
+        Args:
+            rate: Sustained requests per second, or None for no limit
+            burst: Maximum number of requests that may be sent back to back
+        """
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be positive or None")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        # Time the token count was last brought up to date. It is moved into
+        # the future by defer() so no tokens accrue while the server is
+        # asking us to back off.
+        self._updated = time.monotonic()
+        # Total seconds defer() has pushed the schedule back; a waiter
+        # compares it before and after sleeping to learn it was deferred
+        self._deferred = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> Tuple[float, float]:
+        """
+        Take one token.
+
+        Returns:
+            Tuple of (seconds the caller must wait, current defer mark)
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now > self._updated:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+            # Tokens may go negative: each waiter reserves its own slot
+            self._tokens -= 1
+            deficit = max(0.0, -self._tokens)
+            return (self._updated - now) + deficit / self.rate, self._deferred
+
+    def _pushed_back(self, mark: float) -> Tuple[float, float]:
+        """
+        How much further a waiter must sleep because of defer() calls made
+        since it took its mark.
+
+        Returns:
+            Tuple of (extra seconds to wait, new defer mark)
+        """
+        with self._lock:
+            return self._deferred - mark, self._deferred
+
+    def acquire(self) -> float:
+        """
+        Block the calling thread until a request may be sent.
+
+        Returns:
+            Seconds spent waiting
+        """
+        if self.rate is None:
+            return 0.0
+        wait, mark = self._reserve()
+        waited = 0.0
+        while wait > 0:
+            time.sleep(wait)
+            waited += wait
+            wait, mark = self._pushed_back(mark)
+        return waited
+
+    async def acquire_async(self) -> float:
+        """
+        Asyncio counterpart of acquire().
+
+        Returns:
+            Seconds spent waiting
+        """
+        if self.rate is None:
+            return 0.0
+        wait, mark = self._reserve()
+        waited = 0.0
+        while wait > 0:
+            await asyncio.sleep(wait)
+            waited += wait
+            wait, mark = self._pushed_back(mark)
+        return waited
+
+    def defer(self, seconds: float) -> None:
+        """
+        Pause the bucket, e.g. when the server sends a Retry-After header.
+
+        Requests already waiting are pushed back by the same amount: they
+        re-check after sleeping and keep waiting until their slot, which
+        keeps them spaced at the refill rate. The bucket restarts empty so
+        the pause is not followed by a burst.
+
+        Args:
+            seconds: How long no request may be sent
+        """
+        if self.rate is None or seconds <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if now > self._updated:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._tokens = min(self._tokens, 0.0)
+            start = max(self._updated, now)
+            self._updated = max(self._updated, now + seconds)
+            self._deferred += self._updated - start
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header value.
+
+    Args:
+        value: Header value, either delay-seconds or an HTTP-date
+
+    Returns:
+        Delay in seconds, or None if the header is missing or malformed
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
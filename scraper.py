@@ -1,19 +1,49 @@
 """
 Arc Raiders Recycling Tracker - Web Scraper Module
 """
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Set, Callable, Any
+from dataclasses import dataclass, asdict, field
+from typing import List, Dict, Set, Callable, Any, Optional, Tuple
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import logging
 import json
+import multiprocessing
 import os
-from bs4 import BeautifulSoup
-from functools import wraps
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+import re
+from bs4 import BeautifulSoup, SoupStrainer
+from functools import partial, wraps
+from urllib.parse import unquote, urlsplit
+from data_schema import SCHEMA_VERSION, upgrade_item
+from http_cache import CachingHTTPAdapter, ResponseCache
+from instrumentation import PipelineStats
+from journal import ScrapeJournal
+from material_text import parse_material_cell, parse_material_text, parse_quantity
+from ratelimit import TokenBucket, parse_retry_after
+from store import SQLiteStore
+
+try:
+    import lxml  # noqa: F401 - only needed as a BeautifulSoup tree builder
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Restricts parsing to MediaWiki's content container. The class attribute is
+# matched as a raw string while parsing, and current MediaWiki versions emit
+# e.g. class="mw-content-ltr mw-parser-output", hence the regex.
+CONTENT_STRAINER = SoupStrainer('div', class_=re.compile(r'(?:^|\s)mw-parser-output(?:\s|$)'))
+
+# Parse worker processes must not be forked from the scraper: fetch threads
+# may hold locks (logging, the HTTP connection pool) at fork time, which
+# would stay locked in the child. 'forkserver' forks from a clean server
+# process; 'spawn' is the fallback where it is unavailable (Windows).
+PARSE_WORKER_START_METHOD = ('forkserver' if 'forkserver' in multiprocessing.get_all_start_methods()
+                             else 'spawn')
+
 
 def retry_with_backoff(max_retries: int = 3, backoff_delays: List[float] = [1.0, 2.0, 4.0]):
     """
@@ -34,6 +64,9 @@ def retry_with_backoff(max_retries: int = 3, backoff_delays: List[float] = [1.0,
                 except Exception as e:
                     if attempt < max_retries:
                         delay = backoff_delays[attempt] if attempt < len(backoff_delays) else backoff_delays[-1]
+                        stats = getattr(args[0], 'stats', None) if args else None
+                        if stats is not None:
+                            stats.incr('retries')
                         logger.warning(f"Attempt {attempt + 1} failed: {e}. Retrying in {delay}s...")
                         time.sleep(delay)
                     else:
@@ -53,20 +86,56 @@ class Material:
 
 @dataclass
 class Item:
-    """Represents a game item that can be recycled."""
+    """Represents a game item that can be recycled and/or salvaged."""
     name: str
     category: str
     url: str
-    materials: List[Material]
+    recycling: List[Material]
+    salvaging: List[Material] = field(default_factory=list)
+    page_id: Optional[int] = None
+    revision_id: Optional[int] = None
+    
+    @property
+    def recycling_total(self) -> int:
+        """Total quantity of materials from recycling."""
+        return sum(m.quantity for m in self.recycling)
+    
+    @property
+    def salvaging_total(self) -> int:
+        """Total quantity of materials from salvaging."""
+        return sum(m.quantity for m in self.salvaging)
     
     def to_dict(self):
-        """Convert Item to dictionary for JSON serialization."""
-        return {
+        """Convert Item to a schema v2 dictionary for JSON serialization."""
+        data = {
             'name': self.name,
             'category': self.category,
             'url': self.url,
-            'materials': [asdict(m) for m in self.materials]
+            'recycling': [asdict(m) for m in self.recycling],
+            'salvaging': [asdict(m) for m in self.salvaging],
+            'recycling_total': self.recycling_total,
+            'salvaging_total': self.salvaging_total
         }
+        # Wiki IDs are only known when the MediaWiki API could be reached
+        if self.page_id is not None:
+            data['page_id'] = self.page_id
+        if self.revision_id is not None:
+            data['revision_id'] = self.revision_id
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Item':
+        """Rebuild an Item from its to_dict() representation (schema v1 or v2)."""
+        data = upgrade_item(data)
+        return cls(
+            name=data['name'],
+            category=data.get('category', ''),
+            url=data['url'],
+            recycling=[Material(name=m['name'], quantity=m['quantity']) for m in data['recycling']],
+            salvaging=[Material(name=m['name'], quantity=m['quantity']) for m in data['salvaging']],
+            page_id=data.get('page_id'),
+            revision_id=data.get('revision_id')
+        )
 
 
 class WikiScraper:
@@ -82,9 +151,27 @@ class WikiScraper:
         'Traps': 'https://arcraiders.wiki/wiki/Traps'
     }
     
+    FETCH_MODES = ('html', 'api')
+    
+    # 'auto' picks lxml when it is installed and falls back to html.parser
+    HTML_PARSERS = ('auto', 'lxml', 'html.parser')
+    
+    # Heading levels that start a new section on item pages
+    SECTION_HEADINGS = ('h2', 'h3', 'h4')
+    
+    # Maximum number of titles per action=query request for normal clients
+    API_BATCH_SIZE = 50
+    
     def __init__(self, base_url: str = "https://arcraiders.wiki", 
                  api_endpoint: str = "/api.php",
-                 rate_limit: float = 1.0):
+                 rate_limit: float = 1.0,
+                 max_workers: int = 1,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 cache: Optional[ResponseCache] = None,
+                 fetch_mode: str = 'html',
+                 parser: str = 'auto',
+                 parse_workers: int = 0,
+                 stats: Optional[PipelineStats] = None):
         """
         Initialize the WikiScraper.
         
@@ -92,14 +179,56 @@ class WikiScraper:
             base_url: Base URL of the wiki
             api_endpoint: Path to the MediaWiki API endpoint
             rate_limit: Minimum seconds between requests (default: 1.0)
+            max_workers: Number of item pages fetched concurrently by
+                scrape_loot (default: 1, i.e. sequential)
+            rate_limiter: Shared TokenBucket to draw requests from. Pass the
+                same instance to several scrapers to give them one per-host
+                budget. Defaults to a bucket allowing one request every
+                `rate_limit` seconds.
+            cache: Optional on-disk response cache. When given, pages are
+                revalidated with If-None-Match / If-Modified-Since and
+                unchanged bodies are served from disk.
+            fetch_mode: 'html' to download full wiki pages, or 'api' to
+                resolve pages in batches through the MediaWiki API and fetch
+                only their content HTML
+            parser: BeautifulSoup tree builder, one of HTML_PARSERS
+            parse_workers: Number of processes parsing fetched item pages
+                in scrape_loot (default: 0, parse in the fetching thread)
+            stats: PipelineStats collecting request, rate limiter and parse
+                timings (default: a new instance, available as self.stats)
         """
+        if fetch_mode not in self.FETCH_MODES:
+            raise ValueError(f"Unknown fetch mode {fetch_mode!r}; expected one of {self.FETCH_MODES}")
+        if parser not in self.HTML_PARSERS:
+            raise ValueError(f"Unknown HTML parser {parser!r}; expected one of {self.HTML_PARSERS}")
+        if parser == 'lxml' and not HAS_LXML:
+            raise ValueError("HTML parser 'lxml' requested but lxml is not installed")
+
         self.base_url = base_url
         self.api_url = base_url + api_endpoint
         self.rate_limit = rate_limit
-        self.last_request_time = 0
+        self.max_workers = max(1, max_workers)
+        self.fetch_mode = fetch_mode
+        if parser == 'auto':
+            parser = 'lxml' if HAS_LXML else 'html.parser'
+        self.parser = parser
+        self.parse_workers = max(0, parse_workers)
+        if rate_limiter is None:
+            rate_limiter = TokenBucket(rate=1.0 / rate_limit if rate_limit > 0 else None)
+        self.rate_limiter = rate_limiter
+        self.stats = stats if stats is not None else PipelineStats()
         
-        # Set up requests session with connection pooling
+        # Set up requests session with connection pooling. The pool must be
+        # at least as large as the worker count or connections get discarded.
+        self.cache = cache
         self.session = requests.Session()
+        pool_maxsize = max(10, self.max_workers)
+        if cache is not None:
+            adapter = CachingHTTPAdapter(cache, pool_maxsize=pool_maxsize)
+        else:
+            adapter = HTTPAdapter(pool_maxsize=pool_maxsize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         self.session.headers.update({
             'User-Agent': 'ArcRaidersRecyclingTracker/1.0'
         })
@@ -109,12 +238,26 @@ class WikiScraper:
         # Track failures for reporting
         self.failed_categories = []
         self.failed_items = []
+        
+        # Journal of completed items for the scrape_loot run in progress
+        self.journal = None
 
-    def scrape_loot(self, loot_url: str = None) -> Dict:
+    def scrape_loot(self, loot_url: str = None, previous: Optional[Dict] = None,
+                    journal: Optional[ScrapeJournal] = None) -> Dict:
         """
         Scrape the Loot page to extract all loot item links and their
         recycling and salvaging results.
 
+        When `previous` data is given the scrape is incremental: items whose
+        wiki revision ID is unchanged are copied from it instead of being
+        fetched and parsed again. Items no longer linked from the Loot page
+        are dropped.
+
+        With a `journal`, every item is recorded in it as soon as it has been
+        scraped, and items it already holds from an interrupted run are
+        reused rather than fetched again (unless their page has since been
+        edited).
+
         Returns a dictionary in the same overall shape as scrape_all_categories
         so it can be saved to JSON and used by the HTML generator.
         """
@@ -125,77 +268,64 @@ class WikiScraper:
         start_time = time.time()
 
         all_items = []
+        self.journal = journal
         try:
-            self._rate_limit_wait()
-            resp = self.session.get(loot_url, timeout=30)
-            resp.raise_for_status()
-
-            soup = BeautifulSoup(resp.content, 'html.parser')
-            content_div = soup.find('div', class_='mw-parser-output') or soup
-
-            # Find the first table on the Loot page (items are often listed in a table)
-            table = content_div.find('table')
-            link_candidates = []
-
-            if table:
-                self.logger.info('Found a table on Loot page; extracting rows')
-                rows = table.find_all('tr')
-                # Skip header row(s)
-                for row in rows[1:]:
-                    cols = row.find_all('td')
-                    if not cols:
-                        continue
+            if self.fetch_mode == 'api':
+                loot_html = self._fetch_page_html_api(self._title_from_url(loot_url))
+            else:
+                loot_html = self._get(loot_url).content
+            item_infos = self._extract_loot_links(loot_html)
 
-                    # Try to find a link to the item in the first column
-                    link = cols[0].find('a', href=True)
-                    if not link:
-                        continue
+            # Revisions are needed to fetch content in api mode and to spot
+            # edited pages when reusing previous or journalled items; a plain
+            # html scrape (or the resume of one, whose journal holds no
+            # revision IDs) skips the lookup and records no revision IDs
+            journal_revisions = journal is not None and any(
+                entry.get('revision_id') is not None for entry in journal.completed.values())
+            if self.fetch_mode == 'api' or previous or journal_revisions:
+                try:
+                    self._resolve_item_revisions(item_infos)
+                except Exception as e:
+                    if self.fetch_mode == 'api':
+                        raise
+                    self.logger.warning(f"Could not look up page revisions; they will not be recorded: {e}")
 
-                    href = link['href']
-                    if not href.startswith('/wiki/'):
-                        continue
+            # Reuse items whose page has not been edited since the last run
+            results = [None] * len(item_infos)
+            unchanged = self._unchanged_items(item_infos, previous) if previous else {}
+            for index, item in unchanged.items():
+                results[index] = item
+            pending = [index for index in range(len(item_infos)) if index not in unchanged]
+            if previous:
+                self.logger.info(f"Incremental scrape: {len(unchanged)} unchanged, {len(pending)} new or edited")
 
-                    link_candidates.append(link)
-            else:
-                # Fallback: scan the content area for wiki links that look like items
-                self.logger.warning('No table found on Loot page — falling back to scanning for links')
-                seen = set()
-                for link in content_div.find_all('a', href=True):
-                    href = link['href']
-                    # Skip non-wiki links, special pages, and anchors
-                    if not href.startswith('/wiki/') or ':' in href or '#' in href:
-                        continue
-                    if href in seen:
-                        continue
-                    seen.add(href)
-                    link_candidates.append(link)
-
-            # Iterate over candidate links and scrape each item page
-            for link in link_candidates:
-                href = link['href']
-                full_url = self.base_url + href if href.startswith('/') else href
-                item_name = link.get_text(strip=True) or full_url
+            # Reuse items an interrupted run already completed
+            resumed = {}
+            if journal is not None and journal.completed:
+                resumed = self._journalled_items(item_infos, pending, journal.completed)
+                for index, item in resumed.items():
+                    results[index] = item
+                pending = [index for index in pending if index not in resumed]
+                self.logger.info(f"Resuming: {len(resumed)} items already scraped, {len(pending)} remaining")
 
-                item_info = {
-                    'name': item_name,
-                    'category': 'Loot',
-                    'url': full_url
-                }
+            # Scrape the individual item pages for recycling and salvaging
+            scraped = self._scrape_loot_items([item_infos[index] for index in pending])
+            for index, item in zip(pending, scraped):
+                results[index] = item
 
-                # Scrape the individual item page for recycling and salvaging
-                try:
-                    self.logger.info(f"Scraping loot item link: {item_name}")
-                    item = self._scrape_loot_item(item_info)
-                    all_items.append(item)
-                except Exception as e:
-                    self.logger.warning(f"Failed to scrape item {item_name}: {e}")
-                    self.failed_items.append({'name': item_name, 'url': full_url, 'error': str(e)})
+            # An edited item that could not be re-fetched keeps its previous
+            # data rather than vanishing; it stays in failed_items and its old
+            # revision ID makes the next incremental run try it again
+            stale = self._stale_items(item_infos, pending, results, previous) if previous else {}
+            for index, item in stale.items():
+                results[index] = item
+            all_items = [item for item in results if item is not None]
 
             elapsed = time.time() - start_time
             result = {
                 'categories': {'Loot': [item.to_dict() for item in all_items]},
                 'metadata': {
-                    'version': '1.0',
+                    'version': SCHEMA_VERSION,
                     'scraped_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
                     'total_items': len(all_items),
                     'categories_count': 1,
@@ -204,6 +334,12 @@ class WikiScraper:
                     'failed_items': len(self.failed_items)
                 }
             }
+            if previous:
+                result['metadata']['unchanged_items'] = len(unchanged)
+                result['metadata']['stale_items'] = len(stale)
+            if resumed:
+                result['metadata']['resumed_items'] = len(resumed)
+            result['metadata']['stats'] = self.stats.to_dict()
 
             self.logger.info(f"Scraped {len(all_items)} loot items in {elapsed:.2f}s")
             return result
@@ -211,73 +347,355 @@ class WikiScraper:
         except Exception as e:
             self.logger.error(f"Failed to scrape Loot page: {e}")
             raise
+        finally:
+            self.journal = None
+            if self.cache is not None:
+                self.cache.flush()
+
+    def _make_soup(self, html):
+        """
+        Parse only the page content (div.mw-parser-output) with the configured
+        parser backend. Navigation, footers and scripts are skipped while
+        parsing. Falls back to the whole document for pages without a
+        content container.
+        """
+        soup = BeautifulSoup(html, self.parser, parse_only=CONTENT_STRAINER)
+        if soup.find(True) is None:
+            soup = BeautifulSoup(html, self.parser)
+        return soup
+
+    def _extract_loot_links(self, html) -> List[Dict]:
+        """
+        Extract item links from the Loot page, in table order.
+        
+        Args:
+            html: HTML content of the Loot page
+            
+        Returns:
+            List of dictionaries with item names, URLs and category
+        """
+        soup = self._make_soup(html)
+        content_div = soup.find('div', class_='mw-parser-output') or soup
+
+        # Find the first table on the Loot page (items are often listed in a table)
+        table = content_div.find('table')
+        link_candidates = []
+
+        if table:
+            self.logger.info('Found a table on Loot page; extracting rows')
+            rows = table.find_all('tr')
+            # Skip header row(s)
+            for row in rows[1:]:
+                cols = row.find_all('td')
+                if not cols:
+                    continue
+
+                # Try to find a link to the item in the first column
+                link = cols[0].find('a', href=True)
+                if not link:
+                    continue
+
+                href = link['href']
+                if not href.startswith('/wiki/'):
+                    continue
+
+                link_candidates.append(link)
+        else:
+            # Fallback: scan the content area for wiki links that look like items
+            self.logger.warning('No table found on Loot page — falling back to scanning for links')
+            seen = set()
+            for link in content_div.find_all('a', href=True):
+                href = link['href']
+                # Skip non-wiki links, special pages, and anchors
+                if not href.startswith('/wiki/') or ':' in href or '#' in href:
+                    continue
+                if href in seen:
+                    continue
+                seen.add(href)
+                link_candidates.append(link)
+
+        item_infos = []
+        for link in link_candidates:
+            href = link['href']
+            full_url = self.base_url + href if href.startswith('/') else href
+            item_infos.append({
+                'name': link.get_text(strip=True) or full_url,
+                'category': 'Loot',
+                'url': full_url
+            })
+
+        return item_infos
+
+    def _unchanged_items(self, item_infos: List[Dict], previous: Dict) -> Dict[int, Item]:
+        """
+        Find items whose wiki revision matches the one in a previous scrape.
+        
+        Args:
+            item_infos: Items currently linked from the Loot page, annotated
+                with revision IDs
+            previous: Previously scraped data
+            
+        Returns:
+            Mapping of index into item_infos to the reused Item
+        """
+        previous_by_url = self._items_by_url(previous)
+
+        unchanged = {}
+        for index, info in enumerate(item_infos):
+            old = previous_by_url.get(info['url'])
+            if old is None or info.get('revision_id') is None:
+                continue
+            if old.get('revision_id') != info['revision_id']:
+                continue
+            unchanged[index] = self._reuse_item(info, old)
+        return unchanged
+
+    def _stale_items(self, item_infos: List[Dict], pending: List[int], results: List[Optional[Item]],
+                     previous: Dict) -> Dict[int, Item]:
+        """
+        Find pending items that failed to scrape but exist in a previous scrape.
+        
+        Returns:
+            Mapping of index into item_infos to the previous Item
+        """
+        previous_by_url = self._items_by_url(previous)
+
+        stale = {}
+        for index in pending:
+            info = item_infos[index]
+            old = previous_by_url.get(info['url'])
+            if results[index] is not None or old is None:
+                continue
+            self.logger.warning(f"Keeping stale data for {info['name']} from the previous scrape")
+            stale[index] = self._reuse_item(info, old)
+        return stale
+
+    @staticmethod
+    def _items_by_url(data: Dict) -> Dict[str, Dict]:
+        """Item dictionaries of a scrape, keyed by URL."""
+        items_by_url = {}
+        for items in data.get('categories', {}).values():
+            for item in items:
+                items_by_url[item['url']] = item
+        return items_by_url
+
+    @staticmethod
+    def _reuse_item(info: Dict, old: Dict) -> Item:
+        """Item from a previous scrape, named as currently linked."""
+        item = Item.from_dict(old)
+        # The link text on the Loot page may change without an item edit
+        item.name = info['name']
+        item.category = info['category']
+        return item
+
+    def _journalled_items(self, item_infos: List[Dict], pending: List[int],
+                          completed: Dict[str, Dict]) -> Dict[int, Item]:
+        """
+        Find pending items that a journal already holds.
+        
+        A journalled item is skipped if its page was edited since it was
+        recorded, i.e. both revision IDs are known and differ.
+        
+        Returns:
+            Mapping of index into item_infos to the reused Item
+        """
+        resumed = {}
+        for index in pending:
+            info = item_infos[index]
+            entry = completed.get(info['url'])
+            if entry is None:
+                continue
+            if None not in (entry.get('revision_id'), info.get('revision_id')) \
+                    and entry['revision_id'] != info['revision_id']:
+                continue
+            item = Item.from_dict(entry)
+            item.name = info['name']
+            item.category = info['category']
+            resumed[index] = item
+        return resumed
+
+    def _scrape_loot_items(self, item_infos: List[Dict]) -> List[Optional[Item]]:
+        """
+        Fetch and parse loot item pages using the configured worker pools.
+        
+        Pages are fetched by max_workers threads. With parse_workers set,
+        each fetched body is handed to a process pool for parsing, so fetch
+        threads go straight on to the next request and parsing runs on all
+        cores outside the GIL.
+        
+        Returns:
+            Items in the same order as item_infos, None for failed items
+        """
+        if self.parse_workers > 0:
+            self.logger.info(f"Scraping {len(item_infos)} items with {self.max_workers} fetch workers "
+                             f"and {self.parse_workers} parse processes")
+            with ProcessPoolExecutor(max_workers=self.parse_workers,
+                                     mp_context=multiprocessing.get_context(PARSE_WORKER_START_METHOD),
+                                     initializer=_init_parse_worker,
+                                     initargs=(self.parser,)) as parse_pool:
+                fetch = partial(self._try_fetch_loot_item, parse_pool=parse_pool)
+                parse_futures = self._map_fetch(fetch, item_infos)
+                return [self._collect_parsed_item(item_info, future)
+                        for item_info, future in zip(item_infos, parse_futures)]
+
+        if self.max_workers > 1:
+            self.logger.info(f"Scraping {len(item_infos)} items with {self.max_workers} workers")
+        return self._map_fetch(self._try_scrape_loot_item, item_infos)
+
+    def _map_fetch(self, func: Callable, item_infos: List[Dict]) -> List:
+        """Apply func to every item, on max_workers threads, keeping order."""
+        if self.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                try:
+                    return list(executor.map(func, item_infos))
+                except BaseException:
+                    # On Ctrl-C wait only for the fetches already in flight
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+        return [func(item_info) for item_info in item_infos]
+
+    def _try_fetch_loot_item(self, item_info: Dict, parse_pool: ProcessPoolExecutor) -> Optional[Future]:
+        """
+        Fetch a loot item page and submit it to the parse pool, recording a
+        fetch failure in failed_items instead of raising.
+        
+        Returns:
+            Future resolving to the parsed item's dictionary and parse time, or None
+        """
+        try:
+            self.logger.info(f"Fetching loot item link: {item_info['name']}")
+            html = self._fetch_loot_item_html(item_info)
+        except Exception as e:
+            self.logger.warning(f"Failed to scrape item {item_info['name']}: {e}")
+            self.failed_items.append({'name': item_info['name'], 'url': item_info['url'], 'error': str(e)})
+            return None
+        future = parse_pool.submit(_parse_item_in_worker, item_info, html)
+        if self.journal is not None:
+            # Journal as soon as parsing finishes, not when results are collected
+            future.add_done_callback(self._journal_parsed_item)
+        return future
+
+    def _journal_parsed_item(self, future: Future) -> None:
+        """Parse pool callback recording a successfully parsed item."""
+        # exception() raises CancelledError for a cancelled future
+        if not future.cancelled() and future.exception() is None:
+            self.journal.record(future.result()[0])
+
+    def _collect_parsed_item(self, item_info: Dict, future: Optional[Future]) -> Optional[Item]:
+        """Wait for a parse pool result, recording parse failures."""
+        if future is None:
+            return None
+        try:
+            item_dict, parse_seconds = future.result()
+            self.stats.add_time('parse', parse_seconds)
+            return Item.from_dict(item_dict)
+        except Exception as e:
+            self.logger.warning(f"Failed to parse item {item_info['name']}: {e}")
+            self.failed_items.append({'name': item_info['name'], 'url': item_info['url'], 'error': str(e)})
+            return None
+
+    def _try_scrape_loot_item(self, item_info: Dict) -> Optional[Item]:
+        """
+        Scrape a single loot item, recording the failure in failed_items
+        instead of raising. Safe to call from worker threads.
+        
+        Returns:
+            Item object, or None if the item could not be scraped
+        """
+        try:
+            self.logger.info(f"Scraping loot item link: {item_info['name']}")
+            item = self._scrape_loot_item(item_info)
+        except Exception as e:
+            self.logger.warning(f"Failed to scrape item {item_info['name']}: {e}")
+            self.failed_items.append({'name': item_info['name'], 'url': item_info['url'], 'error': str(e)})
+            return None
+        if self.journal is not None:
+            self.journal.record(item.to_dict())
+        return item
 
     def _scrape_loot_item(self, item_info: Dict) -> Item:
         """
         Scrape a single loot item page and extract both Recycling and Salvaging
-        results. Returns an Item object where the `materials` field is a
-        flattened list combining recycling and salvaging entries with an
-        extra attribute in their names to differentiate source.
+        results into the Item's `recycling` and `salvaging` lists.
         """
-        self._rate_limit_wait()
-        resp = self.session.get(item_info['url'], timeout=30)
-        resp.raise_for_status()
+        html = self._fetch_loot_item_html(item_info)
+        return self._parse_loot_item(item_info, html)
 
-        soup = BeautifulSoup(resp.text, 'html.parser')
+    def _fetch_loot_item_html(self, item_info: Dict) -> str:
+        """Download a loot item page using the configured fetch mode."""
+        if self.fetch_mode == 'api':
+            return self._fetch_page_html_api(self._title_from_url(item_info['url']),
+                                             item_info.get('revision_id'))
+        return self._get(item_info['url']).text
 
-        # Extract recycling and salvaging sections separately
-        recycling_materials = self._extract_section_materials(soup, ['recycling', 'recycled', 'recycling results'])
-        salvaging_materials = self._extract_section_materials(soup, ['salvaging', 'salvaged', 'salvaging results'])
+    def _parse_loot_item(self, item_info: Dict, html: str) -> Item:
+        """
+        Parse a loot item page (full page or API content HTML) into an Item.
+        Needs no network access, so it also runs in parse worker processes.
+        """
+        with self.stats.timer('parse'):
+            return self._build_loot_item(item_info, html)
 
-        # Compose materials list with clear naming so the generator can
-        # display both recycling and salvaging results per item.
-        materials = []
-        for m in recycling_materials:
-            materials.append(Material(name=m.name, quantity=m.quantity))
-        for m in salvaging_materials:
-            # To allow the front-end to separate salvaging from recycling
-            # we'll prefix the material name with "(Salvage) " so both types
-            # are preserved. The generator will also be compatible if the
-            # data contains structured 'recycling'/'salvaging' keys instead.
-            materials.append(Material(name=f"(Salvage) {m.name}", quantity=m.quantity))
-
-        return Item(name=item_info['name'], category=item_info['category'], url=item_info['url'], materials=materials)
-
-    def _extract_section_materials(self, soup, keywords: List[str]) -> List[Material]:
-        """
-        Find a section heading matching any of the given keywords and extract
-        materials using existing helpers. Returns a list of Material objects.
-        """
-        heading = None
-        for h in soup.find_all(['h2', 'h3', 'h4']):
-            text = h.get_text(strip=True).lower()
-            for kw in keywords:
-                if kw in text:
-                    heading = h
-                    break
-            if heading:
+    def _build_loot_item(self, item_info: Dict, html: str) -> Item:
+        soup = self._make_soup(html)
+
+        # Index the sections in one walk of the document, then extract
+        # recycling and salvaging from that index separately
+        sections = self._index_sections(soup)
+        recycling_materials = self._extract_section_materials(sections, ['recycling', 'recycled', 'recycling results'])
+        salvaging_materials = self._extract_section_materials(sections, ['salvaging', 'salvaged', 'salvaging results'])
+
+        return Item(name=item_info['name'], category=item_info['category'], url=item_info['url'],
+                    recycling=recycling_materials, salvaging=salvaging_materials,
+                    page_id=item_info.get('page_id'), revision_id=item_info.get('revision_id'))
+
+    def _index_sections(self, soup) -> List[Tuple[str, List]]:
+        """
+        Walk the document once and split it into sections at every h2/h3/h4.
+        
+        Returns:
+            List of (lowercased heading text, tags following the heading in
+            document order up to the next heading) in document order. Tags
+            nested inside the heading and inside containers are included,
+            just as a find_next() walk from the heading would visit them.
+        """
+        sections = []
+        current = None
+        for tag in soup.find_all(True):
+            if tag.name in self.SECTION_HEADINGS:
+                current = []
+                sections.append((tag.get_text(strip=True).lower(), current))
+            elif current is not None:
+                current.append(tag)
+        return sections
+
+    def _extract_section_materials(self, sections: List[Tuple[str, List]],
+                                   keywords: List[str]) -> List[Material]:
+        """
+        Find the first section whose heading matches any of the given keywords
+        and extract materials using existing helpers. Returns a list of
+        Material objects.
+        
+        Args:
+            sections: Section index built by _index_sections
+            keywords: Lowercase keywords to look for in headings
+        """
+        section_nodes = None
+        for heading_text, nodes in sections:
+            if any(kw in heading_text for kw in keywords):
+                section_nodes = nodes
                 break
 
-        if not heading:
+        if section_nodes is None:
             return []
 
-        import re
         materials: List[Material] = []
 
         # Walk forward through the document from the heading. Some pages
         # wrap the section content in a <section>/<div> or other container
-        # rather than as direct siblings, so using find_next() is more
-        # robust than find_next_sibling(). Stop when the next heading is
-        # encountered.
-        node = heading
-        while True:
-            node = node.find_next()
-            if node is None:
-                break
-            # stop when we hit another section heading
-            if getattr(node, 'name', None) in ['h2', 'h3', 'h4']:
-                break
-
+        # rather than as direct siblings, so the index holds every tag up to
+        # the next heading rather than just the heading's siblings.
+        for node in section_nodes:
             if getattr(node, 'name', None) == 'table':
                 # Special handling: some pages use a table with columns:
                 # Item | → | Recycling results | Salvaging results
@@ -311,22 +729,13 @@ class WikiScraper:
                             # parse recycling cell(s)
                             if recycling_idx is not None and recycling_idx < len(cells) and (want_recycling or not want_salvaging):
                                 cell_text = cells[recycling_idx].get_text(" ", strip=True)
-                                # split on common delimiters (commas, semicolons or newlines)
-                                parts = [p.strip() for p in re.split('[,;/\\n]+', cell_text) if p.strip()]
-                                for part in parts:
-                                    part_norm = part.replace('×', 'x')
-                                    mat, qty = self._parse_material_text(part_norm)
-                                    if mat and qty is not None:
-                                        materials.append(Material(name=mat, quantity=qty))
+                                for mat, qty in parse_material_cell(cell_text):
+                                    materials.append(Material(name=mat, quantity=qty))
                             # parse salvaging cell(s)
                             if salvaging_idx is not None and salvaging_idx < len(cells) and (want_salvaging or not want_recycling):
                                 cell_text = cells[salvaging_idx].get_text(" ", strip=True)
-                                parts = [p.strip() for p in re.split('[,;/\\n]+', cell_text) if p.strip()]
-                                for part in parts:
-                                    part_norm = part.replace('×', 'x')
-                                    mat, qty = self._parse_material_text(part_norm)
-                                    if mat and qty is not None:
-                                        materials.append(Material(name=mat, quantity=qty))
+                                for mat, qty in parse_material_cell(cell_text):
+                                    materials.append(Material(name=mat, quantity=qty))
                         # we've processed the table — return results to avoid
                         # accidentally parsing unrelated footer text later on
                         return materials
@@ -376,12 +785,174 @@ class WikiScraper:
             self.logger.error(f"Error writing python module: {e}")
             raise
     
-    def _rate_limit_wait(self):
-        """Enforce rate limiting between requests."""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.rate_limit:
-            time.sleep(self.rate_limit - elapsed)
-        self.last_request_time = time.time()
+    def save_to_sqlite(self, data: Dict, filepath: str, incremental: bool = False) -> None:
+        """
+        Save scraped data to a SQLite store, upserting items by URL.
+        
+        Args:
+            data: Dictionary containing scraped data
+            filepath: Path to the SQLite database
+            incremental: Only rewrite items whose wiki revision changed; use
+                for the output of an incremental scrape
+        """
+        directory = os.path.dirname(filepath)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with SQLiteStore(filepath) as store:
+            store.save(data, incremental=incremental)
+    
+    def _rate_limit_wait(self) -> float:
+        """Wait for a token from the (possibly shared) rate limiter."""
+        waited = self.rate_limiter.acquire()
+        self.stats.record_sleep(waited)
+        return waited
+
+    def _get(self, url: str, params: Optional[Dict] = None,
+             max_retries: int = 3) -> requests.Response:
+        """
+        Rate-limited GET that honours Retry-After on 429/503 responses.
+        
+        The Retry-After delay is applied to the rate limiter itself, so every
+        worker sharing it backs off, not just the one that was throttled.
+        
+        Args:
+            url: URL to fetch
+            params: Optional query string parameters
+            max_retries: How many throttled responses to wait out
+            
+        Returns:
+            Successful response
+
+        Raises:
+            requests.HTTPError: For error responses, including throttling that
+                persists past max_retries
+        """
+        for attempt in range(max_retries + 1):
+            self._rate_limit_wait()
+            start = time.perf_counter()
+            response = self.session.get(url, params=params, timeout=30)
+            # Revalidated cache hits only transferred a 304 over the network
+            from_cache = getattr(response, 'from_cache', False)
+            self.stats.record_request(time.perf_counter() - start,
+                                      0 if from_cache else len(response.content),
+                                      status=304 if from_cache else response.status_code,
+                                      from_cache=from_cache)
+            if response.status_code in (429, 503) and attempt < max_retries:
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                if retry_after is not None:
+                    self.logger.warning(f"Throttled on {url}; retrying after {retry_after:.1f}s")
+                    self.stats.incr('throttled_retries')
+                    self.rate_limiter.defer(retry_after)
+                    continue
+            response.raise_for_status()
+            return response
+
+    def _api_get(self, params: Dict) -> Dict:
+        """
+        Call the MediaWiki API and return the decoded JSON response.
+        
+        Raises:
+            ValueError: If the API reports an error
+        """
+        response = self._get(self.api_url, params=dict(params, format='json', formatversion=2))
+        data = response.json()
+        if 'error' in data:
+            error = data['error']
+            raise ValueError(f"MediaWiki API error {error.get('code')}: {error.get('info')}")
+        return data
+
+    def _title_from_url(self, url: str) -> str:
+        """Convert a /wiki/ page URL into a MediaWiki page title."""
+        path = urlsplit(url).path
+        if '/wiki/' in path:
+            path = path.split('/wiki/', 1)[1]
+        return unquote(path).replace('_', ' ')
+
+    def query_page_revisions(self, titles: List[str]) -> Dict[str, Dict]:
+        """
+        Resolve page titles to their page and latest revision IDs, batching
+        API_BATCH_SIZE titles per action=query request.
+        
+        Args:
+            titles: Page titles as they appear in links
+            
+        Returns:
+            Mapping of each requested title to a dictionary with 'title',
+            'page_id' and 'revision_id'. Missing pages are left out.
+        """
+        resolved = {}
+        for start in range(0, len(titles), self.API_BATCH_SIZE):
+            batch = titles[start:start + self.API_BATCH_SIZE]
+            data = self._api_get({
+                'action': 'query',
+                'prop': 'revisions',
+                'rvprop': 'ids',
+                'redirects': 1,
+                'titles': '|'.join(batch)
+            })
+            query = data.get('query', {})
+
+            # Follow title normalization and redirects back to the title
+            # that was actually requested.
+            renamed = {}
+            for mapping in query.get('normalized', []) + query.get('redirects', []):
+                renamed[mapping['from']] = mapping['to']
+
+            pages = {}
+            for page in query.get('pages', []):
+                if page.get('missing') or page.get('invalid') or not page.get('revisions'):
+                    continue
+                pages[page['title']] = {
+                    'title': page['title'],
+                    'page_id': page['pageid'],
+                    'revision_id': page['revisions'][0]['revid']
+                }
+
+            for title in batch:
+                target = title
+                seen = set()
+                while target in renamed and target not in seen:
+                    seen.add(target)
+                    target = renamed[target]
+                if target in pages:
+                    resolved[title] = pages[target]
+
+        return resolved
+
+    def _resolve_item_revisions(self, item_infos: List[Dict]) -> None:
+        """Annotate item_infos in place with page and revision IDs."""
+        titles = [self._title_from_url(info['url']) for info in item_infos]
+        revisions = self.query_page_revisions(list(dict.fromkeys(titles)))
+        for info, title in zip(item_infos, titles):
+            if title in revisions:
+                info['page_id'] = revisions[title]['page_id']
+                info['revision_id'] = revisions[title]['revision_id']
+
+    def _fetch_page_html_api(self, title: str, revision_id: Optional[int] = None) -> str:
+        """
+        Fetch only the rendered content HTML of a page via action=parse,
+        without the skin, navigation and sidebar.
+        
+        Args:
+            title: Page title
+            revision_id: Exact revision to render, if known
+            
+        Returns:
+            HTML of the page content (the mw-parser-output div)
+        """
+        params = {
+            'action': 'parse',
+            'prop': 'text',
+            'disablelimitreport': 1,
+            'disableeditsection': 1,
+            'disabletoc': 1
+        }
+        if revision_id is not None:
+            params['oldid'] = revision_id
+        else:
+            params['page'] = title
+            params['redirects'] = 1
+        return self._api_get(params)['parse']['text']
     
     def scrape_category(self, category_name: str, category_url: str) -> List[Dict]:
         """
@@ -407,12 +978,9 @@ class WikiScraper:
     @retry_with_backoff(max_retries=3, backoff_delays=[1.0, 2.0, 4.0])
     def _scrape_category_with_retry(self, category_name: str, category_url: str) -> List[Dict]:
         """Internal method with retry logic for category scraping."""
-        self._rate_limit_wait()
+        response = self._get(category_url)
         
-        response = self.session.get(category_url, timeout=30)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = self._make_soup(response.content)
         item_links = []
         
         # Find all links in the page content
@@ -463,7 +1031,7 @@ class WikiScraper:
         Returns:
             List of Material objects
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = self._make_soup(html_content)
         materials = []
         
         # Look for the "Recycled & Salvaged Materials" section
@@ -550,34 +1118,11 @@ class WikiScraper:
         Returns:
             Tuple of (material_name, quantity) or (None, None)
         """
-        import re
-        
-        # Try patterns like "Material: 5", "Material (5)", "Material x5", "5x Material"
-        patterns = [
-            r'(.+?):\s*(\d+)',           # Material: 5
-            r'(.+?)\s*\((\d+)\)',        # Material (5)
-            r'(.+?)\s*x\s*(\d+)',        # Material x5
-            r'(\d+)\s*x\s*(.+)',         # 5x Material
-            r'(.+?)\s*-\s*(\d+)',        # Material - 5
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                groups = match.groups()
-                if pattern == r'(\d+)\s*x\s*(.+)':
-                    # Quantity comes first
-                    return groups[1].strip(), int(groups[0])
-                else:
-                    return groups[0].strip(), int(groups[1])
-        
-        return None, None
+        return parse_material_text(text)
     
     def _parse_quantity(self, text: str) -> int:
         """Extract numeric quantity from text."""
-        import re
-        match = re.search(r'(\d+)', text)
-        return int(match.group(1)) if match else None
+        return parse_quantity(text)
     
     def scrape_item_page(self, item_info: Dict) -> Item:
         """
@@ -602,16 +1147,13 @@ class WikiScraper:
                 name=item_info['name'],
                 category=item_info['category'],
                 url=item_info['url'],
-                materials=[]
+                recycling=[]
             )
     
     @retry_with_backoff(max_retries=3, backoff_delays=[1.0, 2.0, 4.0])
     def _scrape_item_with_retry(self, item_info: Dict) -> Item:
         """Internal method with retry logic for item scraping."""
-        self._rate_limit_wait()
-        
-        response = self.session.get(item_info['url'], timeout=30)
-        response.raise_for_status()
+        response = self._get(item_info['url'])
         
         materials = self.extract_recycling_data(response.text)
         
@@ -619,7 +1161,7 @@ class WikiScraper:
             name=item_info['name'],
             category=item_info['category'],
             url=item_info['url'],
-            materials=materials
+            recycling=materials
         )
     
     def scrape_all_categories(self) -> Dict:
@@ -653,16 +1195,20 @@ class WikiScraper:
             
             all_data['categories'][category_name] = [item.to_dict() for item in items]
         
+        if self.cache is not None:
+            self.cache.flush()
+        
         # Add metadata
         elapsed_time = time.time() - start_time
         all_data['metadata'] = {
-            'version': '1.0',
+            'version': SCHEMA_VERSION,
             'scraped_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
             'total_items': total_items,
             'categories_count': len(self.CATEGORIES),
             'elapsed_seconds': round(elapsed_time, 2),
             'failed_categories': len(self.failed_categories),
-            'failed_items': len(self.failed_items)
+            'failed_items': len(self.failed_items),
+            'stats': self.stats.to_dict()
         }
         
         # Log summary
@@ -721,5 +1267,28 @@ class WikiScraper:
             raise
 
 
+# Per-process scraper used by parse workers; set up by _init_parse_worker
+_worker_scraper = None
+
+
+def _init_parse_worker(parser: str) -> None:
+    """Process pool initializer: build the scraper used for parsing."""
+    global _worker_scraper
+    _worker_scraper = WikiScraper(rate_limit=0, parser=parser)
+
+
+def _parse_item_in_worker(item_info: Dict, html: str) -> Tuple[Dict, float]:
+    """
+    Parse a fetched loot item page in a worker process.
+
+    Returns:
+        The item's dictionary and the seconds spent parsing it, so the
+        parent process can account parse time in its own stats
+    """
+    start = time.perf_counter()
+    item = _worker_scraper._build_loot_item(item_info, html)
+    return item.to_dict(), time.perf_counter() - start
+
+
 if __name__ == "__main__":
     pass
@@ -0,0 +1,317 @@
+"""
+Arc Raiders Recycling Tracker - SQLite Data Store Module
+
+Alternative to the monolithic recycling_data.json. Items are upserted by
+category and URL, so an incremental scrape only rewrites the rows of items
+that changed, and material lookups go through an index instead of a
+full-file scan.
+"""
+import json
+import logging
+import sqlite3
+from typing import Dict, List, Optional
+
+from data_schema import total_quantity, upgrade_item
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Data file extensions that select the SQLite store instead of JSON
+STORE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+
+# Stored in PRAGMA user_version. Version 1 keyed items on URL alone and
+# required a quantity for every material.
+SCHEMA_VERSION = 2
+
+ITEMS_TABLE = """
+CREATE TABLE IF NOT EXISTS {name} (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    name TEXT NOT NULL,
+    category TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    page_id INTEGER,
+    revision_id INTEGER,
+    UNIQUE (category, url)
+);
+"""
+
+ITEM_MATERIALS_TABLE = """
+CREATE TABLE IF NOT EXISTS {name} (
+    item_id INTEGER NOT NULL REFERENCES items(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    material_id INTEGER NOT NULL REFERENCES materials(id),
+    kind TEXT NOT NULL CHECK (kind IN ('recycling', 'salvaging')),
+    quantity INTEGER,
+    PRIMARY KEY (item_id, position)
+);
+"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS categories (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL
+);
+""" + ITEMS_TABLE.format(name='items') + """
+CREATE TABLE IF NOT EXISTS materials (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+""" + ITEM_MATERIALS_TABLE.format(name='item_materials') + """
+CREATE INDEX IF NOT EXISTS idx_items_name ON items(name);
+CREATE INDEX IF NOT EXISTS idx_items_category ON items(category, position);
+CREATE INDEX IF NOT EXISTS idx_item_materials_material ON item_materials(material_id, kind);
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def is_store_path(filepath: str) -> bool:
+    """True if a data file path selects the SQLite store."""
+    return filepath.lower().endswith(STORE_EXTENSIONS)
+
+
+class SQLiteStore:
+    """
+    Recycling data in a SQLite database.
+
+    Tables: categories (in display order), items (unique by category and
+    URL), materials (unique by name) and item_materials linking them with a
+    quantity and a kind of 'recycling' or 'salvaging'. load() returns the
+    same dictionary shape as the JSON data file, so the HTML generator can
+    read either. An item is stored under the category it is listed in, and
+    a URL listed twice in one category is stored once.
+    """
+
+    def __init__(self, filepath: str):
+        """
+        Open (creating if needed) the database.
+
+        Args:
+            filepath: Path to the SQLite database file
+        """
+        self.filepath = filepath
+        self.logger = logging.getLogger(__name__)
+        self.connection = sqlite3.connect(filepath)
+        self._migrate()
+        self.connection.execute('PRAGMA foreign_keys = ON')
+        self.connection.executescript(SCHEMA)
+        self.connection.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+    def _migrate(self) -> None:
+        """
+        Rebuild the tables of a version 1 store in the current layout.
+
+        SQLite cannot change a table's constraints in place, so the items
+        and item_materials tables are copied into new tables. Runs with
+        foreign keys off, or dropping the old items table would cascade to
+        the materials.
+        """
+        version = self.connection.execute('PRAGMA user_version').fetchone()[0]
+        exists = self.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'items'").fetchone()
+        if exists is None or version >= SCHEMA_VERSION:
+            return
+
+        self.logger.info(f"Upgrading SQLite store {self.filepath} to schema version {SCHEMA_VERSION}")
+        self.connection.executescript(
+            'BEGIN;'
+            + ITEMS_TABLE.format(name='items_new')
+            + 'INSERT INTO items_new SELECT id, url, name, category, position, page_id, revision_id FROM items;'
+            + ITEM_MATERIALS_TABLE.format(name='item_materials_new')
+            + 'INSERT INTO item_materials_new SELECT item_id, position, material_id, kind, quantity '
+              'FROM item_materials;'
+            + 'DROP TABLE item_materials; DROP TABLE items;'
+            + 'ALTER TABLE items_new RENAME TO items;'
+            + 'ALTER TABLE item_materials_new RENAME TO item_materials;'
+            + f'PRAGMA user_version = {SCHEMA_VERSION};'
+            + 'COMMIT;'
+        )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _material_id(self, name: str) -> int:
+        cursor = self.connection.execute(
+            'INSERT INTO materials (name) VALUES (?) ON CONFLICT(name) DO NOTHING', (name,))
+        if cursor.rowcount:
+            return cursor.lastrowid
+        return self.connection.execute('SELECT id FROM materials WHERE name = ?', (name,)).fetchone()[0]
+
+    def upsert_item(self, item: Dict, category: str, position: int, incremental: bool = False) -> bool:
+        """
+        Insert or update one item, keyed by category and URL.
+
+        In incremental mode an item whose stored revision and name match is
+        left untouched apart from its position, so unchanged items cost one
+        indexed lookup. Otherwise the item is always rewritten, so a full
+        re-scrape (e.g. after a parser fix) replaces materials parsed from
+        unchanged pages.
+
+        Args:
+            item: Item dictionary as produced by Item.to_dict (schema v1
+                items are upgraded)
+            category: Category the item is listed under
+            position: Position of the item within its category
+            incremental: Skip items whose stored revision is unchanged
+
+        Returns:
+            True if the item's row and materials were written
+        """
+        row = self.connection.execute(
+            'SELECT id, name, position, revision_id FROM items WHERE category = ? AND url = ?',
+            (category, item['url'])
+        ).fetchone()
+        if incremental and row is not None and item.get('revision_id') is not None \
+                and (row[1], row[3]) == (item['name'], item['revision_id']):
+            if row[2] != position:
+                self.connection.execute('UPDATE items SET position = ? WHERE id = ?', (position, row[0]))
+            return False
+
+        self.connection.execute(
+            """INSERT INTO items (url, name, category, position, page_id, revision_id)
+               VALUES (?, ?, ?, ?, ?, ?)
+               ON CONFLICT(category, url) DO UPDATE SET name = excluded.name,
+                   position = excluded.position, page_id = excluded.page_id,
+                   revision_id = excluded.revision_id""",
+            (item['url'], item['name'], category, position, item.get('page_id'), item.get('revision_id'))
+        )
+        item_id = row[0] if row is not None else self.connection.execute(
+            'SELECT id FROM items WHERE category = ? AND url = ?', (category, item['url'])).fetchone()[0]
+
+        self.connection.execute('DELETE FROM item_materials WHERE item_id = ?', (item_id,))
+        # Positions run across both lists, recycling first
+        item = upgrade_item(item)
+        results = [('recycling', m) for m in item['recycling']] + [('salvaging', m) for m in item['salvaging']]
+        rows = []
+        for index, (kind, material) in enumerate(results):
+            rows.append((item_id, index, self._material_id(material['name']), kind, material['quantity']))
+        self.connection.executemany(
+            'INSERT INTO item_materials (item_id, position, material_id, kind, quantity) VALUES (?, ?, ?, ?, ?)',
+            rows
+        )
+        return True
+
+    def save(self, data: Dict, incremental: bool = False) -> None:
+        """
+        Synchronise the store with a scraped dataset in one transaction.
+
+        Items are upserted by category and URL, items not in `data` are
+        deleted and the metadata is replaced. A URL listed more than once in
+        a category is stored once, with a warning.
+
+        Args:
+            data: Dictionary in the JSON data file shape
+            incremental: Only rewrite items whose revision changed (for the
+                output of an incremental scrape)
+        """
+        self.logger.info(f"Saving data to SQLite store {self.filepath}")
+        with self.connection:
+            self.connection.execute('DELETE FROM categories')
+            self.connection.executemany('INSERT INTO categories (name, position) VALUES (?, ?)',
+                                        [(name, index) for index, name in enumerate(data['categories'])])
+            keys = set()
+            written = 0
+            for category, items in data['categories'].items():
+                position = 0
+                for item in items:
+                    if (category, item['url']) in keys:
+                        self.logger.warning(f"Skipping {item['name']}: {item['url']} is already listed "
+                                            f"in category {category}")
+                        continue
+                    keys.add((category, item['url']))
+                    written += self.upsert_item(item, category, position, incremental)
+                    position += 1
+
+            stale = [(item_id,) for item_id, category, url in self.connection.execute(
+                'SELECT id, category, url FROM items') if (category, url) not in keys]
+            self.connection.executemany('DELETE FROM items WHERE id = ?', stale)
+            self.connection.execute(
+                'DELETE FROM materials WHERE id NOT IN (SELECT DISTINCT material_id FROM item_materials)')
+
+            self.connection.execute('DELETE FROM metadata')
+            self.connection.executemany(
+                'INSERT INTO metadata (key, value) VALUES (?, ?)',
+                [(key, json.dumps(value, ensure_ascii=False)) for key, value in data.get('metadata', {}).items()]
+            )
+        self.logger.info(f"Successfully saved data to {self.filepath} "
+                         f"({written} items written, {len(stale)} removed)")
+
+    def load(self) -> Dict:
+        """
+        Read the whole store.
+
+        Returns:
+            Dictionary in the JSON data file shape, items in schema v2
+        """
+        results: Dict[int, Dict[str, List[Dict]]] = {}
+        for item_id, kind, name, quantity in self.connection.execute(
+                """SELECT im.item_id, im.kind, m.name, im.quantity
+                   FROM item_materials im JOIN materials m ON m.id = im.material_id
+                   ORDER BY im.item_id, im.position"""):
+            item_results = results.setdefault(item_id, {'recycling': [], 'salvaging': []})
+            item_results[kind].append({'name': name, 'quantity': quantity})
+
+        categories: Dict[str, List[Dict]] = {
+            name: [] for name, in self.connection.execute('SELECT name FROM categories ORDER BY position')}
+        # Items of a category missing from the categories table (which save()
+        # never writes) are kept, after the known categories
+        for item_id, url, name, category, page_id, revision_id in self.connection.execute(
+                """SELECT i.id, i.url, i.name, i.category, i.page_id, i.revision_id
+                   FROM items i LEFT JOIN categories c ON c.name = i.category
+                   ORDER BY c.position IS NULL, c.position, i.category, i.position"""):
+            item_results = results.get(item_id, {'recycling': [], 'salvaging': []})
+            item = {
+                'name': name,
+                'category': category,
+                'url': url,
+                'recycling': item_results['recycling'],
+                'salvaging': item_results['salvaging'],
+                'recycling_total': total_quantity(item_results['recycling']),
+                'salvaging_total': total_quantity(item_results['salvaging'])
+            }
+            if page_id is not None:
+                item['page_id'] = page_id
+            if revision_id is not None:
+                item['revision_id'] = revision_id
+            if category not in categories:
+                self.logger.warning(f"Category {category!r} of {name} is not in the categories table")
+                categories[category] = []
+            categories[category].append(item)
+
+        metadata = {key: json.loads(value) for key, value in self.connection.execute('SELECT key, value FROM metadata')}
+        return {'categories': categories, 'metadata': metadata}
+
+    def items_with_material(self, material: str, kind: Optional[str] = None) -> List[Dict]:
+        """
+        Items yielding a material, via the material name index.
+
+        Args:
+            material: Material name
+            kind: 'recycling' or 'salvaging' to restrict to one source
+
+        Returns:
+            List of {'name', 'url', 'category', 'kind', 'quantity'}
+            dictionaries, highest quantity first
+        """
+        query = """SELECT i.name, i.url, i.category, im.kind, im.quantity
+                   FROM materials m
+                   JOIN item_materials im ON im.material_id = m.id
+                   JOIN items i ON i.id = im.item_id
+                   WHERE m.name = ?"""
+        params = [material]
+        if kind is not None:
+            query += ' AND im.kind = ?'
+            params.append(kind)
+        query += ' ORDER BY im.quantity DESC, i.name'
+        return [dict(zip(('name', 'url', 'category', 'kind', 'quantity'), row))
+                for row in self.connection.execute(query, params)]
@@ -0,0 +1,55 @@
+"""
+Offline stand-in for WikiScraper's requests session, serving fixture
+responses such as create_sample_data.generate_wiki_pages builds.
+"""
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlencode, urlsplit
+
+import requests
+
+from wiki_fixtures import fixture_key
+
+
+class FakeWikiSession:
+    """
+    Answers session.get() from a dictionary of fixture responses.
+
+    Requests are recorded as fixture keys in `requested`. A GET of the path
+    `interrupt_on` raises KeyboardInterrupt, like Ctrl-C during a scrape.
+    """
+
+    def __init__(self, responses: Dict[str, Dict], interrupt_on: Optional[str] = None):
+        self.responses = responses
+        self.interrupt_on = interrupt_on
+        self.requested = []
+        self.hooks = {'response': []}
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, timeout=None):
+        if params:
+            url += '?' + urlencode(params)
+        key = fixture_key(url)
+        with self._lock:
+            self.requested.append(key)
+        if urlsplit(url).path == self.interrupt_on:
+            raise KeyboardInterrupt
+
+        entry = self.responses.get(key)
+        response = requests.Response()
+        response.url = url
+        response.encoding = 'utf-8'
+        if entry is None:
+            response.status_code = 404
+            response._content = b'Not found in fixture archive'
+        else:
+            response.status_code = entry.get('status', 200)
+            response._content = entry['body'].encode('utf-8')
+            response.headers['Content-Type'] = entry.get('content_type', 'text/html; charset=utf-8')
+        for hook in self.hooks['response']:
+            hook(response)
+        return response
+
+    def item_pages_requested(self):
+        """Paths of the item pages fetched so far."""
+        return [key for key in self.requested if key.startswith('/wiki/') and key != '/wiki/Loot']
@@ -0,0 +1,87 @@
+"""
+Reference implementations the optimized code is checked against.
+
+These are the scraper's original versions, kept verbatim so the equivalence
+tests (and the benchmarks in bench/) compare against a fixed baseline.
+"""
+import re
+
+from bs4 import BeautifulSoup
+
+from scraper import Item
+
+
+MATERIAL_NAMES = ['Metal Parts', 'Rubber', 'Plastic Parts', 'Wires', 'Battery',
+                  'Fabric', 'Advanced Electrical Components', 'ARC Alloy']
+
+
+def legacy_parse_material_text(text: str) -> tuple:
+    """The scraper's original material text parser."""
+    patterns = [
+        r'(.+?):\s*(\d+)',           # Material: 5
+        r'(.+?)\s*\((\d+)\)',        # Material (5)
+        r'(.+?)\s*x\s*(\d+)',        # Material x5
+        r'(\d+)\s*x\s*(.+)',         # 5x Material
+        r'(.+?)\s*-\s*(\d+)',        # Material - 5
+    ]
+
+    for pattern in patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            groups = match.groups()
+            if pattern == r'(\d+)\s*x\s*(.+)':
+                return groups[1].strip(), int(groups[0])
+            else:
+                return groups[0].strip(), int(groups[1])
+
+    return None, None
+
+
+def legacy_section_nodes(soup, keywords: list):
+    """
+    The scraper's original section lookup: the first h2/h3/h4 whose text
+    contains a keyword, then a find_next() walk up to the next heading.
+
+    Returns:
+        (heading text, tags in the section) or None when no heading matches
+    """
+    heading = None
+    for h in soup.find_all(['h2', 'h3', 'h4']):
+        text = h.get_text(strip=True).lower()
+        for kw in keywords:
+            if kw in text:
+                heading = h
+                break
+        if heading:
+            break
+
+    if not heading:
+        return None
+
+    nodes = []
+    node = heading
+    while True:
+        node = node.find_next()
+        if node is None:
+            break
+        if getattr(node, 'name', None) in ['h2', 'h3', 'h4']:
+            break
+        nodes.append(node)
+    return heading.get_text(strip=True).lower(), nodes
+
+
+def legacy_build_loot_item(scraper, item_info: dict, html: str):
+    """
+    Parse an item page the way the scraper originally did: the whole
+    document with html.parser, each section located by its own heading scan
+    and find_next() walk. The per-tag material extraction is the scraper's
+    own, which those changes left untouched.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    materials = {}
+    for field, keywords in (('recycling', ['recycling', 'recycled', 'recycling results']),
+                            ('salvaging', ['salvaging', 'salvaged', 'salvaging results'])):
+        section = legacy_section_nodes(soup, keywords)
+        materials[field] = scraper._extract_section_materials([section] if section else [], keywords)
+    return Item(name=item_info['name'], category=item_info['category'], url=item_info['url'],
+                recycling=materials['recycling'], salvaging=materials['salvaging'])
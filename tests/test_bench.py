@@ -0,0 +1,72 @@
+"""
+Tests for the benchmark harness's run lookup and parse-stage inputs.
+"""
+import logging
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from bench import stages
+from bench.harness import find_run
+from wiki_fixtures import save_archive
+
+logging.disable(logging.INFO)
+
+
+class FindRunTest(unittest.TestCase):
+
+    def setUp(self):
+        self.runs = [
+            {'label': 'baseline', 'commit': 'a1b2c3d'},
+            {'label': '2', 'commit': '1234567'},
+            {'label': 'tuned', 'commit': 'f00dbee'},
+        ]
+
+    def test_label_and_commit(self):
+        self.assertIs(find_run(self.runs, 'baseline'), self.runs[0])
+        self.assertIs(find_run(self.runs, 'f00dbee'), self.runs[2])
+
+    def test_numeric_label_and_commit_win_over_index(self):
+        self.assertIs(find_run(self.runs, '2'), self.runs[1])
+        self.assertIs(find_run(self.runs, '1234567'), self.runs[1])
+
+    def test_index_when_nothing_matches(self):
+        self.assertIs(find_run(self.runs, '-1'), self.runs[2])
+        self.assertIs(find_run(self.runs, '0'), self.runs[0])
+
+    def test_no_match(self):
+        with self.assertRaises(ValueError):
+            find_run(self.runs, 'missing')
+        with self.assertRaises(ValueError):
+            find_run(self.runs, '7')
+
+
+class ItemPagesTest(unittest.TestCase):
+
+    def test_archive_without_item_pages_falls_back_to_synthetic(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            archive = os.path.join(tempdir, 'wiki.json.gz')
+            api_only = {'/api.php?action=parse&format=json&formatversion=2&page=Loot':
+                        {'status': 200, 'content_type': 'application/json', 'body': '{}'}}
+            save_archive({'base_url': 'https://arcraiders.wiki', 'recorded_at': '', 'responses': api_only}, archive)
+            with mock.patch.object(stages, 'FIXTURE_ARCHIVE', archive):
+                pages = stages._item_pages(7)
+        self.assertEqual(len(pages), 7)
+        self.assertTrue(all('mw-parser-output' in page for page in pages))
+
+    def test_recorded_item_pages_are_cycled(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            archive = os.path.join(tempdir, 'wiki.json.gz')
+            responses = {
+                '/wiki/Loot': {'status': 200, 'content_type': 'text/html', 'body': 'loot'},
+                '/wiki/A': {'status': 200, 'content_type': 'text/html', 'body': 'a'},
+                '/wiki/B': {'status': 200, 'content_type': 'text/html', 'body': 'b'},
+            }
+            save_archive({'base_url': 'https://arcraiders.wiki', 'recorded_at': '', 'responses': responses}, archive)
+            with mock.patch.object(stages, 'FIXTURE_ARCHIVE', archive):
+                self.assertEqual(stages._item_pages(5), ['a', 'b', 'a', 'b', 'a'])
+
+
+if __name__ == '__main__':
+    unittest.main()
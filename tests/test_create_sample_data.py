@@ -0,0 +1,71 @@
+"""
+Tests for the synthetic wiki pages written by create_sample_data.
+"""
+import logging
+import unittest
+
+from create_sample_data import generate_dataset, generate_wiki_pages
+from data_schema import upgrade_data
+from scraper import WikiScraper
+from wiki_fixtures import StubWikiServer
+
+logging.disable(logging.INFO)
+
+
+def without_host(items):
+    return [dict(item, url=item['url'].split('/wiki/', 1)[1]) for item in items]
+
+
+class SyntheticWikiTest(unittest.TestCase):
+    """A scrape of the synthetic pages gives back the dataset, in every fetch mode."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.data = generate_dataset(120, seed=5)
+        cls.server = StubWikiServer(generate_wiki_pages(cls.data)).start()
+        cls.expected = [{key: value for key, value in item.items() if key != 'category'}
+                        for items in upgrade_data(cls.data)['categories'].values() for item in items]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def scrape(self, **kwargs):
+        return WikiScraper(base_url=self.server.base_url, rate_limit=0, **kwargs)
+
+    def items(self, result):
+        self.assertEqual(result['metadata']['failed_items'], 0)
+        return [{key: value for key, value in item.items() if key not in ('category', 'page_id', 'revision_id')}
+                for item in without_host(result['categories']['Loot'])]
+
+    def test_html_mode(self):
+        before = self.server.request_count
+        result = self.scrape().scrape_loot()
+        self.assertEqual(self.items(result), without_host(self.expected))
+        # The Loot page and the item pages; nothing needs revision IDs
+        self.assertEqual(self.server.request_count - before, 121)
+        self.assertFalse(any(item.get('revision_id') for item in result['categories']['Loot']))
+
+    def test_api_mode(self):
+        result = self.scrape(fetch_mode='api').scrape_loot()
+        self.assertEqual(self.items(result), without_host(self.expected))
+        self.assertTrue(all(item['revision_id'] for item in result['categories']['Loot']))
+
+    def test_incremental_scrape_only_looks_up_revisions(self):
+        previous = self.scrape(fetch_mode='api').scrape_loot()
+        before = self.server.request_count
+        result = self.scrape().scrape_loot(previous=previous)
+        # The Loot page and three 50-title revision batches, no item pages
+        self.assertEqual(self.server.request_count - before, 4)
+        self.assertEqual(result['metadata']['unchanged_items'], 120)
+
+    def test_existing_revision_ids_are_kept(self):
+        data = {'categories': {'Loot': [{'name': 'Rifle', 'category': 'Loot', 'url': 'https://x/wiki/Rifle',
+                                         'revision_id': 77, 'recycling': [], 'salvaging': []}]}}
+        responses = generate_wiki_pages(data)
+        self.assertIn('/api.php?action=parse&disableeditsection=1&disablelimitreport=1&disabletoc=1'
+                      '&format=json&formatversion=2&oldid=77&prop=text', responses)
+
+
+if __name__ == '__main__':
+    unittest.main()
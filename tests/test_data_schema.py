@@ -0,0 +1,60 @@
+"""
+Tests for the v1 -> v2 data schema upgrade.
+"""
+import logging
+import unittest
+
+from data_schema import split_v1_materials, total_quantity, upgrade_data, upgrade_item
+
+logging.disable(logging.INFO)
+
+
+class UpgradeTest(unittest.TestCase):
+
+    def test_split_v1_materials(self):
+        recycling, salvaging = split_v1_materials([
+            {'name': 'Metal Parts', 'quantity': 2},
+            {'name': '(Salvage) Gears ', 'quantity': 1},
+            {'name': 'Wires', 'quantity': None}
+        ])
+        self.assertEqual(recycling, [{'name': 'Metal Parts', 'quantity': 2}, {'name': 'Wires', 'quantity': None}])
+        self.assertEqual(salvaging, [{'name': 'Gears', 'quantity': 1}])
+
+    def test_total_quantity_treats_unknown_as_zero(self):
+        self.assertEqual(total_quantity([{'name': 'a', 'quantity': 3}, {'name': 'b', 'quantity': None}]), 3)
+        self.assertEqual(total_quantity([]), 0)
+
+    def test_v1_item(self):
+        item = {'name': 'Rifle', 'url': 'u', 'revision_id': 5,
+                'materials': [{'name': 'Metal', 'quantity': 2}, {'name': '(Salvage) Metal', 'quantity': 4}]}
+        upgraded = upgrade_item(item)
+        self.assertEqual(upgraded, {
+            'name': 'Rifle', 'url': 'u', 'revision_id': 5,
+            'recycling': [{'name': 'Metal', 'quantity': 2}], 'salvaging': [{'name': 'Metal', 'quantity': 4}],
+            'recycling_total': 2, 'salvaging_total': 4
+        })
+        self.assertIn('materials', item)
+
+    def test_v2_item_keeps_existing_totals(self):
+        item = {'name': 'Rifle', 'recycling': [{'name': 'Metal', 'quantity': 2}], 'recycling_total': 99}
+        upgraded = upgrade_item(item)
+        self.assertEqual(upgraded['recycling_total'], 99)
+        self.assertEqual(upgraded['salvaging'], [])
+        self.assertEqual(upgraded['salvaging_total'], 0)
+
+    def test_item_without_materials(self):
+        upgraded = upgrade_item({'name': 'Rock'})
+        self.assertEqual((upgraded['recycling'], upgraded['salvaging']), ([], []))
+
+    def test_upgrade_data_keeps_metadata_and_order(self):
+        data = {'categories': {'B': [{'name': 'x', 'materials': []}], 'A': [{'name': 'y', 'materials': []}]},
+                'metadata': {'version': '1.0'}}
+        upgraded = upgrade_data(data)
+        self.assertEqual(list(upgraded['categories']), ['B', 'A'])
+        self.assertIs(upgraded['metadata'], data['metadata'])
+        self.assertIn('materials', data['categories']['B'][0])
+        self.assertEqual(upgrade_data(upgraded), upgraded)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,419 @@
+"""
+Tests for the HTML generator's server-rendered table rows.
+"""
+import bisect
+import html
+import json
+import logging
+import os
+import re
+import tempfile
+import unittest
+
+from create_sample_data import generate_dataset
+from data_schema import upgrade_data
+from generator import SEARCH_WORD, HTMLGenerator
+
+logging.disable(logging.INFO)
+
+
+def table_body(page: str) -> str:
+    return re.search(r'<tbody id="table-body">(.*?)</tbody>', page, re.S).group(1)
+
+
+class PrerenderedRowsTest(unittest.TestCase):
+    """The first rows of the name-sorted view are written into the page."""
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+        self.data_path = os.path.join(self.tempdir.name, 'data.json')
+        self.write_data(generate_dataset(40, seed=3))
+
+    def write_data(self, data):
+        with open(self.data_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+    def generate(self, **kwargs) -> str:
+        output = os.path.join(self.tempdir.name, 'page.html')
+        HTMLGenerator(self.data_path, **kwargs).generate_html(output)
+        with open(output, encoding='utf-8') as f:
+            return f.read()
+
+    def test_first_rows_in_name_order(self):
+        body = table_body(self.generate(prerender_rows=5))
+        rows = re.findall(r'<tr>(.*?)</tr>', body)
+        self.assertEqual(len(rows), 5)
+        for row in rows:
+            self.assertEqual(row.count('<td>'), 4)
+        names = [re.search(r'rel="noopener">(.*?)</a>', row).group(1) for row in rows]
+
+        generator = HTMLGenerator(self.data_path)
+        generator.load_data()
+        expected = sorted((row['name'] for row in generator.build_rows()), key=str.lower)[:5]
+        self.assertEqual(names, expected)
+
+    def test_zero_prerendered_rows_leaves_only_a_placeholder(self):
+        body = table_body(self.generate(prerender_rows=0))
+        self.assertEqual(re.findall(r'<tr>', body), [])
+        self.assertEqual(len(re.findall(r'<tr class="placeholder">', body)), 1)
+        self.assertIn('colspan="4"', body)
+
+    def test_empty_dataset_shows_no_data(self):
+        self.write_data({'categories': {'Weapons': []}, 'metadata': {'version': '2.0'}})
+        body = table_body(self.generate())
+        self.assertIn('No data available', body)
+        self.assertEqual(re.findall(r'<tr>', body), [])
+
+    def test_cells_are_escaped(self):
+        self.write_data({'categories': {'A&B': [{
+            'name': '<b>x</b>', 'category': 'A&B', 'url': 'https://example.com/?a=1&b="2"',
+            'recycling': [{'name': 'M<1>', 'quantity': 2}], 'salvaging': []
+        }]}})
+        body = table_body(self.generate())
+        self.assertIn('&lt;b&gt;x&lt;/b&gt;', body)
+        self.assertIn('href="https://example.com/?a=1&amp;b=&quot;2&quot;"', body)
+        self.assertIn('<td>A&amp;B</td>', body)
+        self.assertIn('<td>M&lt;1&gt; x2</td>', body)
+        self.assertNotIn('<b>x</b>', body)
+
+
+class ValidateDataTest(unittest.TestCase):
+
+    def test_accepts_v1_and_v2_items(self):
+        generator = HTMLGenerator('unused.json')
+        generator.validate_data({'categories': {'A': [{'name': 'x', 'url': 'u', 'materials': []},
+                                                      {'name': 'y', 'url': 'u', 'recycling': []}]}})
+
+    def test_rejects_malformed_data(self):
+        generator = HTMLGenerator('unused.json')
+        for data in ({}, {'categories': []}, {'categories': {'A': {}}},
+                     {'categories': {'A': [{'name': 'x'}]}},
+                     {'categories': {'A': [{'name': 'x', 'url': 'u'}]}},
+                     {'categories': {'A': [{'name': 'x', 'url': 'u', 'recycling': 'Metal'}]}}):
+            with self.subTest(data=data), self.assertRaises(ValueError):
+                generator.validate_data(data)
+
+
+def generator_for(data) -> HTMLGenerator:
+    """Generator holding `data` as if loaded from a file."""
+    generator = HTMLGenerator('unused.json')
+    generator.validate_data(data)
+    generator.data = upgrade_data(data)
+    return generator
+
+
+def item(name, category, recycling=(), salvaging=(), url=None):
+    return {'name': name, 'category': category,
+            'url': 'https://arcraiders.wiki/wiki/' + name.replace(' ', '_') if url is None else url,
+            'recycling': [{'name': m, 'quantity': q} for m, q in recycling],
+            'salvaging': [{'name': m, 'quantity': q} for m, q in salvaging]}
+
+
+def utf16_key(token: str) -> bytes:
+    return token.encode('utf-16-be')
+
+
+class SearchIndexTest(unittest.TestCase):
+    """The inverted index gives exactly the rows a scan of the row text would."""
+
+    def setUp(self):
+        self.generator = generator_for({'categories': {
+            'Weapons': [item('Heavy Metal Rifle', 'Weapons', [('Metal Parts', 2), ('Metal Parts', 1)]),
+                        item('Café Pistol', 'Weapons', [('Öl', 1)], [('Metal Parts', 4)])],
+            'Exotic Gear': [item('𝔸lloy Frame', 'Exotic Gear', [('ﬀ Fibre', 1)]),
+                            item('Rusted Gear 2', 'Exotic Gear', salvaging=[('Gears', 3)]),
+                            item('Plain Rock', 'Exotic Gear')]
+        }})
+        self.rows = self.generator.build_rows()
+        self.index = self.generator.build_search_index(self.rows)
+
+    def decode(self):
+        """Token -> ascending row indexes, undoing the gap encoding."""
+        postings = {}
+        start = 0
+        for token, count in zip(self.index['tokens'], self.index['counts']):
+            rows = []
+            previous = 0
+            for gap in self.index['ids'][start:start + count]:
+                previous += gap
+                rows.append(previous)
+            postings[token] = rows
+            start += count
+        self.assertEqual(start, len(self.index['ids']))
+        return postings
+
+    def prefix_rows(self, prefix):
+        """Rows with a token starting with prefix, found as the page does: binary search on UTF-16."""
+        tokens = self.index['tokens']
+        postings = self.decode()
+        found = set()
+        position = bisect.bisect_left([utf16_key(token) for token in tokens], utf16_key(prefix))
+        while position < len(tokens) and tokens[position].startswith(prefix):
+            found.update(postings[tokens[position]])
+            position += 1
+        return found
+
+    def search(self, query):
+        rows = None
+        for word in SEARCH_WORD.findall(query.lower()):
+            matched = self.prefix_rows(word)
+            rows = matched if rows is None else rows & matched
+        return rows
+
+    def scan(self, query):
+        rows = set()
+        for index, row in enumerate(self.rows):
+            text = ' '.join([row['name'], row['category']] + [m['name'] for kind in ('recycling', 'salvaging')
+                                                               for m in row[kind]])
+            words = SEARCH_WORD.findall(text.lower())
+            if all(any(token.startswith(word) for token in words) for word in SEARCH_WORD.findall(query.lower())):
+                rows.add(index)
+        return rows
+
+    def test_tokens_are_unique_and_in_utf16_order(self):
+        tokens = self.index['tokens']
+        self.assertEqual(len(tokens), len(set(tokens)))
+        self.assertEqual(tokens, sorted(tokens, key=utf16_key))
+        # Astral characters sort before U+FB00 in UTF-16, unlike by code point
+        self.assertLess(tokens.index('𝔸lloy'), tokens.index('ﬀ'))
+
+    def test_postings_are_ascending_and_list_a_row_once(self):
+        postings = self.decode()
+        for token, rows in postings.items():
+            self.assertEqual(rows, sorted(set(rows)), token)
+        self.assertEqual(postings['metal'], [0, 1])
+        self.assertEqual(postings['gear'], [2, 3, 4])
+
+    def test_prefix_queries_match_a_scan(self):
+        for query in ('met', 'metal parts', 'METAL', 'gear', 'gears', 'caf', 'café pi', 'öl', '𝔸', 'ﬀ fib',
+                      '2', 'exotic rock', 'rifle pistol', 'zzz'):
+            with self.subTest(query=query):
+                self.assertEqual(self.search(query), self.scan(query))
+        self.assertEqual(self.search('metal parts'), {0, 1})
+        self.assertEqual(self.search('ex ro'), {4})
+
+
+def decode_compact(payload):
+    """Rebuild build_rows() output from a compact payload, as the page's decoder reads it."""
+    rows = []
+    offsets = {'recycling': 0, 'salvaging': 0}
+    for index, name in enumerate(payload['names']):
+        path = payload['paths'][index]
+        if path is None:
+            url = None
+        else:
+            url = payload['base'] + (name.replace(' ', '_') if path == 0 else path)
+        row = {'name': html.unescape(name),
+               'category': html.unescape(payload['categories'][payload['category'][index]]),
+               'url': html.unescape(url) if url is not None else None}
+        for kind in ('recycling', 'salvaging'):
+            flat = payload[kind]
+            start = offsets[kind]
+            end = start + 2 * payload[kind + 'Count'][index]
+            row[kind] = [{'name': html.unescape(payload['materials'][flat[k]]), 'quantity': flat[k + 1]}
+                         for k in range(start, end, 2)]
+            offsets[kind] = end
+        rows.append(row)
+    return rows
+
+
+class CompactPayloadTest(unittest.TestCase):
+
+    def round_trip(self, data):
+        generator = generator_for(data)
+        rows = generator.build_rows()
+        payload = json.loads(json.dumps(generator.build_compact_payload(rows)))
+        # An empty URL and a missing one both render as '#'
+        expected = [dict({key: row[key] for key in ('name', 'category', 'recycling', 'salvaging')},
+                         url=row['url'] or None) for row in rows]
+        decoded = decode_compact(payload)
+        self.assertEqual(decoded, expected)
+        # The decoded rows render to the same cells the 'rows' payload ships
+        self.assertEqual([generator.render_row_cells(row) for row in decoded],
+                         [generator.render_row_cells(row) for row in rows])
+        return payload
+
+    def test_round_trip(self):
+        payload = self.round_trip({'categories': {
+            'Weapons': [item('Heavy Rifle', 'Weapons', [('Metal Parts', 2), ('Wires', None)], [('Metal Parts', 5)]),
+                        item('Pistol', 'Weapons'),
+                        # URL does not follow the name
+                        item('Rusty "Old" Gun', 'Weapons', [('Metal Parts', 1)],
+                             url='https://arcraiders.wiki/wiki/Old_Gun?x=1&y=2'),
+                        item('No Link', 'Weapons', [('Wires', 3)], url=''),
+                        item('Salt & "Pepper"', 'Weapons', [('Wires', 1)])],
+            'A&B <Tools>': [item('Café Axe', 'A&B <Tools>', salvaging=[('Öl & Fett', 1)])]
+        }})
+        self.assertEqual(payload['base'], 'https://arcraiders.wiki/wiki/')
+        self.assertEqual(payload['paths'], [0, 0, 'Old_Gun?x=1&amp;y=2', None, 0, 0])
+        self.assertEqual(payload['categories'], ['Weapons', 'A&amp;B &lt;Tools&gt;'])
+        self.assertEqual(payload['materials'], ['Metal Parts', 'Wires', 'Öl &amp; Fett'])
+
+    def test_urls_on_different_hosts(self):
+        payload = self.round_trip({'categories': {'Loot': [
+            item('Rifle', 'Loot', url='https://one.example/wiki/Rifle'),
+            item('Pistol', 'Loot', url='https://two.example/wiki/Pistol')
+        ]}})
+        self.assertEqual(payload['base'], 'https://')
+
+    def test_single_item_and_synthetic_dataset(self):
+        self.round_trip({'categories': {'Loot': [item('Rifle', 'Loot', [('Metal', 1)])]}})
+        self.round_trip(generate_dataset(300, seed=9))
+
+
+def read_script(path, function):
+    """Arguments of the single `function(...)` call a data script makes."""
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    prefix = function + '('
+    assert text.startswith(prefix) and text.endswith(');\n'), path
+    return json.loads('[' + text[len(prefix):-3] + ']')
+
+
+class WriteShardsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+        self.output = os.path.join(self.tempdir.name, 'page.html')
+        self.directory = os.path.join(self.tempdir.name, 'page_data')
+        self.data = generate_dataset(23, seed=6)
+
+    def write(self, shard_size, payload='rows'):
+        generator = generator_for(self.data)
+        generator.shard_size = shard_size
+        generator.payload = payload
+        rows = generator.build_rows()
+        return generator, rows, generator.write_shards(self.output, rows)
+
+    def test_manifest_and_shard_boundaries(self):
+        generator, rows, manifest = self.write(10)
+        self.assertEqual(manifest, {
+            'payload': 'rows', 'total': 23, 'shardSize': 10,
+            'shards': ['page_data/shard-00000.js', 'page_data/shard-00001.js', 'page_data/shard-00002.js'],
+            'orders': 'page_data/orders.js', 'search': 'page_data/search.js', 'materials': 'page_data/materials.js'
+        })
+        with open(os.path.join(self.directory, 'manifest.json'), encoding='utf-8') as f:
+            self.assertEqual(json.load(f), manifest)
+
+        # Shards hold the rows in name order, shardSize at a time
+        by_name = [rows[i] for i in generator.build_sort_orders(rows)['name']]
+        cells = []
+        for n, shard in enumerate(manifest['shards']):
+            number, shard_cells = read_script(os.path.join(self.tempdir.name, shard), 'trackerShard')
+            self.assertEqual(number, n)
+            self.assertEqual(len(shard_cells), min(10, 23 - 10 * n))
+            cells.extend(shard_cells)
+        self.assertEqual(cells, [generator.render_row_cells(row) for row in by_name])
+
+        # The other orders index the name-ordered rows and keep their ties
+        orders, = read_script(os.path.join(self.directory, 'orders.js'), 'trackerOrders')
+        self.assertEqual(set(orders), {'recycling', 'salvaging'})
+        embedded = generator.build_sort_orders(rows)
+        for key, total in (('recycling', 'recyclingTotal'), ('salvaging', 'salvagingTotal')):
+            self.assertEqual([by_name[i]['name'] for i in orders[key]], [rows[i]['name'] for i in embedded[key]])
+            self.assertEqual([by_name[i][total] for i in orders[key]], sorted(row[total] for row in rows))
+
+    def test_rewrite_with_fewer_shards_removes_stale_files(self):
+        self.write(5)
+        self.assertEqual(len([name for name in os.listdir(self.directory) if name.startswith('shard-')]), 5)
+        # Unrelated files in the directory are left alone
+        with open(os.path.join(self.directory, 'notes.txt'), 'w') as f:
+            f.write('keep')
+
+        _, _, manifest = self.write(20, payload='compact')
+        self.assertEqual(sorted(os.listdir(self.directory)),
+                         ['manifest.json', 'materials.js', 'notes.txt', 'orders.js', 'search.js',
+                          'shard-00000.js', 'shard-00001.js'])
+        self.assertEqual(manifest['shards'], ['page_data/shard-00000.js', 'page_data/shard-00001.js'])
+        self.assertEqual(manifest['payload'], 'compact')
+        _, payload = read_script(os.path.join(self.directory, 'shard-00001.js'), 'trackerShard')
+        self.assertEqual(len(payload['names']), 3)
+
+    def test_empty_dataset_writes_no_shards(self):
+        self.data = {'categories': {'Loot': []}}
+        _, _, manifest = self.write(10)
+        self.assertEqual((manifest['total'], manifest['shards']), (0, []))
+
+
+class MaterialSetsTest(unittest.TestCase):
+    """Each material's row set selects exactly the rows yielding it."""
+
+    def check(self, data):
+        generator = generator_for(data)
+        rows = generator.build_rows()
+        names = generator.material_names(rows)
+        sets = generator.build_material_sets(rows)
+
+        def decode(gaps):
+            indexes = []
+            index = 0
+            for gap in gaps:
+                index += gap
+                indexes.append(index)
+            self.assertEqual(indexes, sorted(set(indexes)))
+            return set(indexes)
+
+        for kind in ('recycling', 'salvaging'):
+            self.assertEqual(len(sets[kind]), len(names))
+        for material, name in enumerate(names):
+            selected = {}
+            for kind in ('recycling', 'salvaging'):
+                selected[kind] = decode(sets[kind][material])
+                scan = {index for index, row in enumerate(rows) if any(m['name'] == name for m in row[kind])}
+                self.assertEqual(selected[kind], scan, (name, kind))
+            either = {index for index, row in enumerate(rows)
+                      if any(m['name'] == name for kind in ('recycling', 'salvaging') for m in row[kind])}
+            self.assertEqual(selected['recycling'] | selected['salvaging'], either, name)
+
+    def test_small_dataset(self):
+        self.check({'categories': {
+            'Weapons': [item('Rifle', 'Weapons', [('Metal', 2), ('Metal', 1), ('Wires', 1)], [('Metal', 5)]),
+                        item('Pistol', 'Weapons', [('metal', 1)], [('Springs', 2)]),
+                        item('Rock', 'Weapons')],
+            'Tools': [item('Axe', 'Tools', salvaging=[('Metal', 1)]), item('Saw', 'Tools', [('Wires', None)])]
+        }})
+
+    def test_material_names(self):
+        generator = generator_for({'categories': {'A': [item('x', 'A', [('beta', 1), ('Alpha', 1)], [('alpha', 1)])]}})
+        self.assertEqual(generator.material_names(generator.build_rows()), ['Alpha', 'alpha', 'beta'])
+
+    def test_synthetic_dataset(self):
+        self.check(generate_dataset(400, materials=30, seed=8))
+
+
+class SortOrdersTest(unittest.TestCase):
+
+    def test_orders_are_stable_and_match_sorted(self):
+        generator = generator_for({'categories': {
+            'Weapons': [item('rifle', 'Weapons', [('Metal', 2)]),
+                        item('Pistol', 'Weapons', [('Metal', 1), ('Wires', 1)], [('Gears', 3)]),
+                        # An unknown quantity counts as 0 in the total
+                        item('Bow', 'Weapons', [('Wood', None)], [('Gears', 3)])],
+            'Tools': [item('Rifle', 'Tools', [('Metal', 2)]), item('axe', 'Tools'), item('Saw', 'Tools', [('Wires', 2)])]
+        }})
+        rows = generator.build_rows()
+        orders = generator.build_sort_orders(rows)
+
+        self.assertEqual(rows[2]['recyclingTotal'], 0)
+        indexes = range(len(rows))
+        self.assertEqual(orders['name'], sorted(indexes, key=lambda i: rows[i]['name'].lower()))
+        self.assertEqual(orders['recycling'], sorted(indexes, key=lambda i: rows[i]['recyclingTotal']))
+        self.assertEqual(orders['salvaging'], sorted(indexes, key=lambda i: rows[i]['salvagingTotal']))
+        # Ties stay in data order
+        self.assertEqual([rows[i]['name'] for i in orders['name']], ['axe', 'Bow', 'Pistol', 'rifle', 'Rifle', 'Saw'])
+        self.assertEqual([rows[i]['name'] for i in orders['recycling']],
+                         ['Bow', 'axe', 'rifle', 'Pistol', 'Rifle', 'Saw'])
+        self.assertEqual([rows[i]['name'] for i in orders['salvaging']],
+                         ['rifle', 'Rifle', 'axe', 'Saw', 'Pistol', 'Bow'])
+
+    def test_orders_are_permutations(self):
+        generator = generator_for(generate_dataset(500, seed=10))
+        rows = generator.build_rows()
+        for key, order in generator.build_sort_orders(rows).items():
+            self.assertEqual(sorted(order), list(range(len(rows))), key)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,182 @@
+"""
+Tests for the HTTP response cache and its revalidating transport adapter.
+"""
+import logging
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from http_cache import CachingHTTPAdapter, ResponseCache
+
+logging.disable(logging.INFO)
+
+
+def response(status=200, content=b'', headers=None):
+    result = requests.Response()
+    result.status_code = status
+    result._content = content
+    result.headers.update(headers or {})
+    result.encoding = 'utf-8'
+    return result
+
+
+class ResponseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+        self.directory = os.path.join(self.tempdir.name, 'cache')
+
+    def test_only_responses_with_validators_are_stored(self):
+        cache = ResponseCache(self.directory)
+        cache.store('u1', response(content=b'a'))
+        cache.store('u2', response(content=b'b', headers={'ETag': '"1"', 'Cache-Control': 'no-store'}))
+        cache.store('u3', response(content=b'c', headers={'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}))
+        self.assertEqual(len(cache), 1)
+        self.assertIsNone(cache.get('u1'))
+        self.assertEqual(cache.get('u3')['content'], b'c')
+        self.assertEqual(cache.conditional_headers('u3'),
+                         {'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'})
+        self.assertEqual(cache.conditional_headers('u1'), {})
+
+    def test_least_recently_used_is_evicted(self):
+        cache = ResponseCache(self.directory, max_bytes=10)
+        for url in ('a', 'b', 'c'):
+            cache.store(url, response(content=b'xxxx', headers={'ETag': url}))
+        # 'a' was evicted to fit 'c'; touching 'b' makes 'c' the next victim
+        self.assertIsNone(cache.get('a'))
+        self.assertIsNotNone(cache.get('b'))
+        cache.store('d', response(content=b'xxxx', headers={'ETag': 'd'}))
+        self.assertIsNone(cache.get('c'))
+        self.assertEqual(sorted(cache._entries), ['b', 'd'])
+        self.assertEqual(cache.total_bytes, 8)
+        bodies = [name for name in os.listdir(self.directory) if name.endswith('.body')]
+        self.assertEqual(len(bodies), 2)
+
+    def test_replacing_an_entry_updates_the_size(self):
+        cache = ResponseCache(self.directory)
+        cache.store('a', response(content=b'xxxx', headers={'ETag': '1'}))
+        cache.store('a', response(content=b'xx', headers={'ETag': '2'}))
+        self.assertEqual(cache.total_bytes, 2)
+        self.assertEqual(cache.conditional_headers('a'), {'If-None-Match': '2'})
+
+    def test_interleaved_stores_of_one_url_use_separate_temp_files(self):
+        # A second store of the same URL runs between the first one's write
+        # and its rename, as another fetch thread could
+        cache = ResponseCache(self.directory)
+        real_replace = os.replace
+        interleaved = []
+
+        def replace(src, dst):
+            if not interleaved:
+                interleaved.append(src)
+                cache.store('a', response(content=b'second', headers={'ETag': '2'}))
+            real_replace(src, dst)
+
+        with mock.patch('http_cache.os.replace', side_effect=replace):
+            cache.store('a', response(content=b'first', headers={'ETag': '1'}))
+
+        with open(cache._body_path('a'), 'rb') as f:
+            self.assertEqual(f.read(), b'first')
+        self.assertEqual(os.listdir(self.directory), [os.path.basename(cache._body_path('a'))])
+
+    def test_concurrent_stores_and_flushes(self):
+        cache = ResponseCache(self.directory)
+        errors = []
+
+        def work(n):
+            try:
+                for i in range(30):
+                    cache.store('shared', response(content=b'%d-%d' % (n, i), headers={'ETag': '%d' % i}))
+                    cache.flush()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=work, args=(n,)) for n in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertFalse([name for name in os.listdir(self.directory) if name.endswith('.tmp')])
+        self.assertEqual(len(ResponseCache(self.directory)), 1)
+
+    def test_failed_write_leaves_no_temp_file(self):
+        cache = ResponseCache(self.directory)
+        with mock.patch('http_cache.os.replace', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                cache.store('a', response(content=b'x', headers={'ETag': '1'}))
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_index_persists_and_shrinks_to_a_lower_limit(self):
+        cache = ResponseCache(self.directory)
+        for url in ('a', 'b', 'c'):
+            cache.store(url, response(content=b'xxxx', headers={'ETag': url}))
+        cache.get('a')
+        cache.flush()
+
+        reloaded = ResponseCache(self.directory, max_bytes=8)
+        self.assertEqual(list(reloaded._entries), ['c', 'a'])
+        self.assertEqual(reloaded.get('a')['content'], b'xxxx')
+
+    def test_missing_body_is_dropped(self):
+        cache = ResponseCache(self.directory)
+        cache.store('a', response(content=b'xxxx', headers={'ETag': '1'}))
+        os.remove(cache._body_path('a'))
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.total_bytes, 0)
+
+
+class CachingHTTPAdapterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+        self.cache = ResponseCache(self.tempdir.name)
+        self.adapter = CachingHTTPAdapter(self.cache)
+        self.sent = []
+
+    def send(self, *responses):
+        queue = list(responses)
+
+        def fake_send(adapter, request, **kwargs):
+            self.sent.append(dict(request.headers))
+            return queue.pop(0)
+
+        request = requests.Request('GET', 'https://example.com/wiki/Rifle').prepare()
+        with mock.patch.object(HTTPAdapter, 'send', fake_send):
+            return self.adapter.send(request)
+
+    def test_not_modified_is_served_from_cache(self):
+        self.send(response(content=b'page', headers={'ETag': '"v1"', 'Content-Type': 'text/html'}))
+        result = self.send(response(status=304))
+        self.assertEqual(self.sent[1].get('If-None-Match'), '"v1"')
+        self.assertEqual(result.status_code, 200)
+        self.assertEqual(result.content, b'page')
+        self.assertEqual(result.headers['Content-Type'], 'text/html')
+        self.assertTrue(result.from_cache)
+
+    def test_changed_page_replaces_the_entry(self):
+        self.send(response(content=b'old', headers={'ETag': '"v1"'}))
+        result = self.send(response(content=b'new', headers={'ETag': '"v2"'}))
+        self.assertFalse(getattr(result, 'from_cache', False))
+        self.assertEqual(self.cache.get('https://example.com/wiki/Rifle')['content'], b'new')
+
+    def test_entry_evicted_in_flight_is_fetched_in_full(self):
+        self.send(response(content=b'page', headers={'ETag': '"v1"'}))
+        with mock.patch.object(self.cache, 'get', return_value=None):
+            result = self.send(response(status=304), response(content=b'page2', headers={'ETag': '"v2"'}))
+        self.assertNotIn('If-None-Match', self.sent[2])
+        self.assertEqual(result.content, b'page2')
+        self.assertEqual(self.cache.conditional_headers('https://example.com/wiki/Rifle'),
+                         {'If-None-Match': '"v2"'})
+
+
+if __name__ == '__main__':
+    unittest.main()
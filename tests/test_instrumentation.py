@@ -0,0 +1,67 @@
+"""
+Tests for the run statistics written by --stats.
+"""
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from create_sample_data import generate_dataset
+from instrumentation import PipelineStats, stats_path
+
+logging.disable(logging.INFO)
+
+
+class StatsSidecarTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+        self.data_path = os.path.join(self.tempdir.name, 'data.json')
+        self.output = os.path.join(self.tempdir.name, 'tracker.html')
+        with open(self.data_path, 'w', encoding='utf-8') as f:
+            json.dump(generate_dataset(40, seed=2), f)
+
+    def run_main(self, *args):
+        argv = ['main.py', '--data', self.data_path, '--output', self.output] + list(args)
+        import main
+        with mock.patch.object(sys, 'argv', argv), mock.patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            main.main()
+        return stdout.getvalue()
+
+    def test_stats_path(self):
+        self.assertEqual(stats_path('output/recycling_tracker.html'), 'output/recycling_tracker.stats.json')
+
+    def test_generator_timings_are_saved_next_to_the_page(self):
+        printed = self.run_main('--stats')
+        with open(stats_path(self.output), encoding='utf-8') as f:
+            saved = json.load(f)
+
+        for name in ('load_data', 'generate.rows', 'generate.css', 'generate.checkboxes',
+                     'generate.table', 'generate.javascript', 'generate.write'):
+            with self.subTest(timer=name):
+                self.assertEqual(saved['timers'][name]['count'], 1)
+                self.assertIn(f"  {name}: 1 x", printed)
+        self.assertEqual(saved['requests'], {'count': 0, 'bytes': 0})
+
+    def test_no_sidecar_without_stats(self):
+        self.run_main()
+        self.assertTrue(os.path.exists(self.output))
+        self.assertFalse(os.path.exists(stats_path(self.output)))
+
+    def test_save_round_trips_summary(self):
+        stats = PipelineStats()
+        stats.record_request(0.2, 1024, status=200)
+        stats.add_time('parse', 0.01)
+        path = os.path.join(self.tempdir.name, 'run.stats.json')
+        stats.save(path)
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), stats.to_dict())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,220 @@
+"""
+Tests for the scrape journal and resuming an interrupted scrape.
+"""
+import copy
+import json
+import logging
+import os
+import sys
+import tempfile
+import unittest
+from concurrent.futures import Future
+from unittest import mock
+
+from create_sample_data import generate_dataset, generate_wiki_pages
+from journal import ScrapeJournal, journal_path
+from scraper import WikiScraper
+from tests.fake_wiki import FakeWikiSession
+from wiki_fixtures import StubWikiServer
+
+logging.disable(logging.INFO)
+
+
+def record(url, **fields):
+    return dict({'name': url, 'category': 'Loot', 'url': url, 'recycling': [], 'salvaging': []}, **fields)
+
+
+class ScrapeJournalTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+        self.path = os.path.join(self.tempdir.name, 'data.journal.jsonl')
+
+    def write_lines(self, *lines):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(''.join(lines))
+
+    def read_lines(self):
+        with open(self.path, encoding='utf-8') as f:
+            return f.read().splitlines()
+
+    def test_journal_path(self):
+        self.assertEqual(journal_path(os.path.join('out', 'recycling_data.json')),
+                         os.path.join('out', 'recycling_data.journal.jsonl'))
+
+    def test_truncated_last_line_is_skipped_and_rewritten(self):
+        full = json.dumps(record('u1')) + '\n' + json.dumps(record('u2')) + '\n'
+        self.write_lines(full, json.dumps(record('u3'))[:25])
+
+        with self.assertLogs('journal', logging.WARNING):
+            journal = ScrapeJournal(self.path, resume=True)
+        self.assertEqual(list(journal.completed), ['u1', 'u2'])
+        # The cut-off line is gone, so the next record starts on its own line
+        self.assertEqual(len(self.read_lines()), 2)
+        journal.record(record('u3'))
+        journal.close()
+
+        self.assertEqual(list(ScrapeJournal(self.path, resume=True).completed), ['u1', 'u2', 'u3'])
+
+    def test_later_records_win(self):
+        self.write_lines(json.dumps(record('u1', revision_id=1)) + '\n',
+                         json.dumps(record('u1', revision_id=2)) + '\n')
+        journal = ScrapeJournal(self.path, resume=True)
+        self.assertEqual(journal.completed['u1']['revision_id'], 2)
+        self.assertEqual(len(self.read_lines()), 1)
+        journal.close()
+
+    def test_records_are_written_immediately(self):
+        journal = ScrapeJournal(self.path)
+        journal.record(record('u1'))
+        self.assertEqual([json.loads(line)['url'] for line in self.read_lines()], ['u1'])
+        journal.close()
+
+    def test_without_resume_existing_journal_is_discarded(self):
+        self.write_lines(json.dumps(record('u1')) + '\n')
+        journal = ScrapeJournal(self.path)
+        self.assertEqual(journal.completed, {})
+        self.assertEqual(self.read_lines(), [])
+        journal.discard()
+        self.assertFalse(os.path.exists(self.path))
+
+
+class ResumeScrapeTest(unittest.TestCase):
+    """Interrupt scrape_loot part way through and resume it from the journal."""
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+        self.path = os.path.join(self.tempdir.name, 'data.journal.jsonl')
+        self.data = generate_dataset(8, categories=1, seed=11)
+        self.items = self.data['categories']['Category 1']
+        for revision_id, item in enumerate(self.items, 1):
+            item['revision_id'] = revision_id
+        self.paths = ['/wiki/' + item['url'].rsplit('/wiki/', 1)[1] for item in self.items]
+
+    def scraper(self, **session_kwargs):
+        scraper = WikiScraper(rate_limit=0)
+        scraper.session = FakeWikiSession(generate_wiki_pages(self.data), **session_kwargs)
+        return scraper
+
+    def interrupted_scrape(self, previous=None):
+        """Scrape until the fifth item page is requested; four items are journalled."""
+        journal = ScrapeJournal(self.path)
+        scraper = self.scraper(interrupt_on=self.paths[4])
+        with self.assertRaises(KeyboardInterrupt):
+            scraper.scrape_loot(previous=previous, journal=journal)
+        journal.close()
+
+    def revision_lookups(self, scraper):
+        return [key for key in scraper.session.requested if 'action=query' in key]
+
+    def test_resume_fetches_only_the_remaining_items(self):
+        expected = self.scraper().scrape_loot()['categories']['Loot']
+        self.interrupted_scrape()
+
+        journal = ScrapeJournal(self.path, resume=True)
+        self.assertEqual(len(journal.completed), 4)
+        scraper = self.scraper()
+        result = scraper.scrape_loot(journal=journal)
+        journal.close()
+
+        self.assertEqual(scraper.session.item_pages_requested(), self.paths[4:])
+        # A plain scrape journals no revision IDs, so there is nothing to look up
+        self.assertEqual(self.revision_lookups(scraper), [])
+        self.assertEqual(result['metadata']['resumed_items'], 4)
+        self.assertEqual(result['categories']['Loot'], expected)
+        self.assertEqual(len(ScrapeJournal(self.path, resume=True).completed), 8)
+
+    def test_item_edited_since_it_was_journalled_is_fetched_again(self):
+        # An interrupted incremental scrape, every page edited since `previous`
+        previous = copy.deepcopy(self.data)
+        for item in previous['categories']['Category 1']:
+            item['revision_id'] = 0
+        self.interrupted_scrape(previous=previous)
+        self.items[1]['revision_id'] = 50
+        self.items[1]['recycling'] = [{'name': 'Edited', 'quantity': 1}]
+
+        journal = ScrapeJournal(self.path, resume=True)
+        scraper = self.scraper()
+        result = scraper.scrape_loot(journal=journal)
+        journal.close()
+
+        self.assertEqual(scraper.session.item_pages_requested(), [self.paths[1]] + self.paths[4:])
+        self.assertEqual(len(self.revision_lookups(scraper)), 1)
+        item = result['categories']['Loot'][1]
+        self.assertEqual((item['revision_id'], item['recycling']), (50, [{'name': 'Edited', 'quantity': 1}]))
+
+    def test_parse_pool_callback_ignores_cancelled_and_failed_parses(self):
+        scraper = WikiScraper(rate_limit=0)
+        scraper.journal = mock.Mock()
+        cancelled = Future()
+        cancelled.cancel()
+        failed = Future()
+        failed.set_exception(ValueError('bad page'))
+        parsed = Future()
+        parsed.set_result(({'url': 'u1'}, 0.01))
+
+        for future in (cancelled, failed, parsed):
+            scraper._journal_parsed_item(future)
+        scraper.journal.record.assert_called_once_with({'url': 'u1'})
+
+
+class ScrapeCommandTest(unittest.TestCase):
+    """main.py --resume and --incremental against the stub server."""
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+        self.data_path = os.path.join(self.tempdir.name, 'data.json')
+        self.output = os.path.join(self.tempdir.name, 'tracker.html')
+        self.data = generate_dataset(6, categories=1, seed=12)
+        self.server = StubWikiServer(generate_wiki_pages(self.data)).start()
+        self.addCleanup(self.server.stop)
+
+    def run_main(self, *args):
+        argv = ['main.py', '--base-url', self.server.base_url, '--burst', '100',
+                '--data', self.data_path, '--output', self.output] + list(args)
+        import main
+        with mock.patch.object(sys, 'argv', argv):
+            main.main()
+
+    def test_resume_reuses_journal_and_discards_it_after_saving(self):
+        # A full scrape's journal, with two items recorded and a third cut off
+        self.run_main('--scrape')
+        with open(self.data_path, encoding='utf-8') as f:
+            full = json.load(f)['categories']['Loot']
+        path = journal_path(self.data_path)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(full[0]) + '\n' + json.dumps(full[1]) + '\n' + json.dumps(full[2])[:30])
+        os.remove(self.data_path)
+
+        before = self.server.request_count
+        self.run_main('--resume')
+        # Loot page and the four items not journalled; the journal of a plain
+        # scrape has no revision IDs to check, so there is no revision lookup
+        self.assertEqual(self.server.request_count - before, 5)
+        self.assertFalse(os.path.exists(path))
+        with open(self.data_path, encoding='utf-8') as f:
+            saved = json.load(f)
+        self.assertEqual(saved['categories']['Loot'], full)
+        self.assertEqual(saved['metadata']['resumed_items'], 2)
+        self.assertTrue(os.path.exists(self.output))
+
+    def test_incremental_implies_scrape(self):
+        self.run_main('--scrape')
+        before = self.server.request_count
+        self.run_main('--incremental')
+        # A plain scrape records no revision IDs, so the first incremental run
+        # looks them up and fetches every item once
+        self.assertEqual(self.server.request_count - before, 8)
+
+        before = self.server.request_count
+        self.run_main('--incremental')
+        self.assertEqual(self.server.request_count - before, 2)
+        with open(self.data_path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f)['metadata']['unchanged_items'], 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
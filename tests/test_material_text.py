@@ -0,0 +1,53 @@
+"""
+Tests for material_text.parse_material_text.
+
+The single-regex parser must agree with the scraper's original
+first-matching-pattern implementation on any text.
+"""
+import unittest
+
+from hypothesis import given, settings, strategies as st
+
+from material_text import parse_material_text
+from tests.reference import MATERIAL_NAMES, legacy_parse_material_text
+
+# Text built from the characters the patterns care about, plus noise, so
+# hypothesis spends its time near the interesting boundaries.
+_fragment_alphabet = st.sampled_from(list('0123456789xX:()- \n\t×abAB.,²٣'))
+fragments = st.one_of(
+    st.text(alphabet=_fragment_alphabet, max_size=20),
+    st.text(max_size=20),
+    st.builds(
+        lambda name, qty, sep, swap: f"{qty}{sep}{name}" if swap else f"{name}{sep}{qty}",
+        st.sampled_from(MATERIAL_NAMES),
+        st.integers(min_value=0, max_value=10 ** 6),
+        st.sampled_from([': ', ':', ' (', ' x', 'x', ' X ', ' - ', '-', ' × ', ' ']),
+        st.booleans()
+    ),
+    st.lists(st.text(alphabet=_fragment_alphabet, max_size=6), max_size=6).map(''.join),
+)
+
+
+class ParseMaterialTextTest(unittest.TestCase):
+
+    @settings(max_examples=2000, deadline=None)
+    @given(fragments)
+    def test_matches_legacy_parser(self, text):
+        self.assertEqual(parse_material_text(text), legacy_parse_material_text(text))
+
+    def test_formats(self):
+        cases = {
+            'Metal Parts: 5': ('Metal Parts', 5),
+            'Metal Parts (5)': ('Metal Parts', 5),
+            'Metal Parts x5': ('Metal Parts', 5),
+            '5x Metal Parts': ('Metal Parts', 5),
+            'Metal Parts - 5': ('Metal Parts', 5),
+            'Recycles into': (None, None),
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(parse_material_text(text), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+Tests for the pipeline profiler's per-stage wrappers.
+"""
+import cProfile
+import logging
+import os
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from profiling import PipelineProfiler, collapsed_path
+
+logging.disable(logging.INFO)
+
+
+class Stage:
+    def work(self, value):
+        time.sleep(0.01)
+        return value * 2
+
+
+class StageProfilingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+        self.path = os.path.join(self.tempdir.name, 'parse.prof')
+
+    def run_concurrently(self, profiler, stage, workers=4, calls=16):
+        profiler.instrument('parse', stage, 'work')
+        with profiler:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(stage.work, range(calls)))
+
+    def test_concurrent_calls_profile_one_thread_at_a_time(self):
+        enabled = []
+        real_enable = cProfile.Profile.enable
+
+        def enable(profile):
+            # Python 3.12+ refuses a second active profiler
+            if enabled:
+                raise ValueError('Another profiling tool is already active')
+            enabled.append(threading.get_ident())
+            real_enable(profile)
+
+        real_disable = cProfile.Profile.disable
+
+        def disable(profile):
+            real_disable(profile)
+            enabled.clear()
+
+        profiler = PipelineProfiler(self.path, stage='parse', interval=0.001)
+        with mock.patch.object(cProfile.Profile, 'enable', enable), \
+                mock.patch.object(cProfile.Profile, 'disable', disable):
+            results = self.run_concurrently(profiler, Stage())
+
+        self.assertEqual(results, [value * 2 for value in range(16)])
+        self.assertFalse(profiler._profile_failed)
+        self.assertEqual(profiler._active, {})
+        self.assertIsNone(profiler._owner)
+        self.assertTrue(os.path.exists(self.path))
+        self.assertTrue(os.path.exists(collapsed_path(self.path)))
+
+    def test_unavailable_cprofile_never_fails_the_stage(self):
+        profiler = PipelineProfiler(self.path, stage='parse', interval=0.001)
+        with mock.patch.object(cProfile.Profile, 'enable',
+                               side_effect=ValueError('Another profiling tool is already active')):
+            with self.assertLogs('profiling', level='WARNING'):
+                results = self.run_concurrently(profiler, Stage())
+
+        self.assertEqual(results, [value * 2 for value in range(16)])
+        self.assertTrue(profiler._profile_failed)
+        self.assertEqual(profiler._active, {})
+        self.assertFalse(os.path.exists(self.path))
+        self.assertTrue(os.path.exists(collapsed_path(self.path)))
+
+    def test_nested_calls_restore_depth(self):
+        profiler = PipelineProfiler(self.path, stage='parse', interval=0.001)
+        stage = Stage()
+        profiler.instrument('parse', stage, 'work')
+        outer = profiler.wrap(lambda: stage.work(3))
+        with profiler:
+            self.assertEqual(outer(), 6)
+        self.assertEqual(profiler._local.depth, 0)
+        self.assertIsNone(profiler._owner)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Tests for the in-memory query indexes.
+"""
+import json
+import logging
+import os
+import tempfile
+import unittest
+
+from create_sample_data import generate_dataset
+from query import RecyclingQuery
+
+logging.disable(logging.INFO)
+
+
+def item(name, category, recycling=(), salvaging=()):
+    return {'name': name, 'category': category, 'url': f'https://example.com/{name}',
+            'recycling': [{'name': m, 'quantity': q} for m, q in recycling],
+            'salvaging': [{'name': m, 'quantity': q} for m, q in salvaging]}
+
+
+class RecyclingQueryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.query = RecyclingQuery({'categories': {
+            'Weapons': [item('Rifle', 'Weapons', [('Metal Parts', 2)], [('Metal Parts', 5)]),
+                        item('Pistol', 'Weapons', [('Metal Parts', 2), ('Springs', None)])],
+            'Tools': [item('Axe', 'Tools', [('Metal Parts', 2), ('Wood', 1)])]
+        }, 'metadata': {}})
+
+    def test_items_yielding_order(self):
+        sources = self.query.items_yielding('Metal Parts')
+        self.assertEqual([(s['name'], s['kind'], s['quantity']) for s in sources],
+                         [('Rifle', 'salvaging', 5), ('Axe', 'recycling', 2),
+                          ('Pistol', 'recycling', 2), ('Rifle', 'recycling', 2)])
+        self.assertEqual(sources[0], {'name': 'Rifle', 'url': 'https://example.com/Rifle', 'category': 'Weapons',
+                                      'kind': 'salvaging', 'quantity': 5})
+
+    def test_kind_filter_and_unknown_kind(self):
+        self.assertEqual([s['name'] for s in self.query.items_yielding('Metal Parts', kind='salvaging')], ['Rifle'])
+        with self.assertRaises(ValueError):
+            self.query.items_yielding('Metal Parts', kind='melting')
+
+    def test_names_are_case_insensitive(self):
+        self.assertEqual(len(self.query.items_yielding('metal PARTS')), 4)
+        self.assertEqual(self.query.item('pistol')['name'], 'Pistol')
+        self.assertIsNone(self.query.item('Shotgun'))
+        self.assertEqual(self.query.items_yielding('Gold'), [])
+
+    def test_top_sources(self):
+        self.assertEqual([s['name'] for s in self.query.top_sources('Metal Parts', 2)], ['Rifle', 'Axe'])
+        self.assertEqual(self.query.top_sources('Metal Parts', 0), [])
+        self.assertEqual(len(self.query.top_sources('Metal Parts', 10)), 4)
+        with self.assertRaises(ValueError):
+            self.query.top_sources('Metal Parts', -1)
+
+    def test_unknown_quantity_counts_as_zero(self):
+        self.assertEqual(self.query.items_yielding('Springs')[0]['quantity'], 0)
+        self.assertEqual(self.query.total_yield('Metal Parts'), 11)
+        self.assertEqual(self.query.total_yield('Metal Parts', kind='recycling'), 6)
+
+    def test_categories_and_materials(self):
+        self.assertEqual(self.query.categories(), ['Weapons', 'Tools'])
+        self.assertEqual([i['name'] for i in self.query.items_in_category('Weapons')], ['Rifle', 'Pistol'])
+        self.assertEqual(self.query.items_in_category('Shields'), [])
+        self.assertEqual(self.query.materials(), ['Metal Parts', 'Springs', 'Wood'])
+
+    def test_returned_lists_are_copies(self):
+        self.query.items_yielding('Metal Parts').clear()
+        self.query.items_in_category('Tools').clear()
+        self.assertEqual(len(self.query.items_yielding('Metal Parts')), 4)
+        self.assertEqual(len(self.query.items_in_category('Tools')), 1)
+
+    def test_v1_file(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            path = os.path.join(tempdir, 'data.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'categories': {'Loot': [{
+                    'name': 'Rifle', 'url': 'u',
+                    'materials': [{'name': 'Metal', 'quantity': 3}, {'name': '(Salvage) Metal', 'quantity': 1}]
+                }]}}, f)
+            query = RecyclingQuery.from_file(path)
+        self.assertEqual([(s['kind'], s['quantity']) for s in query.items_yielding('Metal')],
+                         [('recycling', 3), ('salvaging', 1)])
+
+    def test_matches_a_scan(self):
+        data = generate_dataset(150, seed=7)
+        query = RecyclingQuery(data)
+        material = query.materials()[0]
+        expected = sorted(((m['quantity'] or 0, i['name'], kind)
+                           for items in data['categories'].values() for i in items
+                           for kind in ('recycling', 'salvaging') for m in i.get(kind, [])
+                           if m['name'].casefold() == material.casefold()),
+                          key=lambda entry: (-entry[0], entry[1]))
+        self.assertEqual([(s['quantity'], s['name'], s['kind']) for s in query.items_yielding(material)],
+                         expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Tests for the token-bucket rate limiter.
+"""
+import asyncio
+import logging
+import unittest
+from unittest import mock
+
+import ratelimit
+from ratelimit import TokenBucket, parse_retry_after
+
+logging.disable(logging.INFO)
+
+
+class FakeClock:
+    """Stands in for time.monotonic and time.sleep; sleeping advances the clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+        self.on_sleep = None
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        if self.on_sleep is not None:
+            callback, self.on_sleep = self.on_sleep, None
+            callback()
+        self.now += seconds
+
+    async def async_sleep(self, seconds):
+        self.sleep(seconds)
+
+
+class TokenBucketTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.multiple(ratelimit.time, monotonic=self.clock.monotonic, sleep=self.clock.sleep)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=1, burst=0)
+
+    def test_unlimited_never_waits(self):
+        bucket = TokenBucket(rate=None)
+        self.assertEqual([bucket.acquire() for _ in range(5)], [0.0] * 5)
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_burst_then_refill_rate(self):
+        bucket = TokenBucket(rate=2.0, burst=3)
+        self.assertEqual([bucket.acquire() for _ in range(3)], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(bucket.acquire(), 0.5)
+        self.assertAlmostEqual(bucket.acquire(), 0.5)
+
+    def test_waiters_reserve_consecutive_slots(self):
+        bucket = TokenBucket(rate=1.0, burst=1)
+        waits = [bucket._reserve()[0] for _ in range(3)]
+        self.assertEqual(waits, [0.0, 1.0, 2.0])
+
+    def test_defer_pauses_and_restarts_empty(self):
+        bucket = TokenBucket(rate=1.0, burst=5)
+        bucket.defer(10)
+        self.assertAlmostEqual(bucket.acquire(), 11.0)
+        self.assertAlmostEqual(bucket.acquire(), 1.0)
+
+    def test_defer_pushes_back_a_request_already_waiting(self):
+        bucket = TokenBucket(rate=1.0, burst=1)
+        bucket.acquire()
+        # Another thread gets a Retry-After while this one sleeps for its slot
+        self.clock.on_sleep = lambda: bucket.defer(30)
+        start = self.clock.now
+        waited = bucket.acquire()
+        self.assertGreaterEqual(self.clock.now - start, 30.0)
+        self.assertAlmostEqual(waited, self.clock.now - start)
+        self.assertEqual(len(self.clock.sleeps), 2)
+
+    def test_deferred_waiters_keep_their_spacing(self):
+        bucket = TokenBucket(rate=1.0, burst=1)
+        bucket.acquire()
+        first, first_mark = bucket._reserve()
+        second, second_mark = bucket._reserve()
+        bucket.defer(30)
+        first += bucket._pushed_back(first_mark)[0]
+        second += bucket._pushed_back(second_mark)[0]
+        self.assertGreaterEqual(first, 30.0)
+        self.assertAlmostEqual(second - first, 1.0)
+        # A new request queues behind both
+        self.assertAlmostEqual(bucket._reserve()[0], second + 1.0)
+
+    def test_async_acquire_rechecks_after_defer(self):
+        bucket = TokenBucket(rate=1.0, burst=1)
+        bucket.acquire()
+        self.clock.on_sleep = lambda: bucket.defer(30)
+        start = self.clock.now
+        with mock.patch.object(ratelimit.asyncio, 'sleep', self.clock.async_sleep):
+            waited = asyncio.run(bucket.acquire_async())
+        self.assertGreaterEqual(waited, 30.0)
+        self.assertAlmostEqual(waited, self.clock.now - start)
+
+
+class ParseRetryAfterTest(unittest.TestCase):
+
+    def test_values(self):
+        self.assertEqual(parse_retry_after('120'), 120.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after('soon'))
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
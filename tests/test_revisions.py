@@ -0,0 +1,114 @@
+"""
+Tests for resolving item pages to their latest revisions through the
+MediaWiki API (formatversion=2 responses).
+"""
+import json
+import logging
+import unittest
+from unittest import mock
+
+from scraper import WikiScraper
+from tests.fake_wiki import FakeWikiSession
+
+logging.disable(logging.INFO)
+
+
+def page(title, page_id, revision_id):
+    return {'pageid': page_id, 'ns': 0, 'title': title, 'revisions': [{'revid': revision_id, 'parentid': 1}]}
+
+
+def query_response(pages, normalized=(), redirects=()):
+    query = {'pages': list(pages)}
+    if normalized:
+        query['normalized'] = [{'fromencoded': False, 'from': source, 'to': target} for source, target in normalized]
+    if redirects:
+        query['redirects'] = [{'from': source, 'to': target} for source, target in redirects]
+    return {'batchcomplete': True, 'query': query}
+
+
+class QueryPageRevisionsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.scraper = WikiScraper(rate_limit=0)
+
+    def test_titles_are_sent_in_batches_of_50(self):
+        titles = [f'Item {n}' for n in range(120)]
+        calls = []
+
+        def api_get(params):
+            calls.append(params)
+            return query_response(page(title, n, 1000 + n) for n, title in enumerate(params['titles'].split('|')))
+
+        with mock.patch.object(self.scraper, '_api_get', side_effect=api_get):
+            resolved = self.scraper.query_page_revisions(titles)
+
+        self.assertEqual([len(call['titles'].split('|')) for call in calls], [50, 50, 20])
+        self.assertEqual('|'.join(call['titles'] for call in calls), '|'.join(titles))
+        self.assertEqual({call['action'] for call in calls}, {'query'})
+        self.assertEqual(list(resolved), titles)
+        self.assertEqual(resolved['Item 70'], {'title': 'Item 70', 'page_id': 20, 'revision_id': 1020})
+
+    def test_normalized_titles_and_redirects_map_back_to_the_request(self):
+        response = query_response(
+            [page('Metal Parts', 12, 345), page('Wires', 13, 346), page('Rubber', 14, 347)],
+            normalized=[('metal_parts', 'Metal parts'), ('wires', 'Wires')],
+            redirects=[('Metal parts', 'Metal Parts'), ('Old Rubber', 'Rubber')]
+        )
+        with mock.patch.object(self.scraper, '_api_get', return_value=response):
+            resolved = self.scraper.query_page_revisions(['metal_parts', 'wires', 'Old Rubber', 'Rubber'])
+
+        self.assertEqual({title: info['revision_id'] for title, info in resolved.items()},
+                         {'metal_parts': 345, 'wires': 346, 'Old Rubber': 347, 'Rubber': 347})
+        self.assertEqual(resolved['metal_parts']['title'], 'Metal Parts')
+
+    def test_missing_and_invalid_pages_are_left_out(self):
+        response = query_response(
+            [page('Rifle', 1, 10),
+             {'ns': 0, 'title': 'Gone', 'missing': True},
+             {'title': 'Bad|', 'invalidreason': 'illegal character', 'invalid': True},
+             # A redirect to a missing page
+             {'ns': 0, 'title': 'Nowhere', 'missing': True}],
+            redirects=[('Lost', 'Nowhere')]
+        )
+        with mock.patch.object(self.scraper, '_api_get', return_value=response):
+            resolved = self.scraper.query_page_revisions(['Rifle', 'Gone', 'Bad|', 'Lost'])
+        self.assertEqual(list(resolved), ['Rifle'])
+
+    def test_redirect_loop_does_not_hang(self):
+        response = query_response([], redirects=[('A', 'B'), ('B', 'A')])
+        with mock.patch.object(self.scraper, '_api_get', return_value=response):
+            self.assertEqual(self.scraper.query_page_revisions(['A']), {})
+
+    def test_api_error_is_raised(self):
+        key = '/api.php?action=query&format=json&formatversion=2&prop=revisions&redirects=1&rvprop=ids&titles=Rifle'
+        body = json.dumps({'error': {'code': 'badvalue', 'info': 'Unrecognized value'}})
+        self.scraper.session = FakeWikiSession({key: {'body': body, 'content_type': 'application/json'}})
+        with self.assertRaisesRegex(ValueError, 'badvalue'):
+            self.scraper.query_page_revisions(['Rifle'])
+
+
+class ResolveItemRevisionsTest(unittest.TestCase):
+
+    def test_items_are_annotated_through_the_api(self):
+        scraper = WikiScraper(base_url='https://wiki.example', rate_limit=0)
+        body = json.dumps(query_response(
+            [page('Café Rifle', 7, 70), page('Heavy Shield', 8, 80)],
+            redirects=[('Shield (Heavy)', 'Heavy Shield')]
+        ))
+        key = ('/api.php?action=query&format=json&formatversion=2&prop=revisions&redirects=1&rvprop=ids'
+               '&titles=Caf%C3%A9+Rifle%7CShield+%28Heavy%29%7CMissing+Item')
+        scraper.session = FakeWikiSession({key: {'body': body, 'content_type': 'application/json'}})
+        infos = [{'name': 'Café Rifle', 'url': 'https://wiki.example/wiki/Caf%C3%A9_Rifle'},
+                 {'name': 'Shield', 'url': 'https://wiki.example/wiki/Shield_(Heavy)'},
+                 {'name': 'Shield again', 'url': 'https://wiki.example/wiki/Shield_(Heavy)'},
+                 {'name': 'Missing', 'url': 'https://wiki.example/wiki/Missing_Item'}]
+
+        scraper._resolve_item_revisions(infos)
+
+        self.assertEqual(scraper.session.requested, [key])
+        self.assertEqual([(info.get('page_id'), info.get('revision_id')) for info in infos],
+                         [(7, 70), (8, 80), (8, 80), (None, None)])
+
+
+if __name__ == '__main__':
+    unittest.main()
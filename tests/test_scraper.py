@@ -0,0 +1,189 @@
+"""
+Tests for the wiki scraper's item fetching.
+"""
+import glob
+import logging
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+
+from create_sample_data import generate_dataset, generate_wiki_pages
+from scraper import HAS_LXML, Item, Material, WikiScraper
+from tests.fake_wiki import FakeWikiSession
+from tests.reference import legacy_build_loot_item
+
+logging.disable(logging.INFO)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def fixture_item_pages() -> dict:
+    """Hand-written item pages from tests/fixtures plus synthetic ones, by name."""
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, 'item_pages', '*.html'))):
+        with open(path, encoding='utf-8') as f:
+            pages[os.path.basename(path)] = f.read()
+    responses = generate_wiki_pages(generate_dataset(20, seed=3))
+    for key, entry in responses.items():
+        if key.startswith('/wiki/') and key != '/wiki/Loot':
+            pages[key] = entry['body']
+    return pages
+
+
+class MapFetchTest(unittest.TestCase):
+
+    def test_interrupt_cancels_queued_fetches(self):
+        scraper = WikiScraper(rate_limit=0, max_workers=2)
+        calls = []
+        lock = threading.Lock()
+
+        def fetch(item_info):
+            with lock:
+                calls.append(item_info)
+            if item_info == 0:
+                raise KeyboardInterrupt
+            time.sleep(0.05)
+            return item_info
+
+        start = time.monotonic()
+        with self.assertRaises(KeyboardInterrupt):
+            scraper._map_fetch(fetch, list(range(200)))
+        self.assertLess(len(calls), 10)
+        self.assertLess(time.monotonic() - start, 2.0)
+
+    def test_results_keep_item_order(self):
+        scraper = WikiScraper(rate_limit=0, max_workers=3)
+        self.assertEqual(scraper._map_fetch(lambda n: n * 2, list(range(20))), [n * 2 for n in range(20)])
+
+
+class SectionExtractionTest(unittest.TestCase):
+    """
+    The single-walk section index and the content-only parse must give the
+    same items as the original whole-document heading walk, with either
+    parser backend.
+    """
+
+    def test_matches_legacy_extraction(self):
+        parsers = ['html.parser'] + (['lxml'] if HAS_LXML else [])
+        legacy_scraper = WikiScraper(rate_limit=0, parser='html.parser')
+        for name, html in fixture_item_pages().items():
+            item_info = {'name': name, 'category': 'Loot', 'url': 'https://arcraiders.wiki/wiki/' + name}
+            expected = legacy_build_loot_item(legacy_scraper, item_info, html).to_dict()
+            for parser in parsers:
+                with self.subTest(page=name, parser=parser):
+                    scraper = WikiScraper(rate_limit=0, parser=parser)
+                    self.assertEqual(scraper._build_loot_item(item_info, html).to_dict(), expected)
+
+    def test_fixture_pages_have_materials(self):
+        # Guards the comparison above against pages that extract nothing
+        scraper = WikiScraper(rate_limit=0, parser='html.parser')
+        pages = fixture_item_pages()
+        for name in ('results_table.html', 'separate_lists.html', 'nested_sections.html',
+                     'no_content_container.html'):
+            with self.subTest(page=name):
+                item = scraper._build_loot_item({'name': name, 'category': 'Loot', 'url': ''}, pages[name])
+                self.assertTrue(item.recycling)
+                self.assertTrue(item.salvaging)
+
+    @unittest.skipUnless(HAS_LXML, 'lxml is not installed')
+    def test_strainer_skips_navigation_and_footer(self):
+        html = fixture_item_pages()['results_table.html']
+        for parser in ('html.parser', 'lxml'):
+            with self.subTest(parser=parser):
+                soup = WikiScraper(rate_limit=0, parser=parser)._make_soup(html)
+                self.assertIsNone(soup.find(id='mw-navigation'))
+                self.assertIsNone(soup.find(id='footer'))
+                self.assertIsNotNone(soup.find('table', class_='wikitable'))
+
+
+class ParseWorkersTest(unittest.TestCase):
+    """Parsing in worker processes gives the same items as parsing in-thread."""
+
+    @classmethod
+    def setUpClass(cls):
+        # Synthetic pages, with some bodies swapped for the hand-written ones
+        cls.responses = generate_wiki_pages(generate_dataset(16, seed=8))
+        item_paths = sorted(key for key in cls.responses if key.startswith('/wiki/') and key != '/wiki/Loot')
+        for path, (name, html) in zip(item_paths[::3], fixture_item_pages().items()):
+            if name.endswith('.html'):
+                cls.responses[path] = dict(cls.responses[path], body=html)
+
+    def scrape(self, **kwargs):
+        scraper = WikiScraper(rate_limit=0, **kwargs)
+        scraper.session = FakeWikiSession(self.responses)
+        return scraper.scrape_loot()
+
+    def items(self, result):
+        self.assertEqual(result['metadata']['failed_items'], 0)
+        return result['categories']['Loot']
+
+    def test_matches_in_thread_parsing(self):
+        expected = self.items(self.scrape())
+        self.assertEqual(len(expected), 16)
+        for kwargs in ({'parse_workers': 2}, {'parse_workers': 2, 'max_workers': 3},
+                       {'parse_workers': 2, 'parser': 'html.parser'}):
+            with self.subTest(**kwargs):
+                self.assertEqual(self.items(self.scrape(**kwargs)), expected)
+
+    def test_parse_time_is_accounted_in_the_parent(self):
+        result = self.scrape(parse_workers=2)
+        self.assertEqual(result['metadata']['stats']['timers']['parse']['count'], 16)
+
+
+class IncrementalScrapeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.scraper = WikiScraper(rate_limit=0)
+        self.infos = [
+            {'name': 'Rifle', 'category': 'Loot', 'url': 'https://arcraiders.wiki/wiki/Rifle', 'revision_id': 2},
+            {'name': 'Pistol', 'category': 'Loot', 'url': 'https://arcraiders.wiki/wiki/Pistol', 'revision_id': 9},
+            {'name': 'Bow', 'category': 'Loot', 'url': 'https://arcraiders.wiki/wiki/Bow', 'revision_id': 1}
+        ]
+        self.previous = {'categories': {'Loot': [
+            {'name': 'Rifle', 'category': 'Loot', 'url': 'https://arcraiders.wiki/wiki/Rifle', 'revision_id': 2,
+             'recycling': [{'name': 'Metal', 'quantity': 1}], 'salvaging': []},
+            {'name': 'Pistol', 'category': 'Loot', 'url': 'https://arcraiders.wiki/wiki/Pistol', 'revision_id': 8,
+             'recycling': [{'name': 'Springs', 'quantity': 3}], 'salvaging': []}
+        ]}}
+
+    def scrape(self, scrape_items):
+        with mock.patch.object(self.scraper, '_get'), \
+                mock.patch.object(self.scraper, '_extract_loot_links', return_value=self.infos), \
+                mock.patch.object(self.scraper, '_resolve_item_revisions'), \
+                mock.patch.object(self.scraper, '_scrape_loot_items', side_effect=scrape_items):
+            return self.scraper.scrape_loot(previous=self.previous)
+
+    def test_failed_refetch_keeps_previous_item(self):
+        def scrape_items(infos):
+            self.assertEqual([info['name'] for info in infos], ['Pistol', 'Bow'])
+            for info in infos:
+                self.scraper.failed_items.append({'name': info['name'], 'url': info['url'], 'error': 'timeout'})
+            return [None, None]
+
+        with self.assertLogs('scraper', logging.WARNING) as logs:
+            result = self.scrape(scrape_items)
+        items = result['categories']['Loot']
+        self.assertEqual([item['name'] for item in items], ['Rifle', 'Pistol'])
+        # The old revision is kept so the next incremental run retries it
+        self.assertEqual(items[1]['revision_id'], 8)
+        self.assertEqual(items[1]['recycling'], [{'name': 'Springs', 'quantity': 3}])
+        self.assertEqual([failed['name'] for failed in self.scraper.failed_items], ['Pistol', 'Bow'])
+        self.assertEqual(result['metadata']['stale_items'], 1)
+        self.assertTrue(any('stale' in line and 'Pistol' in line for line in logs.output))
+
+    def test_successful_refetch_replaces_previous_item(self):
+        def scrape_items(infos):
+            return [Item(name=info['name'], category='Loot', url=info['url'], revision_id=info['revision_id'],
+                         recycling=[Material(name='Gears', quantity=2)]) for info in infos]
+
+        result = self.scrape(scrape_items)
+        items = result['categories']['Loot']
+        self.assertEqual([item['name'] for item in items], ['Rifle', 'Pistol', 'Bow'])
+        self.assertEqual(items[1]['revision_id'], 9)
+        self.assertEqual(result['metadata']['stale_items'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
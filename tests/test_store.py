@@ -0,0 +1,181 @@
+"""
+Tests for the SQLite data store.
+"""
+import copy
+import logging
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from create_sample_data import generate_dataset
+from data_schema import upgrade_data
+from store import SQLiteStore, is_store_path
+
+logging.disable(logging.INFO)
+
+
+def item(name, url, recycling=(), salvaging=(), revision_id=None, category='Weapons'):
+    result = {
+        'name': name,
+        'category': category,
+        'url': url,
+        'recycling': [{'name': m, 'quantity': q} for m, q in recycling],
+        'salvaging': [{'name': m, 'quantity': q} for m, q in salvaging]
+    }
+    if revision_id is not None:
+        result['revision_id'] = revision_id
+    return result
+
+
+class SQLiteStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+        self.path = os.path.join(self.tempdir.name, 'data.db')
+
+    def save(self, data, incremental=False):
+        with SQLiteStore(self.path) as store:
+            store.save(data, incremental=incremental)
+
+    def load(self):
+        with SQLiteStore(self.path) as store:
+            return store.load()
+
+    def test_is_store_path(self):
+        self.assertTrue(is_store_path('out/data.db'))
+        self.assertTrue(is_store_path('DATA.SQLITE3'))
+        self.assertFalse(is_store_path('out/data.json'))
+
+    def test_round_trip(self):
+        data = generate_dataset(60, seed=4)
+        self.save(data)
+        loaded = self.load()
+        self.assertEqual(list(loaded['categories']), list(data['categories']))
+        self.assertEqual(loaded['categories'], upgrade_data(data)['categories'])
+        self.assertEqual(loaded['metadata'], data['metadata'])
+
+    def test_v1_items_are_upgraded(self):
+        data = {'categories': {'Weapons': [{
+            'name': 'Rifle', 'category': 'Weapons', 'url': 'https://example.com/Rifle',
+            'materials': [{'name': 'Metal Parts', 'quantity': 3}, {'name': '(Salvage) Gears', 'quantity': 1}]
+        }]}, 'metadata': {}}
+        self.save(data)
+        loaded = self.load()['categories']['Weapons'][0]
+        self.assertEqual(loaded['recycling'], [{'name': 'Metal Parts', 'quantity': 3}])
+        self.assertEqual(loaded['salvaging'], [{'name': 'Gears', 'quantity': 1}])
+        self.assertNotIn('materials', loaded)
+
+    def test_full_save_rewrites_unchanged_revisions(self):
+        # A parser fix changes the materials of a page whose revision did not
+        self.save({'categories': {'Weapons': [item('Rifle', 'u1', [('Metal', 1)], revision_id=7)]}})
+        self.save({'categories': {'Weapons': [item('Rifle', 'u1', [('Metal', 5)], revision_id=7)]}})
+        self.assertEqual(self.load()['categories']['Weapons'][0]['recycling'], [{'name': 'Metal', 'quantity': 5}])
+
+    def test_incremental_save_skips_unchanged_revisions(self):
+        self.save({'categories': {'Weapons': [item('Rifle', 'u1', [('Metal', 1)], revision_id=7),
+                                              item('Pistol', 'u2', [('Metal', 2)], revision_id=3)]}})
+        with SQLiteStore(self.path) as store:
+            with store.connection:
+                self.assertFalse(store.upsert_item(item('Rifle', 'u1', [('Metal', 1)], revision_id=7), 'Weapons', 0,
+                                                   incremental=True))
+                self.assertTrue(store.upsert_item(item('Pistol', 'u2', [('Metal', 4)], revision_id=4), 'Weapons', 1,
+                                                  incremental=True))
+        items = self.load()['categories']['Weapons']
+        self.assertEqual([i['recycling'][0]['quantity'] for i in items], [1, 4])
+
+    def test_removed_items_and_orphan_materials_are_deleted(self):
+        self.save({'categories': {'Weapons': [item('Rifle', 'u1', [('Metal', 1)]),
+                                              item('Pistol', 'u2', [('Springs', 2)])]}})
+        self.save({'categories': {'Weapons': [item('Rifle', 'u1', [('Metal', 1)])]}})
+        self.assertEqual([i['name'] for i in self.load()['categories']['Weapons']], ['Rifle'])
+        with SQLiteStore(self.path) as store:
+            names = [name for name, in store.connection.execute('SELECT name FROM materials')]
+        self.assertEqual(names, ['Metal'])
+
+    def test_category_comes_from_the_listing(self):
+        rifle = item('Rifle', 'u1', [('Metal', 1)])
+        del rifle['category']
+        # Listed under a category other than its own field says
+        pistol = item('Pistol', 'u2', [('Metal', 2)], category='Sidearms')
+        self.save({'categories': {'Weapons': [rifle, pistol]}})
+        items = self.load()['categories']['Weapons']
+        self.assertEqual([(i['name'], i['category']) for i in items], [('Rifle', 'Weapons'), ('Pistol', 'Weapons')])
+
+    def test_item_listed_in_two_categories_is_kept_in_both(self):
+        self.save({'categories': {'Weapons': [item('Rifle', 'u1', [('Metal', 1)])],
+                                  'Featured': [item('Rifle', 'u1', [('Metal', 1)], category='Featured'),
+                                               item('Bow', 'u3')]}})
+        loaded = self.load()['categories']
+        self.assertEqual([i['name'] for i in loaded['Weapons']], ['Rifle'])
+        self.assertEqual([i['name'] for i in loaded['Featured']], ['Rifle', 'Bow'])
+
+        # Removing it from one category keeps the other
+        self.save({'categories': {'Weapons': [item('Rifle', 'u1', [('Metal', 1)])], 'Featured': []}})
+        loaded = self.load()['categories']
+        self.assertEqual(([i['name'] for i in loaded['Weapons']], loaded['Featured']), (['Rifle'], []))
+
+    def test_url_repeated_in_a_category_is_stored_once_with_a_warning(self):
+        data = {'categories': {'Loot': [item('Rifle', 'u1', [('Metal', 1)]), item('Rifle (copy)', 'u1'),
+                                        item('Bow', 'u3')]}}
+        with self.assertLogs('store', logging.WARNING) as logs:
+            self.save(data)
+        self.assertTrue(any('u1' in line for line in logs.output))
+        items = self.load()['categories']['Loot']
+        self.assertEqual([i['name'] for i in items], ['Rifle', 'Bow'])
+
+    def test_unknown_quantity_round_trips(self):
+        self.save({'categories': {'Weapons': [item('Rifle', 'u1', [('Metal', None), ('Wires', 2)])]}})
+        loaded = self.load()['categories']['Weapons'][0]
+        self.assertEqual(loaded['recycling'], [{'name': 'Metal', 'quantity': None}, {'name': 'Wires', 'quantity': 2}])
+        self.assertEqual(loaded['recycling_total'], 2)
+
+    def test_version_1_store_is_upgraded(self):
+        connection = sqlite3.connect(self.path)
+        connection.executescript("""
+            CREATE TABLE categories (name TEXT PRIMARY KEY, position INTEGER NOT NULL);
+            CREATE TABLE items (id INTEGER PRIMARY KEY, url TEXT NOT NULL UNIQUE, name TEXT NOT NULL,
+                                category TEXT NOT NULL, position INTEGER NOT NULL, page_id INTEGER,
+                                revision_id INTEGER);
+            CREATE TABLE materials (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+            CREATE TABLE item_materials (item_id INTEGER NOT NULL REFERENCES items(id) ON DELETE CASCADE,
+                                         position INTEGER NOT NULL,
+                                         material_id INTEGER NOT NULL REFERENCES materials(id),
+                                         kind TEXT NOT NULL CHECK (kind IN ('recycling', 'salvaging')),
+                                         quantity INTEGER NOT NULL, PRIMARY KEY (item_id, position));
+            CREATE TABLE metadata (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            INSERT INTO categories VALUES ('Weapons', 0);
+            INSERT INTO items VALUES (1, 'u1', 'Rifle', 'Weapons', 0, 10, 7);
+            INSERT INTO materials VALUES (1, 'Metal');
+            INSERT INTO item_materials VALUES (1, 0, 1, 'salvaging', 3);
+        """)
+        connection.commit()
+        connection.close()
+
+        loaded = self.load()['categories']['Weapons']
+        self.assertEqual([(i['name'], i['revision_id'], i['salvaging']) for i in loaded],
+                         [('Rifle', 7, [{'name': 'Metal', 'quantity': 3}])])
+        self.save({'categories': {'Weapons': [item('Rifle', 'u1', [('Metal', None)])],
+                                  'Featured': [item('Rifle', 'u1')]}})
+        self.assertEqual([len(items) for items in self.load()['categories'].values()], [1, 1])
+        with SQLiteStore(self.path) as store:
+            self.assertEqual(store.connection.execute('PRAGMA user_version').fetchone()[0], 2)
+
+    def test_items_with_material(self):
+        data = {'categories': {'Weapons': [
+            item('Rifle', 'u1', [('Metal', 2)], [('Metal', 5)]),
+            item('Pistol', 'u2', [('Metal', 2), ('Springs', 1)]),
+            item('Bow', 'u3', [('Wood', 1)])
+        ]}}
+        self.save(copy.deepcopy(data))
+        with SQLiteStore(self.path) as store:
+            sources = store.items_with_material('Metal')
+            salvage = store.items_with_material('Metal', kind='salvaging')
+        self.assertEqual([(s['name'], s['kind'], s['quantity']) for s in sources],
+                         [('Rifle', 'salvaging', 5), ('Pistol', 'recycling', 2), ('Rifle', 'recycling', 2)])
+        self.assertEqual([s['name'] for s in salvage], ['Rifle'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Tests for recording fixture archives and replaying them from the stub server.
+"""
+import logging
+import os
+import tempfile
+import unittest
+
+import requests
+
+from create_sample_data import generate_dataset, generate_wiki_pages
+from scraper import WikiScraper
+from wiki_fixtures import FixtureRecorder, StubWikiServer, load_archive, record_fixtures
+
+logging.disable(logging.INFO)
+
+
+class RecordAndReplayTest(unittest.TestCase):
+    """Record a scrape of one stub server, then replay the archive from another."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tempdir = tempfile.TemporaryDirectory()
+        cls.archive = os.path.join(cls.tempdir.name, 'wiki.json.gz')
+        cls.pages = generate_wiki_pages(generate_dataset(12, seed=4))
+        with StubWikiServer(cls.pages) as source:
+            cls.recorded = record_fixtures(WikiScraper(base_url=source.base_url, rate_limit=0), cls.archive)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tempdir.cleanup()
+
+    def replay(self, **kwargs):
+        server = StubWikiServer.from_archive(self.archive, **kwargs).start()
+        self.addCleanup(server.stop)
+        return server
+
+    def test_archive_holds_every_page_the_scrape_fetched(self):
+        responses = load_archive(self.archive)['responses']
+        html_pages = {key: entry for key, entry in self.pages.items() if key.startswith('/wiki/')}
+        self.assertEqual(sorted(responses), sorted(html_pages))
+        for key, entry in responses.items():
+            with self.subTest(key=key):
+                self.assertEqual(entry['body'], html_pages[key]['body'])
+                self.assertEqual(entry['status'], 200)
+
+    def test_replayed_scrape_matches_recording(self):
+        server = self.replay()
+        self.assertNotEqual(server.base_url.rsplit(':', 1)[1], '0')
+        replayed = WikiScraper(base_url=server.base_url, rate_limit=0).scrape_loot()
+        strip = lambda data: [dict(item, url=item['url'].split('/wiki/', 1)[1])
+                              for item in data['categories']['Loot']]
+        self.assertEqual(strip(replayed), strip(self.recorded))
+
+    def test_etag_and_not_modified(self):
+        server = self.replay()
+        with requests.Session() as session:
+            response = session.get(server.base_url + '/wiki/Loot')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.text, self.pages['/wiki/Loot']['body'])
+            etag = response.headers['ETag']
+
+            response = session.get(server.base_url + '/wiki/Loot', headers={'If-None-Match': etag})
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.content, b'')
+            self.assertEqual(response.headers['ETag'], etag)
+
+            response = session.get(server.base_url + '/wiki/Loot', headers={'If-None-Match': '"stale"'})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(session.get(server.base_url + '/wiki/Nowhere').status_code, 404)
+        self.assertEqual(server.request_count, 4)
+
+    def test_injected_errors(self):
+        server = self.replay(error_rate=1.0, error_status=502, seed=1)
+        response = requests.get(server.base_url + '/wiki/Loot')
+        self.assertEqual(response.status_code, 502)
+        self.assertEqual(response.headers['Retry-After'], '0')
+        self.assertEqual((server.request_count, server.error_count), (1, 1))
+
+    def test_error_rate_is_reproducible_with_a_seed(self):
+        def failures():
+            server = self.replay(error_rate=0.5, seed=7)
+            with requests.Session() as session:
+                return [session.get(server.base_url + '/wiki/Loot').status_code == 503 for _ in range(20)]
+        first = failures()
+        self.assertEqual(failures(), first)
+        self.assertTrue(any(first) and not all(first))
+
+    def test_recorder_skips_unsuccessful_responses(self):
+        server = self.replay()
+        recorder = FixtureRecorder(server.base_url)
+        with requests.Session() as session:
+            session.hooks['response'].append(recorder)
+            session.get(server.base_url + '/wiki/Loot')
+            session.get(server.base_url + '/wiki/Nowhere')
+        self.assertEqual(list(recorder.to_archive()['responses']), ['/wiki/Loot'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,298 @@
+"""
+Arc Raiders Recycling Tracker - Wiki Fixture Recording and Replay Module
+
+Records every page the scraper downloads into a compressed fixture archive,
+and replays an archive from a local HTTP server so scrapes can be tested and
+benchmarked offline:
+
+    python wiki_fixtures.py record tests/fixtures/wiki.json.gz
+    python wiki_fixtures.py serve tests/fixtures/wiki.json.gz --port 8000 --latency 0.05
+    python main.py --scrape --base-url http://127.0.0.1:8000
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+DEFAULT_ARCHIVE = 'tests/fixtures/wiki.json.gz'
+
+
+def fixture_key(url: str) -> str:
+    """
+    Key a URL by path and sorted query string, independent of the host it
+    was recorded from or the parameter order.
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return parts.path + ('?' + query if query else '')
+
+
+def load_archive(filepath: str) -> Dict:
+    """
+    Load a fixture archive.
+
+    Returns:
+        Dictionary with 'base_url', 'recorded_at' and 'responses' (fixture
+        key -> {'status', 'content_type', 'body'})
+    """
+    with gzip.open(filepath, 'rt', encoding='utf-8') as f:
+        archive = json.load(f)
+    if 'responses' not in archive:
+        raise ValueError(f"Invalid fixture archive {filepath}: missing 'responses'")
+    return archive
+
+
+def save_archive(archive: Dict, filepath: str) -> None:
+    """Write a fixture archive as gzip-compressed JSON."""
+    with gzip.open(filepath, 'wt', encoding='utf-8') as f:
+        json.dump(archive, f, ensure_ascii=False, sort_keys=True)
+
+
+class FixtureRecorder:
+    """
+    requests response hook that captures every successful response.
+
+    Attach it with `session.hooks['response'].append(recorder)`; it is safe
+    to use with WikiScraper's worker threads.
+    """
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+        self.responses: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, response, *args, **kwargs):
+        if response.status_code == 200:
+            entry = {
+                'status': 200,
+                'content_type': response.headers.get('Content-Type', 'text/html; charset=utf-8'),
+                'body': response.text
+            }
+            with self._lock:
+                self.responses[fixture_key(response.url)] = entry
+        return response
+
+    def to_archive(self) -> Dict:
+        """Build an archive from the responses recorded so far."""
+        with self._lock:
+            responses = dict(self.responses)
+        return {
+            'base_url': self.base_url,
+            'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'responses': responses
+        }
+
+
+def record_fixtures(scraper, filepath: str, **scrape_kwargs) -> Dict:
+    """
+    Run scrape_loot and save every downloaded page to a fixture archive.
+
+    Args:
+        scraper: WikiScraper pointed at the wiki to record
+        filepath: Archive path to write
+        **scrape_kwargs: Passed through to scrape_loot
+
+    Returns:
+        The scraped data
+    """
+    recorder = FixtureRecorder(scraper.base_url)
+    scraper.session.hooks['response'].append(recorder)
+    try:
+        data = scraper.scrape_loot(**scrape_kwargs)
+    finally:
+        scraper.session.hooks['response'].remove(recorder)
+
+    save_archive(recorder.to_archive(), filepath)
+    logging.getLogger(__name__).info(f"Recorded {len(recorder.responses)} responses to {filepath}")
+    return data
+
+
+class StubWikiServer:
+    """
+    Local HTTP server replaying a fixture archive.
+
+    Every response carries an ETag so the scraper's HTTP cache can be
+    exercised. Latency and error injection make it usable for throughput and
+    robustness benchmarks.
+    """
+
+    def __init__(self, responses: Dict[str, Dict], host: str = '127.0.0.1', port: int = 0,
+                 latency: float = 0.0, error_rate: float = 0.0, error_status: int = 503,
+                 seed: Optional[int] = None):
+        """
+        Initialize the StubWikiServer.
+
+        Args:
+            responses: Fixture key -> response entry, as in an archive
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            latency: Seconds to wait before answering each request
+            error_rate: Fraction of requests answered with error_status
+            error_status: Status code used for injected errors
+            seed: Seed for error injection, for reproducible runs
+        """
+        self.responses = responses
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.request_count = 0
+        self.error_count = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+
+    @classmethod
+    def from_archive(cls, filepath: str, **kwargs) -> 'StubWikiServer':
+        """Create a server replaying the archive at filepath."""
+        return cls(load_archive(filepath)['responses'], **kwargs)
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to pass to WikiScraper."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _should_fail(self) -> bool:
+        with self._lock:
+            self.request_count += 1
+            fail = self.error_rate > 0 and self._random.random() < self.error_rate
+            if fail:
+                self.error_count += 1
+            return fail
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out in separate writes; with Nagle's
+            # algorithm on, keep-alive clients wait ~40 ms for each body
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                if stub.latency > 0:
+                    time.sleep(stub.latency)
+
+                if stub._should_fail():
+                    self._send(stub.error_status, b'', {'Retry-After': '0'})
+                    return
+
+                entry = stub.responses.get(fixture_key(self.path))
+                if entry is None:
+                    self._send(404, b'Not found in fixture archive', {})
+                    return
+
+                body = entry['body'].encode('utf-8')
+                etag = '"%s"' % hashlib.sha1(body).hexdigest()
+                if self.headers.get('If-None-Match') == etag:
+                    self._send(304, b'', {'ETag': etag})
+                    return
+                self._send(entry.get('status', 200), body, {
+                    'Content-Type': entry.get('content_type', 'text/html; charset=utf-8'),
+                    'ETag': etag
+                })
+
+            def _send(self, status: int, body: bytes, headers: Dict[str, str]):
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def serve_forever(self) -> None:
+        """Serve requests on the calling thread until interrupted."""
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def start(self) -> 'StubWikiServer':
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Shut down a server started with start()."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def parse_arguments():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description='Record or replay Arc Raiders wiki fixtures')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    record = subparsers.add_parser('record', help='Scrape the Loot page and record every response')
+    record.add_argument('archive', nargs='?', default=DEFAULT_ARCHIVE,
+                        help=f'Archive to write (default: {DEFAULT_ARCHIVE})')
+    record.add_argument('--base-url', default='https://arcraiders.wiki', help='Wiki to record')
+    record.add_argument('--fetch-mode', choices=('html', 'api'), default='html',
+                        help='Scraper fetch mode to record responses for (default: html)')
+    record.add_argument('--workers', type=int, default=1, help='Concurrent fetches (default: 1)')
+
+    serve = subparsers.add_parser('serve', help='Replay an archive over HTTP')
+    serve.add_argument('archive', nargs='?', default=DEFAULT_ARCHIVE,
+                       help=f'Archive to replay (default: {DEFAULT_ARCHIVE})')
+    serve.add_argument('--host', default='127.0.0.1', help='Interface to bind (default: 127.0.0.1)')
+    serve.add_argument('--port', type=int, default=8000, help='Port to bind (default: 8000)')
+    serve.add_argument('--latency', type=float, default=0.0, help='Seconds of delay per request (default: 0)')
+    serve.add_argument('--error-rate', type=float, default=0.0,
+                       help='Fraction of requests answered with an error (default: 0)')
+    serve.add_argument('--error-status', type=int, default=503,
+                       help='Status code for injected errors (default: 503)')
+    serve.add_argument('--seed', type=int, help='Seed for error injection')
+
+    return parser.parse_args()
+
+
+def main():
+    """Command-line entry point."""
+    args = parse_arguments()
+    logger = logging.getLogger(__name__)
+
+    if args.command == 'record':
+        from scraper import WikiScraper
+        scraper = WikiScraper(base_url=args.base_url, fetch_mode=args.fetch_mode, max_workers=args.workers)
+        record_fixtures(scraper, args.archive)
+        return
+
+    server = StubWikiServer.from_archive(
+        args.archive, host=args.host, port=args.port, latency=args.latency,
+        error_rate=args.error_rate, error_status=args.error_status, seed=args.seed
+    )
+    logger.info(f"Replaying {len(server.responses)} pages from {args.archive} at {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Stopping stub server")
+
+
+if __name__ == "__main__":
+    main()